@@ -0,0 +1,95 @@
+"""
+Benchmark for the NumPy analytics engine
+
+Generates years of synthetic study sessions at minute resolution, loads
+them into an AnalyticsEngine once, then times computing every summary
+(weekly, monthly, rolling average, percentiles, weekday totals, hour
+totals and the weekday x hour heatmap) and adding one new session.
+
+Usage:
+    python benchmarks/bench_analytics.py [--years 10] [--sessions-per-day 6]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.analytics import AnalyticsEngine
+from core.session_log import SessionLog
+from core.statistics import StatisticsManager
+
+
+def make_records(years, sessions_per_day):
+    """Random focus sessions between 7:00 and 23:00 on most days"""
+    records = []
+    first_day = date.today() - timedelta(days=years * 365)
+    for offset in range(years * 365):
+        if random.random() < 0.2:
+            continue
+        midnight = datetime.combine(first_day + timedelta(days=offset), datetime.min.time()).timestamp()
+        for _ in range(random.randint(1, sessions_per_day)):
+            start = midnight + random.uniform(7, 22) * 3600
+            end = start + random.choice((25, 50)) * 60
+            records.append({'start': start, 'end': end, 'phase': "focus", 'task': None,
+                            'interruptions': 0, 'paused': random.choice((0, 0, 120))})
+    return records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=10, help="Years of synthetic history")
+    parser.add_argument("--sessions-per-day", type=int, default=6, help="Most sessions in a day")
+    parser.add_argument("--repeat", type=int, default=20, help="Times to compute the summaries")
+    args = parser.parse_args()
+    
+    random.seed(1)
+    records = make_records(args.years, args.sessions_per_day)
+    log = SessionLog(os.devnull)
+    log.records = records
+    statistics = StatisticsManager(log.get_daily_totals())
+    
+    start = time.perf_counter()
+    engine = AnalyticsEngine.from_history(statistics, records)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"{args.years} years, {len(records):,} sessions, "
+          f"{engine.minutes.size:,} minutes ({engine.minutes.nbytes / 1e6:.1f} MB)")
+    print(f"load into arrays (once):  {load_ms:10.2f} ms")
+    
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        results = engine.compute_all()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"compute all summaries:    {timings[len(timings) // 2]:10.2f} ms median, "
+          f"{timings[-1]:.2f} ms worst")
+    
+    # A session recorded today only adds its minutes to the loaded arrays
+    # (the first one of a new day also grows them by a row)
+    for label in ("first session of a day:", "later session that day:"):
+        now = time.time()
+        records.append({'start': now - 1500, 'end': now, 'phase': "focus", 'task': None,
+                        'interruptions': 0, 'paused': 0})
+        statistics.add_session_time(1500)
+        start = time.perf_counter()
+        engine.sync(statistics, records)
+        sync_ms = (time.perf_counter() - start) * 1000
+        print(f"{label:<26}{sync_ms:10.2f} ms (sync instead of reloading)")
+    
+    # Cross-check the minute grid against the session log's own aggregates
+    day = date.today() - timedelta(days=1)
+    expected = log.get_hourly_totals(day)
+    actual = engine.get_hourly_series(day)
+    error = max(abs(a - b) for a, b in zip(actual, expected))
+    print(f"hourly check vs log:      {error:10.2f} s max difference")
+    print(f"busiest weekday:          {int(results['weekday_totals'].argmax())} (0 = Monday), "
+          f"busiest hour: {int(results['hour_totals'].argmax()):02d}:00")
+
+
+if __name__ == "__main__":
+    main()
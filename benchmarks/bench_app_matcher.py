@@ -0,0 +1,107 @@
+"""
+Benchmark for locked app matching
+
+Builds synthetic process tables and compares the old per-process, per-app
+substring loop against AppMatcher, both cold (every name matched) and warm
+(results reused from the per-PID cache, as on every later scan).
+
+Usage:
+    python benchmarks/bench_app_matcher.py [--processes 2000] [--apps 5,25,100]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.app_matcher import AppMatcher
+
+
+COMMON_NAMES = ["systemd", "bash", "python3", "chrome", "Code Helper", "kworker/0:1",
+                "Xorg", "pulseaudio", "sshd", "firefox", "discord", "Spotify", "steam"]
+
+
+def make_table(count, rng):
+    """Build a synthetic (pid, name) process table"""
+    table = []
+    for pid in range(1, count + 1):
+        if rng.random() < 0.3:
+            name = rng.choice(COMMON_NAMES)
+        else:
+            name = "".join(rng.choices(string.ascii_letters + "-_", k=rng.randint(4, 20)))
+        table.append((pid, name))
+    return table
+
+
+def make_apps(count, rng):
+    """Build a locked app list including a few names that really run"""
+    apps = ["Discord", "steam", "Spotify"][:count]
+    while len(apps) < count:
+        apps.append("".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 12))))
+    return apps
+
+
+def legacy_scan(table, apps):
+    """The old nested substring loop"""
+    found = []
+    for pid, name in table:
+        for app in apps:
+            if app.lower() in name.lower():
+                found.append(app)
+    return found
+
+
+def matcher_scan(table, matcher):
+    """One pass over the table with the compiled matcher"""
+    found = []
+    for pid, name in table:
+        app = matcher.match_pid(pid, name)
+        if app is not None:
+            found.append(app)
+    return found
+
+
+def timed(func, repeat):
+    """Best time of several runs in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=2000, help="Entries in the process table")
+    parser.add_argument("--apps", default="5,25,100", help="Comma-separated locked app counts")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement")
+    args = parser.parse_args()
+    
+    rng = random.Random(7)
+    table = make_table(args.processes, rng)
+    print(f"{args.processes:,} processes")
+    print("apps   legacy (ms)  cold (ms)  cached (ms)")
+    for count in (int(value) for value in args.apps.split(",")):
+        apps = make_apps(count, rng)
+        legacy_ms = timed(lambda: legacy_scan(table, apps), args.repeat)
+        
+        def cold():
+            matcher = AppMatcher(apps)
+            return matcher_scan(table, matcher)
+        
+        cold_ms = timed(cold, args.repeat)
+        matcher = AppMatcher(apps)
+        matcher_scan(table, matcher)
+        cached_ms = timed(lambda: matcher_scan(table, matcher), args.repeat)
+        
+        assert sorted(legacy_scan(table, apps)) == sorted(cold())
+        print(f"{count:>4}   {legacy_ms:11.2f}  {cold_ms:9.2f}  {cached_ms:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark for redrawing the window background during a resize
+
+Replays the window sizes of a drag.  The old code opened the file and
+did a LANCZOS resize for every <Configure> event; BackgroundImage keeps
+the decoded image, uses a fast filter during the drag, does one LANCZOS
+resize when it stops and reuses cached renders for sizes seen before.
+PhotoImage creation needs a display and is left out of both.
+
+Usage:
+    python benchmarks/bench_background_resize.py [--events 60] [--image-size 3840x2160]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PIL import Image
+
+from ui.background_image import BackgroundImage
+
+
+def drag_sizes(events):
+    """Window sizes from 1100x800 to 1500x950 and back, one per event"""
+    half = events // 2
+    out = [(1100 + 400 * i // half, 800 + 150 * i // half) for i in range(half)]
+    return out + out[::-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=60, help="<Configure> events in the drag")
+    parser.add_argument("--image-size", default="3840x2160", help="Size of the background image")
+    args = parser.parse_args()
+    
+    width, height = (int(value) for value in args.image_size.split("x"))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "background.jpg")
+        Image.radial_gradient('L').resize((width, height)).convert('RGB').save(path, quality=90)
+        sizes = drag_sizes(args.events)
+        
+        start = time.perf_counter()
+        for size in sizes:
+            with Image.open(path) as image:
+                image.resize(size, Image.LANCZOS)
+        old_ms = (time.perf_counter() - start) * 1000
+        print(f"open + LANCZOS per event:  {old_ms:9.1f} ms for {len(sizes)} events "
+              f"({old_ms / len(sizes):.1f} ms each)")
+        
+        background = BackgroundImage(make_photo=lambda image: image)
+        start = time.perf_counter()
+        for size in sizes:
+            background.render(path, size, high_quality=False)
+        background.render(path, sizes[-1])
+        new_ms = (time.perf_counter() - start) * 1000
+        print(f"fast filter + final pass:  {new_ms:9.1f} ms for {len(sizes)} events "
+              f"({new_ms / len(sizes):.1f} ms each, {background.decode_count} decode)")
+        
+        background.render(path, (1920, 1080))
+        resizes = background.resize_count
+        start = time.perf_counter()
+        for _ in range(10):
+            background.render(path, (1100, 800))
+            background.render(path, (1920, 1080))
+        print(f"toggle between two sizes:  {(time.perf_counter() - start) * 1000 / 20:9.3f} ms each "
+              f"({background.resize_count - resizes} resizes for 20 toggles)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark for large blocklist import
+
+Writes a synthetic blocklist mixing hosts, AdBlock and plain lines, imports
+it with the streaming parser into a CompactBlocklist and reports import
+time, lookup latency and process memory.
+
+Usage:
+    python benchmarks/bench_blocklist.py [--entries 1000000]
+"""
+
+import argparse
+import os
+import random
+import resource
+import shutil
+import string
+import sys
+import tempfile
+import time
+
+import psutil
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.blocklist import load_blocklist_file
+
+
+def random_domain(rng):
+    """Make up a plausible ad/tracker hostname"""
+    labels = ["".join(rng.choices(string.ascii_lowercase + string.digits, k=rng.randint(3, 10)))
+              for _ in range(rng.randint(1, 3))]
+    return ".".join(labels + [rng.choice(["com", "net", "org", "io", "co.uk"])])
+
+
+def write_blocklist(path, count, rng):
+    """Write a blocklist with roughly equal shares of each format"""
+    names = []
+    with open(path, 'w') as blocklist_file:
+        blocklist_file.write("# Synthetic blocklist\n! Title: bench\n")
+        for i in range(count):
+            name = random_domain(rng)
+            if i % 1000 == 0:
+                names.append(name)
+            kind = i % 3
+            if kind == 0:
+                blocklist_file.write(f"0.0.0.0 {name}\n")
+            elif kind == 1:
+                blocklist_file.write(f"||{name}^\n")
+            else:
+                blocklist_file.write(f"{name}\n")
+    return names
+
+
+def rss_mb():
+    """Current resident set size in MB"""
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=1000000, help="Lines in the blocklist")
+    parser.add_argument("--lookups", type=int, default=100000, help="Lookups to time")
+    args = parser.parse_args()
+    
+    rng = random.Random(3)
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "blocklist.txt")
+        listed = write_blocklist(path, args.entries, rng)
+        size_mb = os.path.getsize(path) / 2**20
+        print(f"{args.entries:,} entries, {size_mb:.1f} MB file")
+        
+        before = rss_mb()
+        start = time.perf_counter()
+        blocklist = load_blocklist_file(path)
+        import_s = time.perf_counter() - start
+        after = rss_mb()
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        
+        print(f"import:            {import_s:8.2f} s ({len(blocklist):,} unique domains)")
+        print(f"packed size:       {blocklist.get_size_bytes() / 2**20:8.1f} MB")
+        print(f"rss growth:        {after - before:8.1f} MB (peak process rss {peak:.1f} MB)")
+        
+        queries = []
+        for i in range(args.lookups):
+            kind = i % 3
+            if kind == 0:
+                queries.append(rng.choice(listed))
+            elif kind == 1:
+                queries.append("cdn." + rng.choice(listed))
+            else:
+                queries.append(random_domain(rng))
+        start = time.perf_counter()
+        blocked = sum(1 for name in queries if blocklist.is_blocked(name))
+        lookup_us = (time.perf_counter() - start) / len(queries) * 1e6
+        print(f"lookup:            {lookup_us:8.1f} us average ({blocked:,} of {len(queries):,} blocked)")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark for refreshing the analytics chart
+
+Compares building a new figure, canvas and bars for every refresh (the
+old AnalyticsTab behaviour) with updating a persistent StudyTimeChart in
+place.  Both render off-screen with Agg, so the numbers include drawing
+but not copying the image into Tk.
+
+Usage:
+    python benchmarks/bench_chart.py [--refreshes 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from ui.study_chart import StudyTimeChart
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+COLORS = {'bg': '#2E3440', 'fg': '#ECEFF4', 'accent': '#88C0D0'}
+
+
+def rebuild_chart(values):
+    """Build and draw a whole new weekly chart"""
+    fig = Figure(figsize=(8, 4), dpi=100)
+    ax = fig.add_subplot(111)
+    bars = ax.bar(DAYS, values, color=COLORS['accent'])
+    ax.set_ylabel('Study Time (minutes)')
+    ax.set_title('Weekly Study Time')
+    for bar in bars:
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width()/2., height, f'{int(height)}',
+                ha='center', va='bottom', color=COLORS['fg'])
+    ax.set_facecolor(COLORS['bg'])
+    fig.patch.set_facecolor(COLORS['bg'])
+    ax.title.set_color(COLORS['fg'])
+    ax.yaxis.label.set_color(COLORS['fg'])
+    ax.tick_params(colors=COLORS['fg'])
+    FigureCanvasAgg(fig).draw()
+
+
+def time_refreshes(refresh, data):
+    """Median and worst milliseconds of refresh(values) over the data"""
+    timings = []
+    for values in data:
+        start = time.perf_counter()
+        refresh(values)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--refreshes", type=int, default=50, help="Refreshes to time")
+    args = parser.parse_args()
+    
+    random.seed(1)
+    data = [[random.randint(0, 300) for _ in DAYS] for _ in range(args.refreshes)]
+    
+    median, worst = time_refreshes(rebuild_chart, data)
+    print(f"rebuild figure per refresh:  {median:8.2f} ms median, {worst:.2f} ms worst")
+    
+    chart = StudyTimeChart(colors=COLORS)
+    chart.show("weekly", DAYS, data[0], 'Weekly Study Time', value_labels=True)
+    median, worst = time_refreshes(
+        lambda values: chart.show("weekly", DAYS, values, 'Weekly Study Time', value_labels=True),
+        data)
+    print(f"update bars in place:        {median:8.2f} ms median, {worst:.2f} ms worst")
+    
+    median, worst = time_refreshes(
+        lambda values: chart.show("weekly", DAYS, data[-1], 'Weekly Study Time', value_labels=True),
+        data)
+    print(f"refresh with unchanged data: {median:8.2f} ms median, {worst:.2f} ms worst")
+    print(f"bars built {chart.rebuild_count} time(s), {chart.draw_count} full draws, "
+          f"{chart.blit_count} blits")
+    
+    # Switching views rebuilds once per switch
+    start = time.perf_counter()
+    chart.show("daily", list(range(24)), [0] * 24, "Today's Study Time by Hour",
+               xlabel='Hour of Day', xticks=range(0, 24, 2))
+    chart.show("monthly", list(range(1, 31)), [0] * 30, 'Study Time for June',
+               xlabel='Day of Month', xticks=range(1, 31, 5))
+    chart.show("weekly", DAYS, data[0], 'Weekly Study Time', value_labels=True)
+    print(f"switch views (x3):           {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Drift benchmark for the deadline-based countdown
+
+Runs a focus block through the real TimerTab.tick_countdown, scheduled by a
+Tk-style ``after`` whose callbacks are delivered late the way they are when
+the CPU is saturated.  Every time the displayed second changes, the time of
+the change is compared with the true second boundary, and the end of the
+phase with the deadline.  The legacy "sleep one second, subtract one" loop
+is run through the same harness and the same gate for comparison.
+
+Lateness includes the latency injected into the callback that painted the
+second, which no timer can avoid.  What is gated is the lateness *beyond*
+that one callback's latency (anything the timer itself adds, such as
+scheduling the next tick at the wrong time or carrying earlier latency
+forward), and the drift accumulated over the block (the mean excess over
+its last tenth minus that over its first tenth).  Both must stay below the
+target for every seed in a fixed set.  The legacy loop carries every
+latency forward and fails the same gate.
+
+By default the block is simulated on a virtual clock (a 2-hour block finishes
+in a few seconds).  Pass ``--real SECONDS`` to run against the real
+monotonic clock while every core is kept busy by burner processes; the
+latency is then not injected, so the whole lateness is gated.
+
+Usage:
+    python benchmarks/bench_countdown_drift.py [--minutes 120] [--seeds 10]
+    python benchmarks/bench_countdown_drift.py --real 7200
+"""
+
+import argparse
+import heapq
+import itertools
+import multiprocessing
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.pomodoro import PomodoroEngine
+from ui.timer_tab import TimerTab
+
+TARGET_ERROR_MS = 50.0
+
+
+def callback_latency(rng):
+    """Lateness of one event-loop callback on a heavily loaded machine"""
+    latency = rng.expovariate(1 / 0.015)
+    if rng.random() < 0.01:
+        latency += rng.uniform(0.2, 0.5)  # occasional scheduler stall
+    return latency
+
+
+class EventLoop:
+    """
+    Minimal stand-in for the Tk event loop's after() scheduling
+    
+    On the virtual clock every callback runs `callback_latency` after it is
+    due.  On the real clock the loop sleeps until the callback is due and the
+    loaded machine adds whatever latency it adds (not counted as injected).
+    """
+    
+    def __init__(self, rng=None):
+        self.rng = rng
+        self.virtual_now = 0.0
+        self.jobs = []
+        self.counter = itertools.count()
+        self.current_latency = 0.0
+    
+    def clock(self):
+        """Current time of the loop"""
+        return self.virtual_now if self.rng is not None else time.monotonic()
+    
+    def after(self, ms, callback):
+        """Schedule a callback like Tk's after()"""
+        job = next(self.counter)
+        heapq.heappush(self.jobs, (self.clock() + ms / 1000.0, job, callback))
+        return job
+    
+    def after_cancel(self, job):
+        """Cancel a scheduled callback"""
+        self.jobs = [entry for entry in self.jobs if entry[1] != job]
+        heapq.heapify(self.jobs)
+    
+    def run(self):
+        """Run callbacks until none are left"""
+        while self.jobs:
+            due, _, callback = heapq.heappop(self.jobs)
+            if self.rng is not None:
+                self.current_latency = callback_latency(self.rng)
+                self.virtual_now = max(self.virtual_now, due) + self.current_latency
+            else:
+                time.sleep(max(0.0, due - time.monotonic()))
+            callback()
+
+
+class RecordingLabel:
+    """Label that records when its text changes"""
+    
+    def __init__(self, loop):
+        self.loop = loop
+        self.changes = []  # (time, latency injected into the painting callback, text)
+    
+    def config(self, text=None, **kwargs):
+        self.changes.append((self.loop.clock(), self.loop.current_latency, text))
+
+
+class NullLabel:
+    """Label that ignores updates"""
+    
+    def config(self, **kwargs):
+        pass
+
+
+def measure(changes, start, total_seconds):
+    """
+    Compare the recorded display changes with the true second boundaries
+    
+    Returns:
+        dict: worst lateness, worst excess over the injected latency and the
+            drift accumulated over the block, in seconds
+    """
+    excesses = []
+    worst_lateness = 0.0
+    for changed_at, latency, text in changes:
+        minutes, secs = text.split(":")
+        boundary = start + total_seconds - (int(minutes) * 60 + int(secs))
+        worst_lateness = max(worst_lateness, changed_at - boundary)
+        excesses.append(changed_at - latency - boundary)
+    
+    tenth = max(1, len(excesses) // 10)
+    drift = sum(excesses[-tenth:]) / tenth - sum(excesses[:tenth]) / tenth
+    return {'lateness': worst_lateness, 'excess': max(excesses), 'drift': drift}
+
+
+def run_focus_block(total_seconds, loop):
+    """Run one focus phase through TimerTab.tick_countdown and measure it"""
+    finished = []
+    
+    def on_transition(completed, next_phase):
+        finished.append((loop.clock(), loop.current_latency, "00:00"))
+        tab.is_timer_running = False
+    
+    engine = PomodoroEngine(total_seconds, 300, 900, clock=loop.clock, on_transition=on_transition)
+    
+    # The real tick method on a tab without widgets
+    tab = TimerTab.__new__(TimerTab)
+    tab.app = SimpleNamespace(root=loop)
+    tab.settings = SimpleNamespace(session_count=1)
+    tab.is_timer_running = True
+    tab.engine = engine
+    tab.displayed_seconds = None
+    tab.remaining_seconds = total_seconds
+    tab.countdown_job = None
+    tab.time_display = RecordingLabel(loop)
+    tab.minimized_time_display = NullLabel()
+    tab.minimized_session_label = NullLabel()
+    tab.minimized_phase_label = NullLabel()
+    tab.timer_progress = {'maximum': total_seconds, 'value': 0}
+    
+    engine.start()
+    start = loop.clock()
+    tab.tick_countdown()
+    loop.run()
+    return measure(tab.time_display.changes + finished, start, total_seconds)
+
+
+def run_legacy_block(total_seconds, loop):
+    """Run the legacy loop (tick every second, subtract one) and measure it"""
+    label = RecordingLabel(loop)
+    remaining = [total_seconds]
+    
+    def tick():
+        remaining[0] -= 1
+        minutes, secs = divmod(remaining[0], 60)
+        label.config(text=f"{minutes:02d}:{secs:02d}")
+        if remaining[0] > 0:
+            loop.after(1000, tick)
+    
+    start = loop.clock()
+    label.config(text=f"{total_seconds // 60:02d}:{total_seconds % 60:02d}")
+    loop.after(1000, tick)
+    loop.run()
+    return measure(label.changes, start, total_seconds)
+
+
+def worst(results):
+    """Worst (largest in magnitude) value of every statistic over several runs"""
+    return {key: max((result[key] for result in results), key=abs) for key in results[0]}
+
+
+def burn():
+    """Keep one core busy forever"""
+    while True:
+        pass
+
+
+def run_real(seconds):
+    """Run a real countdown with every core saturated"""
+    burners = [multiprocessing.Process(target=burn, daemon=True)
+               for _ in range(os.cpu_count() or 1)]
+    for proc in burners:
+        proc.start()
+    
+    try:
+        return run_focus_block(seconds, EventLoop())
+    finally:
+        for proc in burners:
+            proc.terminate()
+
+
+def gate(result):
+    """Whether a result meets the target"""
+    return max(result['excess'], abs(result['drift'])) * 1000 < TARGET_ERROR_MS
+
+
+def report(name, result):
+    """Print one result with its verdict"""
+    print(f"  {name}")
+    print(f"    worst display lateness:      {result['lateness'] * 1000:10.1f} ms")
+    print(f"    worst lateness beyond the painting callback's latency:"
+          f" {result['excess'] * 1000:10.1f} ms")
+    print(f"    drift accumulated over the block: {result['drift'] * 1000:10.1f} ms")
+    print(f"    target < {TARGET_ERROR_MS:.0f} ms: {'PASS' if gate(result) else 'FAIL'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=int, default=120, help="Simulated focus block length")
+    parser.add_argument("--seeds", type=int, default=10,
+                        help="Number of load models simulated (seeds 1..N)")
+    parser.add_argument("--real", type=int, metavar="SECONDS",
+                        help="Run a real countdown of this length under CPU load")
+    args = parser.parse_args()
+    
+    if args.real:
+        result = run_real(args.real)
+        print(f"real {args.real}s under load on {os.cpu_count()} busy cores")
+    else:
+        total_seconds = args.minutes * 60
+        seeds = range(1, args.seeds + 1)
+        print(f"simulated {args.minutes} min focus block, worst of seeds 1..{args.seeds}")
+        report("legacy sleep/decrement loop", worst(
+            [run_legacy_block(total_seconds, EventLoop(random.Random(seed))) for seed in seeds]))
+        result = worst([run_focus_block(total_seconds, EventLoop(random.Random(seed)))
+                        for seed in seeds])
+    report("deadline countdown (TimerTab.tick_countdown)", result)
+    return 0 if gate(result) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Benchmark for hosts file lookups and blocking
+
+Writes a large ad-block style hosts file to a temporary directory, then
+compares the old substring check (read the file, `site in content`) with
+the parsed HostsIndex, and times blocking a batch of sites in one write.
+
+Usage:
+    python benchmarks/bench_hosts_index.py [--lines 100000] [--queries 1000]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.website_blocker import HostsBlocklist, load_hosts_index
+
+
+def write_hosts(path, lines):
+    """Write a hosts file with the given number of ad-block entries"""
+    with open(path, 'w') as hosts_file:
+        hosts_file.write("127.0.0.1 localhost\n::1 localhost\n# Ad-block list\n")
+        for i in range(lines):
+            hosts_file.write(f"0.0.0.0 ads{i}.tracker{i % 997}.example\n")
+
+
+def legacy_is_blocked(path, site):
+    """The old check: read the whole file and search for the substring"""
+    with open(path, 'r') as hosts_file:
+        return site in hosts_file.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=100000, help="Entries in the hosts file")
+    parser.add_argument("--queries", type=int, default=1000, help="Lookups to time")
+    parser.add_argument("--sites", type=int, default=500, help="Sites blocked in one batch")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "hosts")
+        write_hosts(path, args.lines)
+        queries = [f"ads{i * 7}.tracker{(i * 7) % 997}.example" for i in range(args.queries)]
+        queries += ["x.com", "netflix.com"]
+        print(f"{args.lines:,}-line hosts file, {len(queries):,} lookups")
+        
+        legacy_count = 100
+        start = time.perf_counter()
+        for site in queries[:legacy_count]:
+            legacy_is_blocked(path, site)
+        legacy_us = (time.perf_counter() - start) / legacy_count * 1e6
+        
+        start = time.perf_counter()
+        load_hosts_index(path)
+        parse_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        for site in queries:
+            load_hosts_index(path).is_blocked(site)
+        indexed_us = (time.perf_counter() - start) / len(queries) * 1e6
+        
+        print(f"legacy substring check:   {legacy_us:10.1f} us per lookup")
+        print(f"index build (once):       {parse_ms:10.1f} ms")
+        print(f"indexed lookup + stat:    {indexed_us:10.1f} us per lookup")
+        
+        # The substring check also matches inside longer names
+        with open(path, 'a') as hosts_file:
+            hosts_file.write("0.0.0.0 netflix.com\n")
+        print(f"x.com blocked? legacy={legacy_is_blocked(path, 'x.com')} "
+              f"index={load_hosts_index(path).is_blocked('x.com')}")
+        
+        blocklist = HostsBlocklist(path)
+        sites = [f"site{i}.example" for i in range(args.sites)]
+        start = time.perf_counter()
+        blocklist.block(sites)
+        block_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        blocklist.block(sites)
+        noop_ms = (time.perf_counter() - start) * 1000
+        print(f"block {args.sites} sites:          {block_ms:10.1f} ms ({blocklist.write_count} write)")
+        print(f"repeat (no change):       {noop_ms:10.1f} ms ({blocklist.write_count} write total)")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark for the shared image cache
+
+Times making the study image, settings preview and app icon thumbnails
+the way the widgets used to (open the file and LANCZOS resize it every
+time they are shown or re-themed) against ImageCache, whose first load
+of a JPEG uses Image.draft() and whose later loads are cache hits.
+
+Usage:
+    python benchmarks/bench_image_cache.py [--image-size 4000x3000] [--refreshes 20]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from PIL import Image
+
+from utils.image_cache import ImageCache
+
+SIZES = [(250, 250), (150, 150), (64, 64)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--image-size", default="4000x3000", help="Size of the source photo")
+    parser.add_argument("--refreshes", type=int, default=20, help="Times every thumbnail is shown")
+    args = parser.parse_args()
+    
+    width, height = (int(value) for value in args.image_size.split("x"))
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "study.jpg")
+        Image.radial_gradient('L').resize((width, height)).convert('RGB').save(path, quality=90)
+        
+        start = time.perf_counter()
+        for _ in range(args.refreshes):
+            for size in SIZES:
+                with Image.open(path) as image:
+                    image.resize(size, Image.LANCZOS)
+        old_ms = (time.perf_counter() - start) * 1000
+        count = args.refreshes * len(SIZES)
+        print(f"open + LANCZOS every time:  {old_ms / count:8.2f} ms per thumbnail")
+        
+        cache = ImageCache()
+        start = time.perf_counter()
+        for size in SIZES:
+            cache.get_thumbnail(path, size)
+        first_ms = (time.perf_counter() - start) * 1000
+        print(f"ImageCache first load:      {first_ms / len(SIZES):8.2f} ms per thumbnail (JPEG draft)")
+        
+        start = time.perf_counter()
+        for _ in range(args.refreshes - 1):
+            for size in SIZES:
+                cache.get_thumbnail(path, size)
+        hit_ms = (time.perf_counter() - start) * 1000
+        print(f"ImageCache hit:             {hit_ms / (count - len(SIZES)):8.3f} ms per thumbnail")
+        print(f"stats: {cache.get_stats()}")
+
+
+if __name__ == "__main__":
+    main()
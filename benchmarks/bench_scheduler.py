@@ -0,0 +1,88 @@
+"""
+Benchmark for the single-thread timer scheduler
+
+Measures schedule/cancel cost at growing heap sizes (it should grow with
+log n), then keeps 10,000 repeating timers alive on one scheduler thread and
+samples process CPU time every second to show it stays flat.
+
+Usage:
+    python benchmarks/bench_scheduler.py [--timers 10000] [--seconds 10]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.scheduler import TimerScheduler
+
+
+def bench_operations(sizes, rounds=20000):
+    """Time schedule and cancel at different heap sizes"""
+    print("heap size    schedule (us)  cancel (us)")
+    for size in sizes:
+        scheduler = TimerScheduler(threaded=False)
+        rng = random.Random(size)
+        for i in range(size):
+            scheduler.schedule(f"t{i}", rng.uniform(60, 3600), lambda name: None)
+        
+        names = [f"extra{i}" for i in range(rounds)]
+        start = time.perf_counter()
+        for name in names:
+            scheduler.schedule(name, rng.uniform(60, 3600), lambda name: None)
+        schedule_us = (time.perf_counter() - start) / rounds * 1e6
+        
+        start = time.perf_counter()
+        for name in names:
+            scheduler.cancel(name)
+        cancel_us = (time.perf_counter() - start) / rounds * 1e6
+        print(f"{size:>9,}    {schedule_us:13.2f}  {cancel_us:11.2f}")
+
+
+def bench_concurrent(count, seconds):
+    """Run many repeating timers and sample CPU usage once per second"""
+    scheduler = TimerScheduler()
+    fired = [0]
+    
+    def repeat(name):
+        fired[0] += 1
+        scheduler.schedule(name, 1.0, repeat)
+    
+    rng = random.Random(1)
+    for i in range(count):
+        scheduler.schedule(f"reminder-{i}", rng.uniform(0, 1.0), repeat)
+    
+    threads = threading.active_count()
+    print(f"\n{count:,} concurrent 1 Hz timers on {threads - 1} scheduler thread(s)")
+    print("second  fired/s   cpu %")
+    samples = []
+    last_cpu, last_fired = time.process_time(), 0
+    for second in range(1, seconds + 1):
+        time.sleep(1)
+        cpu = time.process_time()
+        usage = (cpu - last_cpu) * 100
+        samples.append(usage)
+        print(f"{second:>6}  {fired[0] - last_fired:>7,}  {usage:6.1f}")
+        last_cpu, last_fired = cpu, fired[0]
+    
+    scheduler.shutdown()
+    steady = samples[1:] or samples
+    print(f"cpu % min/max after warm-up: {min(steady):.1f} / {max(steady):.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--timers", type=int, default=10000, help="Number of concurrent timers")
+    parser.add_argument("--seconds", type=int, default=10, help="How long to sample CPU usage")
+    args = parser.parse_args()
+    
+    bench_operations([1000, 10000, 100000])
+    bench_concurrent(args.timers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
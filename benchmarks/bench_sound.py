@@ -0,0 +1,66 @@
+"""
+Benchmark for chime playback latency
+
+Times playing a start or end chime the way the timer used to (decode the
+file with pygame.mixer.Sound(path) at every phase boundary) against
+SoundManager, which decodes each file once and plays the cached buffer on
+a reserved channel.  Runs without an audio device (SDL dummy driver).
+
+Usage:
+    python benchmarks/bench_sound.py [--seconds 2.0] [--plays 200]
+"""
+
+import argparse
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from utils.sound_manager import SoundManager, get_mixer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=2.0, help="Length of the chime")
+    parser.add_argument("--plays", type=int, default=200, help="Times the chime is played")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "chime.wav")
+        with wave.open(path, "wb") as wav_file:
+            # Mono 22 kHz, so it is also resampled to the mixer format
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(22050)
+            wav_file.writeframes(struct.pack("<h", 0) * int(args.seconds * 22050))
+        
+        mixer = get_mixer()
+        start = time.perf_counter()
+        for _ in range(args.plays):
+            sound = mixer.Sound(path)
+            sound.set_volume(0.7)
+            sound.play()
+        old_ms = (time.perf_counter() - start) * 1000
+        print(f"decode on every play:   {old_ms / args.plays:8.3f} ms per chime")
+        mixer.stop()
+        
+        manager = SoundManager(volume=0.7)
+        start = time.perf_counter()
+        manager.preload([path])
+        print(f"SoundManager preload:   {(time.perf_counter() - start) * 1000:8.3f} ms (once, off the timer)")
+        
+        start = time.perf_counter()
+        for _ in range(args.plays):
+            manager.play_sound(path, channel="end")
+        new_ms = (time.perf_counter() - start) * 1000
+        print(f"SoundManager cached:    {new_ms / args.plays:8.3f} ms per chime")
+        print(f"decoded {manager.decode_count} time(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark for cold startup
+
+Runs fresh interpreters with -X importtime to measure what importing the
+main window costs now that the analytics and settings tabs, matplotlib,
+pygame, PIL and requests are loaded on first use, next to what importing
+them all up front (the old startup) costs.  With a display it also times
+StudyTimerApp from start-up until the timer tab has been drawn.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+LAZY_IMPORTS = ["ui.main_window"]
+EAGER_IMPORTS = ["ui.main_window", "ui.analytics_tab", "ui.settings_tab", "pygame", "PIL.ImageTk",
+                 "requests"]
+HEAVY_MODULES = ("matplotlib", "numpy", "pygame", "PIL", "requests", "ui.analytics_tab",
+                 "ui.settings_tab")
+
+SHOW_TIMER = """
+import time
+start = time.perf_counter()
+import tkinter as tk
+from ui.main_window import StudyTimerApp
+root = tk.Tk()
+app = StudyTimerApp(root)
+root.update()
+app.timer_tab.frame.wait_visibility()
+print((time.perf_counter() - start) * 1000)
+import sys
+print(sorted(name for name in %r if name in sys.modules))
+root.destroy()
+"""
+
+
+def import_times(modules):
+    """
+    Import modules in a new interpreter and read the -X importtime report
+    
+    Args:
+        modules: Names of the modules to import
+    
+    Returns:
+        dict: {module: cumulative microseconds} for every module imported
+    """
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    code = "import " + ", ".join(modules)
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=SRC_DIR,
+                            env=env, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def top_level_ms(times, modules):
+    """Milliseconds spent importing the modules (and the site module)"""
+    return sum(times.get(name, 0) for name in modules + ["site"]) / 1000
+
+
+def median(values):
+    """Median of a list of numbers"""
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters to start per case")
+    args = parser.parse_args()
+    
+    for label, modules in (("lazy (current)", LAZY_IMPORTS), ("eager (old)", EAGER_IMPORTS)):
+        runs = [import_times(modules) for _ in range(args.runs)]
+        total = median([top_level_ms(times, modules) for times in runs])
+        loaded = [name for name in HEAVY_MODULES if name in runs[-1]]
+        print(f"{label:15} imports: {total:8.1f} ms median; heavy modules: {', '.join(loaded) or 'none'}")
+    
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    result = subprocess.run([sys.executable, "-c", SHOW_TIMER % (HEAVY_MODULES,)], cwd=SRC_DIR,
+                            env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print("timer visible:  skipped (no display available)")
+        return
+    visible_ms, loaded = result.stdout.splitlines()[:2]
+    print(f"timer visible:  {float(visible_ms):8.1f} ms (target < 300 ms); heavy modules: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark for statistics summary queries
+
+Builds years of synthetic daily study time, then compares the old
+full-history scans (week by formatting seven keys, month by prefix scan,
+total by summing every value) with StatisticsManager, which stores days in
+an ordinal-indexed array (week and month are slice sums, the total is kept
+running).
+
+It also times the streak: the old backwards walk over date strings
+against the incremental StreakTracker, and a full streak recompute.
+
+Usage:
+    python benchmarks/bench_statistics.py [--years 10] [--queries 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from core.statistics import StatisticsManager, StreakTracker
+
+
+def make_daily_stats(years):
+    """Random study time for most days of the last `years` years"""
+    today = date.today()
+    daily_stats = {}
+    for offset in range(years * 365):
+        if random.random() < 0.8:
+            day = today - timedelta(days=offset)
+            daily_stats[day.strftime("%Y-%m-%d")] = random.randint(600, 4 * 3600)
+    return daily_stats
+
+
+def legacy_summary(daily_stats):
+    """The old queries: format a week of keys, scan for the month, sum everything"""
+    current_date = datetime.now().date()
+    start_of_week = current_date - timedelta(days=current_date.weekday())
+    week_seconds = 0
+    for i in range(7):
+        day_str = (start_of_week + timedelta(days=i)).strftime("%Y-%m-%d")
+        week_seconds += daily_stats.get(day_str, 0)
+    month_prefix = current_date.strftime("%Y-%m")
+    month_seconds = sum(seconds for day_str, seconds in daily_stats.items()
+                        if day_str.startswith(month_prefix))
+    return week_seconds, month_seconds, sum(daily_stats.values())
+
+
+def legacy_streak(daily_stats):
+    """The old streak: walk back from today one formatted date at a time"""
+    current_date = datetime.now().date()
+    streak = 0
+    while True:
+        date_str = current_date.strftime("%Y-%m-%d")
+        if daily_stats.get(date_str, 0) >= 10 * 60:
+            streak += 1
+            current_date -= timedelta(days=1)
+        else:
+            return streak
+
+
+def time_per_call(function, repeat):
+    """Average wall time of a call in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=10, help="Years of synthetic history")
+    parser.add_argument("--queries", type=int, default=1000, help="Summary queries to time")
+    args = parser.parse_args()
+    
+    random.seed(1)
+    daily_stats = make_daily_stats(args.years)
+    # Worst case for the old walk: the last year studied every day
+    for offset in range(365):
+        daily_stats[(date.today() - timedelta(days=offset)).strftime("%Y-%m-%d")] = 1800
+    print(f"{args.years} years of history, {len(daily_stats):,} study days")
+    
+    start = time.perf_counter()
+    statistics = StatisticsManager(daily_stats)
+    load_ms = (time.perf_counter() - start) * 1000
+    
+    def incremental_summary():
+        return (statistics.get_week_time(), statistics.get_month_time(),
+                statistics.get_total_time())
+    
+    assert incremental_summary() == legacy_summary(daily_stats)
+    legacy_us = time_per_call(lambda: legacy_summary(daily_stats), args.queries)
+    incremental_us = time_per_call(incremental_summary, args.queries)
+    assert statistics.get_streak_days() == legacy_streak(daily_stats)
+    legacy_streak_us = time_per_call(lambda: legacy_streak(daily_stats), args.queries)
+    streak_us = time_per_call(statistics.get_streak_days, args.queries)
+    tracker = StreakTracker()
+    recompute_us = time_per_call(
+        lambda: tracker.recompute(statistics.seconds, statistics.first_ordinal), 100)
+    add_us = time_per_call(lambda: statistics.add_session_time(1500), args.queries)
+    
+    print(f"load from strings:        {load_ms:10.2f} ms")
+    print(f"legacy week+month+total:  {legacy_us:10.2f} us per refresh")
+    print(f"ordinal array:            {incremental_us:10.2f} us per refresh")
+    print(f"legacy streak walk:       {legacy_streak_us:10.2f} us ({statistics.get_streak_days()} days)")
+    print(f"tracked streak:           {streak_us:10.2f} us")
+    print(f"streak recompute:         {recompute_us:10.2f} us (longest {tracker.longest} days)")
+    print(f"add_session_time:         {add_us:10.2f} us per call")
+    print(f"array size:               {statistics.seconds.itemsize * len(statistics.seconds):10,} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""
+Vectorised analytics for Study Timer Pro
+"""
+
+import time
+from datetime import date
+
+import numpy as np
+
+from .pomodoro import FOCUS
+
+MINUTES_PER_DAY = 24 * 60
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def minutes_from_records(records, phase=FOCUS):
+    """
+    Spread session records over a day x minute grid of local time
+    
+    Each record adds its active share (pauses are spread evenly) to every
+    minute it covers, using a difference array and one cumulative sum
+    instead of walking the minutes.
+    
+    Args:
+        records: Session log records (dicts with start, end and paused)
+        phase: Phase to count
+    
+    Returns:
+        tuple: (ordinal of the first row, float32 array of shape
+            (days, 1440) with seconds studied in each minute), or
+            (None, empty array) when there is nothing to count
+    """
+    selected = [record for record in records
+                if record['phase'] == phase and record['end'] > record['start']]
+    if not selected:
+        return None, np.zeros((0, MINUTES_PER_DAY), dtype=np.float32)
+    
+    starts = np.array([record['start'] for record in selected])
+    ends = np.array([record['end'] for record in selected])
+    paused = np.array([record.get('paused', 0) for record in selected])
+    # Local time offset at the start of each record
+    offsets = np.array([time.localtime(start).tm_gmtoff for start in starts])
+    
+    local_starts = (starts + offsets) / 60.0
+    local_ends = (ends + offsets) / 60.0
+    share = np.clip((ends - starts - paused) / (ends - starts), 0.0, 1.0)
+    
+    first_minute = int(local_starts.min() // MINUTES_PER_DAY) * MINUTES_PER_DAY
+    days = int(local_ends.max() // MINUTES_PER_DAY) - first_minute // MINUTES_PER_DAY + 1
+    start_index = np.floor(local_starts).astype(np.int64) - first_minute
+    end_index = np.floor(local_ends).astype(np.int64) - first_minute
+    
+    # Seconds of each partial first and last minute are kept exact
+    rate = np.zeros(days * MINUTES_PER_DAY + 1, dtype=np.float64)
+    np.add.at(rate, start_index, share)
+    np.add.at(rate, end_index, -share)
+    minutes = np.cumsum(rate[:-1]) * 60.0
+    np.add.at(minutes, start_index, -(local_starts - start_index - first_minute) * 60.0 * share)
+    np.add.at(minutes, end_index, (local_ends - end_index - first_minute) * 60.0 * share)
+    
+    first_ordinal = EPOCH_ORDINAL + first_minute // MINUTES_PER_DAY
+    return first_ordinal, minutes.astype(np.float32).reshape(days, MINUTES_PER_DAY)
+
+class AnalyticsEngine:
+    """
+    Study history as NumPy arrays with vectorised summaries
+    
+    Two arrays are loaded once: seconds per day (covering the whole
+    history, including totals saved before sessions were logged) and a
+    day x minute grid built from the session log for the time-of-day
+    views.  The minute grid is also reduced to hours once, so the hour
+    views never touch every minute again.  Every query is a slice, reshape
+    or reduction of those arrays.
+    
+    sync() catches up with a history that has only grown: the seconds per
+    day are copied again (one small array) and only the new log records are
+    added to the minute and hour grids.
+    """
+    
+    def __init__(self, first_ordinal=None, daily=None, minutes_first_ordinal=None, minutes=None):
+        """
+        Initialize the engine
+        
+        Args:
+            first_ordinal: date.toordinal() of daily[0]
+            daily: Seconds studied per day
+            minutes_first_ordinal: date.toordinal() of minutes[0]
+            minutes: Array of shape (days, 1440) with seconds per minute
+        """
+        self.first_ordinal = first_ordinal
+        self.daily = np.asarray(daily if daily is not None else [], dtype=np.int64)
+        self.minutes_first_ordinal = minutes_first_ordinal
+        if minutes is None:
+            minutes = np.zeros((0, MINUTES_PER_DAY), dtype=np.float32)
+        self.minutes = minutes
+        self.hours = minutes.reshape(len(minutes), 24, 60).sum(axis=2, dtype=np.float64)
+        # Log the minute grid was built from and how much of it was read
+        self.records = None
+        self.record_count = 0
+    
+    @classmethod
+    def from_history(cls, statistics, records=()):
+        """
+        Load the engine from the statistics and the session log
+        
+        Args:
+            statistics: StatisticsManager with the seconds per day
+            records: Session log records for the time-of-day views
+        
+        Returns:
+            AnalyticsEngine: The loaded engine
+        """
+        minutes_first_ordinal, minutes = minutes_from_records(records)
+        engine = cls(None, None, minutes_first_ordinal, minutes)
+        engine.load_daily(statistics)
+        engine.records = records
+        engine.record_count = len(records)
+        return engine
+    
+    def load_daily(self, statistics):
+        """
+        Copy the seconds per day from the statistics
+        
+        Args:
+            statistics: StatisticsManager with the seconds per day
+        """
+        # array('I') exposes its buffer, so this is one copy into int64
+        self.first_ordinal = statistics.first_ordinal
+        self.daily = np.frombuffer(statistics.seconds, dtype=np.uint32).astype(np.int64)
+    
+    def sync(self, statistics, records):
+        """
+        Catch up with sessions recorded since the engine was loaded
+        
+        Args:
+            statistics: StatisticsManager with the seconds per day
+            records: The session log records the engine was loaded from
+        
+        Returns:
+            bool: False if the log was replaced or shrank, in which case
+                nothing was changed and the engine must be reloaded with
+                from_history()
+        """
+        if records is not self.records or len(records) < self.record_count:
+            return False
+        self.load_daily(statistics)
+        if len(records) > self.record_count:
+            self.add_records(records[self.record_count:])
+            self.record_count = len(records)
+        return True
+    
+    def add_records(self, records):
+        """
+        Add session records to the minute and hour grids
+        
+        Args:
+            records: Session log records not counted yet
+        """
+        first_ordinal, minutes = minutes_from_records(records)
+        if first_ordinal is None:
+            return
+        if self.minutes_first_ordinal is None:
+            self.minutes_first_ordinal = first_ordinal
+            self.minutes = minutes
+            self.hours = minutes.reshape(len(minutes), 24, 60).sum(axis=2, dtype=np.float64)
+            return
+        
+        # Grow the grids (only when the records reach a day not covered yet)
+        low = min(self.minutes_first_ordinal, first_ordinal)
+        high = max(self.minutes_first_ordinal + len(self.minutes), first_ordinal + len(minutes))
+        if (low, high) != (self.minutes_first_ordinal, self.minutes_first_ordinal + len(self.minutes)):
+            offset = self.minutes_first_ordinal - low
+            grown = np.zeros((high - low, MINUTES_PER_DAY), dtype=np.float32)
+            grown[offset:offset + len(self.minutes)] = self.minutes
+            grown_hours = np.zeros((high - low, 24), dtype=np.float64)
+            grown_hours[offset:offset + len(self.hours)] = self.hours
+            self.minutes_first_ordinal = low
+            self.minutes = grown
+            self.hours = grown_hours
+        
+        offset = first_ordinal - self.minutes_first_ordinal
+        self.minutes[offset:offset + len(minutes)] += minutes
+        self.hours[offset:offset + len(minutes)] += minutes.reshape(len(minutes), 24, 60).sum(
+            axis=2, dtype=np.float64)
+    
+    def get_daily_series(self, first_day, count):
+        """
+        Get the seconds of consecutive days
+        
+        Args:
+            first_day: datetime.date of the first day
+            count: Number of days
+        
+        Returns:
+            ndarray: int64 seconds per day (zero where nothing was recorded)
+        """
+        return self._window(self.daily, self.first_ordinal, first_day.toordinal(), count)
+    
+    def get_weekly_series(self):
+        """
+        Get the total of every Monday-to-Sunday week
+        
+        Returns:
+            tuple: (ordinals of the Mondays, int64 seconds per week)
+        """
+        if self.first_ordinal is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        # Ordinal 1 (0001-01-01) is a Monday
+        lead = (self.first_ordinal - 1) % 7
+        padded = np.zeros(lead + len(self.daily) + 6, dtype=np.int64)
+        padded[lead:lead + len(self.daily)] = self.daily
+        weeks = padded[:len(padded) // 7 * 7].reshape(-1, 7).sum(axis=1)
+        mondays = self.first_ordinal - lead + 7 * np.arange(len(weeks))
+        return mondays, weeks
+    
+    def get_monthly_series(self):
+        """
+        Get the total of every calendar month
+        
+        Returns:
+            tuple: (datetime64[M] months, int64 seconds per month)
+        """
+        if self.first_ordinal is None:
+            return np.zeros(0, dtype='datetime64[M]'), np.zeros(0, dtype=np.int64)
+        days = (np.datetime64(date.fromordinal(self.first_ordinal), 'D') +
+                np.arange(len(self.daily)))
+        months = days.astype('datetime64[M]')
+        starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+        return months[starts], np.add.reduceat(self.daily, starts)
+    
+    def get_rolling_average(self, window=7):
+        """
+        Get the trailing average of the seconds per day
+        
+        Args:
+            window: Days in the average
+        
+        Returns:
+            ndarray: float64 average ending on each day (shorter at the start)
+        """
+        if len(self.daily) == 0:
+            return np.zeros(0)
+        totals = np.cumsum(np.r_[0, self.daily])
+        ends = np.arange(1, len(self.daily) + 1)
+        starts = np.maximum(ends - window, 0)
+        return (totals[ends] - totals[starts]) / (ends - starts)
+    
+    def get_percentiles(self, percentiles=(50, 75, 90, 99)):
+        """
+        Get percentiles of the seconds per study day
+        
+        Args:
+            percentiles: Percentiles to compute (0-100)
+        
+        Returns:
+            dict: {percentile: seconds}, zero when there are no study days
+        """
+        study_days = self.daily[self.daily > 0]
+        if len(study_days) == 0:
+            return {percentile: 0.0 for percentile in percentiles}
+        values = np.percentile(study_days, percentiles)
+        return dict(zip(percentiles, values.tolist()))
+    
+    def get_weekday_totals(self):
+        """
+        Get the seconds studied on each weekday
+        
+        Returns:
+            ndarray: int64 totals, index 0 being Monday
+        """
+        if len(self.daily) == 0:
+            return np.zeros(7, dtype=np.int64)
+        weekdays = (self.first_ordinal - 1 + np.arange(len(self.daily))) % 7
+        return np.bincount(weekdays, weights=self.daily, minlength=7).astype(np.int64)
+    
+    def get_hourly_series(self, day):
+        """
+        Get the seconds studied in each hour of one day
+        
+        Args:
+            day: datetime.date to report on
+        
+        Returns:
+            ndarray: float64 seconds for each of the 24 hours
+        """
+        return self._window(self.hours, self.minutes_first_ordinal, day.toordinal(), 1)[0]
+    
+    def get_hour_totals(self):
+        """
+        Get the seconds studied in each hour of the day over all days
+        
+        Returns:
+            ndarray: float64 seconds for each of the 24 hours
+        """
+        return self.hours.sum(axis=0)
+    
+    def get_weekday_hour_heatmap(self):
+        """
+        Get the seconds studied per weekday and hour
+        
+        Returns:
+            ndarray: float64 array of shape (7, 24), row 0 being Monday
+        """
+        days = len(self.hours)
+        if days == 0:
+            return np.zeros((7, 24))
+        weekdays = (self.minutes_first_ordinal - 1 + np.arange(days)) % 7
+        one_hot = weekdays == np.arange(7)[:, np.newaxis]
+        return one_hot.astype(np.float64) @ self.hours
+    
+    def compute_all(self):
+        """
+        Compute every summary at once
+        
+        Returns:
+            dict: Results keyed by summary name
+        """
+        return {
+            'weekly': self.get_weekly_series(),
+            'monthly': self.get_monthly_series(),
+            'rolling_average': self.get_rolling_average(),
+            'percentiles': self.get_percentiles(),
+            'weekday_totals': self.get_weekday_totals(),
+            'hour_totals': self.get_hour_totals(),
+            'weekday_hour_heatmap': self.get_weekday_hour_heatmap(),
+        }
+    
+    @staticmethod
+    def _window(values, first_ordinal, start_ordinal, count):
+        """Slice `count` rows starting at a day, padding missing days with zeros"""
+        result = np.zeros((count,) + values.shape[1:], dtype=values.dtype)
+        if first_ordinal is None:
+            return result
+        start = start_ordinal - first_ordinal
+        low, high = max(start, 0), min(start + count, len(values))
+        if low < high:
+            result[low - start:high - start] = values[low:high]
+        return result
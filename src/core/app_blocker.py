@@ -2,49 +2,87 @@
 App blocking functionality for Study Timer Pro
 """
 
+import os
 import platform
-import subprocess
+import signal
 import psutil
 
-def block_application(app_name):
+from .app_matcher import AppMatcher
+
+# Windows has no SIGKILL; psutil terminates the process there instead
+HAS_SIGKILL = hasattr(signal, "SIGKILL")
+
+def block_application(app_name, pid_index=None):
     """
     Block an application by terminating its process
     
     Args:
         app_name: Name of the application to block
+        pid_index: Optional mapping of PID to process name (such as
+            ProcessWatcher.snapshot()) used instead of listing processes
     
     Returns:
         bool: True if successful, False otherwise
     """
+    return block_applications([app_name], pid_index) is not None
+
+def block_applications(app_names, pid_index=None, matcher=None):
+    """
+    Terminate every running process that belongs to one of the applications
+    
+    All matching PIDs are collected in a single pass over the process table
+    and signalled directly, without spawning killall/taskkill per app.
+    
+    Args:
+        app_names: Names of the applications to block
+        pid_index: Optional mapping of PID to process name (such as
+            ProcessWatcher.snapshot()) used instead of listing processes
+        matcher: Optional AppMatcher to reuse between calls
+    
+    Returns:
+        list: PIDs that were terminated, or None if blocking failed
+    """
     try:
-        if platform.system() == "Windows":
-            # Try multiple variations of the app name
-            for exe_name in [f"{app_name}.exe", app_name]:
-                try:
-                    subprocess.run(["taskkill", "/IM", exe_name, "/F"],
-                                 check=False,
-                                 capture_output=True)
-                except:
-                    pass
-                
-        # On macOS
-        elif platform.system() == "Darwin":
-            try:
-                subprocess.run(["killall", app_name], check=False, capture_output=True)
-            except:
-                pass
-                
-        # On Linux
-        elif platform.system() == "Linux":
-            try:
-                subprocess.run(["killall", app_name], check=False, capture_output=True)
-            except:
-                pass
+        if matcher is None:
+            matcher = AppMatcher(app_names)
+        else:
+            matcher.update(app_names)
+        if not len(matcher):
+            return []
+        
+        if pid_index is None:
+            pid_index = {proc.info['pid']: proc.info['name']
+                         for proc in psutil.process_iter(['pid', 'name'])}
         
-        return True
+        own_pid = os.getpid()
+        pids = [pid for pid, app in matcher.match_processes(pid_index.items()) if pid != own_pid]
+        return terminate_processes(pids)
     except Exception as e:
-        print(f"Error blocking {app_name}: {e}")
-        return False
+        print(f"Error blocking {', '.join(app_names)}: {e}")
+        return None
+
+def terminate_processes(pids):
+    """
+    Forcefully terminate a batch of processes
+    
+    Args:
+        pids: Process IDs to terminate
+    
+    Returns:
+        list: PIDs that were terminated
+    """
+    terminated = []
+    for pid in pids:
+        try:
+            if HAS_SIGKILL:
+                os.kill(pid, signal.SIGKILL)
+            else:
+                psutil.Process(pid).kill()
+            terminated.append(pid)
+        except (ProcessLookupError, PermissionError,
+                psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            pass
+    return terminated
 
 def unblock_application(app_name):
     """
@@ -59,27 +97,26 @@ def unblock_application(app_name):
     # We don't actually start the app, just allow it to be opened
     return True
 
-def monitor_applications(app_list):
+def monitor_applications(app_list, matcher=None):
     """
     Check if any of the applications in the list are running
     
     Args:
         app_list: List of application names to check
+        matcher: Optional AppMatcher to reuse between calls (its per-PID
+            cache means each process is only matched once)
     
     Returns:
         list: List of running applications from the provided list
     """
-    running_apps = []
-    
-    for proc in psutil.process_iter(['name']):
-        try:
-            for app in app_list:
-                if app.lower() in proc.info['name'].lower():
-                    running_apps.append(app)
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
+    if matcher is None:
+        matcher = AppMatcher(app_list)
+    else:
+        matcher.update(app_list)
     
-    return running_apps
+    processes = ((proc.info['pid'], proc.info['name'])
+                 for proc in psutil.process_iter(['pid', 'name']))
+    return [app for pid, app in matcher.match_processes(processes)]
 
 def is_admin():
     """
@@ -0,0 +1,132 @@
+"""
+Locked app name matching for Study Timer Pro
+"""
+
+import re
+import threading
+
+class AppMatcher:
+    """
+    Matches process names against the locked app list
+    
+    The list is compiled once per change into an exact-name set and a
+    single alternation regex, so a process name is checked in one pass
+    instead of once per locked app.  Results are cached per PID, so a
+    process is only ever matched once for its lifetime.
+    """
+    
+    def __init__(self, app_names=()):
+        """
+        Initialize the matcher
+        
+        Args:
+            app_names: Locked application names (matched case-insensitively
+                as substrings of the process name)
+        """
+        self.apps = ()
+        self.exact = {}
+        self.pattern = None
+        self.pid_cache = {}
+        self._lock = threading.Lock()  # The process watcher matches from its own thread
+        self.update(app_names)
+    
+    def __len__(self):
+        return len(self.apps)
+    
+    def update(self, app_names):
+        """
+        Recompile the matcher if the app list changed
+        
+        Args:
+            app_names: Locked application names
+        
+        Returns:
+            bool: True if the matcher was recompiled
+        """
+        apps = tuple(app_names)
+        if apps == self.apps:
+            return False
+        
+        exact = {}
+        for app in apps:
+            if app:
+                exact.setdefault(app.lower(), app)
+        
+        # Longest names first so the reported app is the most specific one
+        keys = sorted(exact, key=len, reverse=True)
+        pattern = re.compile("|".join(map(re.escape, keys))) if keys else None
+        
+        with self._lock:
+            self.apps = apps
+            self.exact = exact
+            self.pattern = pattern
+            self.pid_cache = {}
+        return True
+    
+    def match(self, name):
+        """
+        Find the locked app a process name belongs to
+        
+        Args:
+            name: Process name
+        
+        Returns:
+            str: The matching locked app name, or None
+        """
+        exact, pattern = self.exact, self.pattern
+        if pattern is None or not name:
+            return None
+        lowered = name.lower()
+        app = exact.get(lowered)
+        if app is not None:
+            return app
+        found = pattern.search(lowered)
+        return exact.get(found.group()) if found else None
+    
+    def match_pid(self, pid, name):
+        """
+        Match a process, reusing the result from earlier calls for the PID
+        
+        Args:
+            pid: Process ID
+            name: Process name (a different name means the PID was reused)
+        
+        Returns:
+            str: The matching locked app name, or None
+        """
+        with self._lock:
+            cached = self.pid_cache.get(pid)
+            if cached is not None and cached[0] == name:
+                return cached[1]
+            app = self.match(name)
+            self.pid_cache[pid] = (name, app)
+            return app
+    
+    def match_processes(self, processes):
+        """
+        Match a batch of processes, reusing cached per-PID results
+        
+        Args:
+            processes: Iterable of (pid, name) pairs
+        
+        Returns:
+            list: (pid, app) pairs for the processes that matched
+        """
+        matches = []
+        with self._lock:
+            cache = self.pid_cache
+            for pid, name in processes:
+                cached = cache.get(pid)
+                if cached is not None and cached[0] == name:
+                    app = cached[1]
+                else:
+                    app = self.match(name)
+                    cache[pid] = (name, app)
+                if app is not None:
+                    matches.append((pid, app))
+        return matches
+    
+    def forget(self, pid):
+        """Drop the cached result for a process that has exited"""
+        with self._lock:
+            self.pid_cache.pop(pid, None)
@@ -0,0 +1,281 @@
+"""
+Large blocklist import for Study Timer Pro
+
+Community blocklists come as hosts files, AdBlock filter lists or plain
+domain lists with a million or more entries.  They are parsed line by line
+and stored as a sorted array of reversed-label names ("com.example.ads")
+packed into one byte string, so a million domains take roughly 25 MB and
+a lookup is a handful of binary searches.
+"""
+
+import hashlib
+import heapq
+import re
+from array import array
+from itertools import accumulate
+
+# Entry flags
+EXACT = 1
+SUBDOMAINS = 2
+
+# Lowercase hostnames with at least one dot
+DOMAIN_PATTERN = re.compile(r"[a-z0-9_-]+(?:\.[a-z0-9_-]+)+")
+
+# Names that appear in hosts files but are never worth blocking
+IGNORED_HOSTS = frozenset({
+    "localhost", "localhost.localdomain", "local", "broadcasthost",
+    "ip6-localhost", "ip6-loopback", "ip6-localnet", "ip6-mcastprefix",
+    "ip6-allnodes", "ip6-allrouters", "ip6-allhosts", "0.0.0.0",
+})
+
+def parse_blocklist_line(line):
+    """
+    Extract the blocked domains from one blocklist line
+    
+    Understands hosts entries ("0.0.0.0 ads.example.com"), AdBlock domain
+    rules ("||example.com^") and plain names ("example.com" or
+    "*.example.com").  Comments, exceptions and rules that are not about a
+    whole domain are skipped.
+    
+    Args:
+        line: One line of a blocklist
+    
+    Returns:
+        list: (domain, flag) pairs, where flag is EXACT or SUBDOMAINS
+    """
+    line = line.strip().lower()
+    if not line or line[0] in "#![@":
+        return []
+    
+    if line.startswith("||"):
+        rule = line[2:].split("$", 1)[0]
+        if rule.endswith("^"):
+            rule = rule[:-1]
+        return [(rule, SUBDOMAINS)] if DOMAIN_PATTERN.fullmatch(rule) else []
+    
+    if "#" in line:
+        line = line.split("#", 1)[0]
+    fields = line.split()
+    # Hosts format: the first field is the address
+    names = fields[1:] if len(fields) > 1 else fields
+    
+    entries = []
+    for name in names:
+        flag = EXACT
+        if name.startswith("*."):
+            name, flag = name[2:], SUBDOMAINS
+        name = name.rstrip(".")
+        if DOMAIN_PATTERN.fullmatch(name) and name not in IGNORED_HOSTS:
+            entries.append((name, flag))
+    return entries
+
+def iter_blocklist_file(path):
+    """
+    Stream the entries of a blocklist file without loading it into memory
+    
+    Args:
+        path: Path of the blocklist
+    
+    Yields:
+        tuple: (domain, flag) pairs
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as blocklist_file:
+        for line in blocklist_file:
+            yield from parse_blocklist_line(line)
+
+def load_blocklist_file(path):
+    """
+    Import a blocklist file
+    
+    Args:
+        path: Path of the blocklist
+    
+    Returns:
+        CompactBlocklist: The imported domains
+    """
+    return CompactBlocklist.build(iter_blocklist_file(path))
+
+def _reverse(name):
+    """Turn "ads.example.com" into the sort key b"com.example.ads" """
+    return ".".join(reversed(name.split("."))).encode("ascii")
+
+class CompactBlocklist:
+    """
+    Immutable sorted set of blocked domains
+    
+    Reversed names are concatenated into one bytes object with an
+    array('I') of offsets and a bytearray of flags, avoiding a Python
+    object per domain.  A name is blocked if it is listed exactly, or if
+    one of its parent domains is listed with the SUBDOMAINS flag.
+    """
+    
+    def __init__(self, blob=b"", offsets=None, flags=None):
+        """
+        Wrap already sorted data (use build() to create a blocklist)
+        
+        Args:
+            blob: Concatenated reversed names in sorted order (bytes-like)
+            offsets: array('I') with the start of each name plus the end
+            flags: bytearray with one flag per name
+        """
+        self._blob = blob
+        self._offsets = offsets if offsets is not None else array('I', [0])
+        self._flags = flags if flags is not None else bytearray()
+        self._digest = None
+    
+    def __len__(self):
+        return len(self._flags)
+    
+    def __contains__(self, name):
+        return self.is_blocked(name)
+    
+    @classmethod
+    def build(cls, entries, chunk_size=50000):
+        """
+        Build a blocklist from a stream of entries
+        
+        Entries are sorted in bounded chunks which are then merged, so only
+        one chunk exists as Python objects at a time.
+        
+        Args:
+            entries: Iterable of (domain, flag) pairs
+            chunk_size: Entries sorted in memory at once
+        
+        Returns:
+            CompactBlocklist: The blocklist
+        """
+        runs = []
+        chunk = {}
+        for name, flag in entries:
+            key = _reverse(name)
+            chunk[key] = chunk.get(key, 0) | flag
+            if len(chunk) >= chunk_size:
+                runs.append(cls._pack_chunk(chunk))
+                chunk = {}
+        if chunk or not runs:
+            runs.append(cls._pack_chunk(chunk))
+        if len(runs) == 1:
+            return runs[0]
+        return cls._merge(runs)
+    
+    @classmethod
+    def _pack_chunk(cls, chunk):
+        """Pack a dict of key -> flag into a blocklist"""
+        keys = sorted(chunk)
+        flags = bytearray(map(chunk.__getitem__, keys))
+        offsets = array('I', accumulate(map(len, keys), initial=0))
+        return cls(b"".join(keys), offsets, flags)
+    
+    @classmethod
+    def _merge(cls, runs):
+        """Merge sorted blocklists, combining the flags of duplicate names"""
+        blob = bytearray()
+        offsets = array('I', [0])
+        flags = bytearray()
+        previous = None
+        for key, flag in heapq.merge(*(run._items() for run in runs)):
+            if key == previous:
+                flags[-1] |= flag
+                continue
+            blob += key
+            offsets.append(len(blob))
+            flags.append(flag)
+            previous = key
+        return cls(blob, offsets, flags)
+    
+    def _items(self):
+        """Iterate over the (key, flag) pairs in order"""
+        blob, offsets, flags = self._blob, self._offsets, self._flags
+        for index in range(len(flags)):
+            yield blob[offsets[index]:offsets[index + 1]], flags[index]
+    
+    def _find(self, key):
+        """Binary search for a reversed name, returning its flag or 0"""
+        blob, offsets = self._blob, self._offsets
+        low, high = 0, len(self._flags)
+        while low < high:
+            middle = (low + high) // 2
+            current = blob[offsets[middle]:offsets[middle + 1]]
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return self._flags[middle]
+        return 0
+    
+    def lookup(self, name):
+        """
+        Get the flags a hostname itself is listed with
+        
+        Args:
+            name: Hostname to look up
+        
+        Returns:
+            int: EXACT and/or SUBDOMAINS, or 0 if the name is not listed
+        """
+        key = self._key(name)
+        return self._find(key) if key is not None else 0
+    
+    def is_blocked(self, name):
+        """
+        Check whether a hostname is blocked
+        
+        Args:
+            name: Hostname to check
+        
+        Returns:
+            bool: True if the name or a wildcard parent is listed
+        """
+        key = self._key(name)
+        if key is None:
+            return False
+        
+        if self._find(key):
+            return True
+        # Then each parent domain: "com.example", then "com"
+        end = len(key)
+        while True:
+            end = key.rfind(b".", 0, end)
+            if end <= 0:
+                return False
+            if self._find(key[:end]) & SUBDOMAINS:
+                return True
+    
+    def _key(self, name):
+        """Turn a hostname into its reversed search key, or None if it is not ASCII"""
+        labels = name.lower().rstrip(".").split(".")
+        labels.reverse()
+        try:
+            return ".".join(labels).encode("ascii")
+        except UnicodeEncodeError:
+            return None
+    
+    def digest(self):
+        """
+        Get a fingerprint of the listed domains and flags
+        
+        Returns:
+            str: Hex digest that is equal for equal blocklists
+        """
+        if self._digest is None:
+            hasher = hashlib.sha1(self._blob)
+            hasher.update(self._offsets.tobytes())
+            hasher.update(self._flags)
+            self._digest = hasher.hexdigest()[:16]
+        return self._digest
+    
+    def iter_domains(self):
+        """
+        Iterate over the listed domains
+        
+        Yields:
+            str: Each domain in its normal label order
+        """
+        for key, _ in self._items():
+            yield ".".join(reversed(key.decode("ascii").split(".")))
+    
+    def get_size_bytes(self):
+        """Get the memory held by the packed arrays"""
+        return (len(self._blob) + self._offsets.itemsize * len(self._offsets) +
+                len(self._flags))
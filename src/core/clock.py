@@ -0,0 +1,62 @@
+"""
+Clock sources for Study Timer Pro
+"""
+
+import time
+
+class SystemClock:
+    """
+    Real monotonic clock
+    
+    Clocks are plain callables returning the current time in seconds, so
+    time.monotonic itself is a valid clock; this class exists to give the
+    real clock the same shape as FakeClock.
+    """
+    
+    def __call__(self):
+        """Get the current monotonic time in seconds"""
+        return time.monotonic()
+    
+    def sleep(self, seconds):
+        """Block for the given number of seconds"""
+        time.sleep(seconds)
+
+class FakeClock:
+    """
+    Deterministic clock for tests and simulations
+    
+    Time only moves when advance() or sleep() is called, so hours of timer
+    activity can be fast-forwarded instantly.
+    """
+    
+    def __init__(self, start=0.0):
+        """
+        Initialize the fake clock
+        
+        Args:
+            start: Initial time in seconds
+        """
+        self.now = float(start)
+    
+    def __call__(self):
+        """Get the current fake time in seconds"""
+        return self.now
+    
+    def advance(self, seconds):
+        """
+        Move the clock forward
+        
+        Args:
+            seconds: Number of seconds to advance
+        
+        Returns:
+            float: The new current time
+        """
+        if seconds < 0:
+            raise ValueError("A clock cannot go backwards")
+        self.now += seconds
+        return self.now
+    
+    def sleep(self, seconds):
+        """Advance the clock instead of blocking"""
+        self.advance(seconds)
@@ -0,0 +1,552 @@
+"""
+Local DNS sinkhole for Study Timer Pro
+
+A small stub resolver bound to localhost: blocked names get NXDOMAIN,
+everything else is forwarded to an upstream resolver and cached.  Point
+the system (or browser) resolver at it to block sites without root access
+to the hosts file; wildcards such as "*.reddit.com" work too.
+"""
+
+import asyncio
+import random
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from .website_blocker import BlockingBackend, site_hostnames
+
+DNS_HEADER = struct.Struct("!HHHHHH")
+RR_FIXED = struct.Struct("!HHIH")
+FLAG_QR = 0x8000
+FLAG_TC = 0x0200
+FLAG_RD = 0x0100
+FLAG_RA = 0x0080
+OPCODE_MASK = 0x7800
+RCODE_NXDOMAIN = 3
+TYPE_OPT = 41
+
+# Unprivileged port the sinkhole listens on by default (port 53 needs root)
+DEFAULT_PORT = 5335
+
+def parse_question(packet):
+    """
+    Read the first question of a DNS message
+    
+    Args:
+        packet: Raw DNS message
+    
+    Returns:
+        tuple: (lowercase name, qtype, qclass, offset just past the question)
+    
+    Raises:
+        ValueError: If the message is malformed
+    """
+    if len(packet) < DNS_HEADER.size:
+        raise ValueError("Message shorter than a DNS header")
+    if DNS_HEADER.unpack_from(packet)[2] < 1:
+        raise ValueError("Message has no question")
+    
+    labels = []
+    offset = DNS_HEADER.size
+    while True:
+        if offset >= len(packet):
+            raise ValueError("Question name runs past the message")
+        length = packet[offset]
+        offset += 1
+        if length == 0:
+            break
+        if length > 63:
+            raise ValueError("Compressed or invalid question name")
+        labels.append(packet[offset:offset + length].decode("ascii", "replace").lower())
+        offset += length
+    if offset + 4 > len(packet):
+        raise ValueError("Question type runs past the message")
+    qtype, qclass = struct.unpack_from("!HH", packet, offset)
+    return ".".join(labels), qtype, qclass, offset + 4
+
+def build_nxdomain(query, question_end):
+    """
+    Build an NXDOMAIN answer to a query
+    
+    Args:
+        query: Raw DNS query
+        question_end: Offset just past the question
+    
+    Returns:
+        bytes: The response message
+    """
+    query_id, flags = struct.unpack_from("!HH", query)
+    flags = FLAG_QR | FLAG_RA | (flags & (OPCODE_MASK | FLAG_RD)) | RCODE_NXDOMAIN
+    return DNS_HEADER.pack(query_id, flags, 1, 0, 0, 0) + query[DNS_HEADER.size:question_end]
+
+def get_answer_ttl(response, question_end):
+    """
+    Get how long a response may be cached
+    
+    Args:
+        response: Raw DNS response
+        question_end: Offset just past the question
+    
+    Returns:
+        int: Smallest TTL among the answer and authority records, or None
+            if the response has no records or cannot be parsed
+    """
+    _, _, _, answers, authority, _ = DNS_HEADER.unpack_from(response)
+    offset = question_end
+    ttl = None
+    try:
+        for _ in range(answers + authority):
+            offset = _skip_name(response, offset)
+            _, _, record_ttl, length = RR_FIXED.unpack_from(response, offset)
+            offset += RR_FIXED.size + length
+            ttl = record_ttl if ttl is None else min(ttl, record_ttl)
+    except (struct.error, IndexError):
+        return None
+    return ttl
+
+def age_ttls(response, question_end, elapsed):
+    """
+    Count down the TTLs of a cached response
+    
+    Args:
+        response: Raw DNS response
+        question_end: Offset just past the question
+        elapsed: Whole seconds the response has been cached for
+    
+    Returns:
+        bytes: The response with every record's TTL reduced by elapsed
+            (never below zero), or unchanged if it cannot be parsed
+    """
+    if elapsed <= 0:
+        return response
+    _, _, _, answers, authority, additional = DNS_HEADER.unpack_from(response)
+    aged = bytearray(response)
+    offset = question_end
+    try:
+        for _ in range(answers + authority + additional):
+            offset = _skip_name(response, offset)
+            rtype, rclass, ttl, length = RR_FIXED.unpack_from(response, offset)
+            # The OPT pseudo-record keeps EDNS flags where the TTL would be
+            if rtype != TYPE_OPT:
+                RR_FIXED.pack_into(aged, offset, rtype, rclass, max(0, ttl - elapsed), length)
+            offset += RR_FIXED.size + length
+    except (struct.error, IndexError):
+        return response
+    return bytes(aged)
+
+def _skip_name(packet, offset):
+    """Skip a possibly compressed name in a resource record"""
+    while True:
+        length = packet[offset]
+        if length == 0:
+            return offset + 1
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        offset += length + 1
+
+class DomainBlocklist:
+    """
+    Exact and wildcard hostnames to sinkhole
+    
+    Lookups check the name and then each parent domain against the
+    wildcard set, so they cost one set probe per label.
+    """
+    
+    def __init__(self):
+        self.exact = set()
+        self.wildcards = set()
+        self.imported = []
+    
+    def __len__(self):
+        return len(self.exact) + len(self.wildcards) + sum(map(len, self.imported))
+    
+    def add(self, site):
+        """Block a site ("*.example.com" blocks the domain and all subdomains)"""
+        wildcard, hostnames = self._parse(site)
+        if wildcard:
+            self.wildcards.add(wildcard)
+        else:
+            self.exact.update(hostnames)
+    
+    def remove(self, site):
+        """Unblock a site"""
+        wildcard, hostnames = self._parse(site)
+        if wildcard:
+            self.wildcards.discard(wildcard)
+        else:
+            self.exact.difference_update(hostnames)
+    
+    def add_list(self, blocklist):
+        """
+        Block every domain of an imported CompactBlocklist
+        
+        Returns:
+            bool: False if the same list was already imported
+        """
+        if any(other.digest() == blocklist.digest() for other in self.imported):
+            return False
+        self.imported = self.imported + [blocklist]
+        return True
+    
+    def clear(self, imported=True):
+        """
+        Unblock everything
+        
+        Args:
+            imported: Whether imported lists are dropped as well
+        """
+        self.exact.clear()
+        self.wildcards.clear()
+        if imported:
+            self.imported = []
+    
+    def is_blocked(self, name):
+        """
+        Check whether a hostname is blocked
+        
+        Args:
+            name: Lowercase hostname without a trailing dot
+        
+        Returns:
+            bool: True if the name should be sinkholed
+        """
+        if name in self.exact:
+            return True
+        if any(blocklist.is_blocked(name) for blocklist in self.imported):
+            return True
+        if not self.wildcards:
+            return False
+        while name:
+            if name in self.wildcards:
+                return True
+            name = name.partition(".")[2]
+        return False
+    
+    def _parse(self, site):
+        """Split a site into a wildcard domain or its exact hostnames"""
+        site = site.strip().lower()
+        if site.startswith("*."):
+            return site_hostnames(site)[0], ()
+        return None, site_hostnames(site)
+
+class AnswerCache:
+    """
+    Bounded LRU cache of upstream answers keyed by question
+    """
+    
+    def __init__(self, max_entries=2048, max_ttl=3600, clock=time.monotonic):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries: Number of answers kept before the oldest is dropped
+            max_ttl: Upper bound on how long an answer is kept, in seconds
+            clock: Function returning the current monotonic time in seconds
+        """
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def get(self, key):
+        """Get a cached response, or None if missing or expired"""
+        entry = self.lookup(key)
+        return entry[0] if entry is not None else None
+    
+    def lookup(self, key):
+        """
+        Get a cached response and how long it has been cached
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            tuple: (response, age in seconds), or None if missing or expired
+        """
+        entry = self.entries.get(key)
+        now = self.clock()
+        if entry is None or entry[1] <= now:
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0], now - entry[2]
+    
+    def put(self, key, response, ttl):
+        """Store a response for at most ttl seconds"""
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0:
+            return
+        now = self.clock()
+        self.entries[key] = (response, now + ttl, now)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+class _ServerProtocol(asyncio.DatagramProtocol):
+    """Receives client queries"""
+    
+    def __init__(self, sinkhole):
+        self.sinkhole = sinkhole
+        self.transport = None
+    
+    def connection_made(self, transport):
+        self.transport = transport
+    
+    def datagram_received(self, data, addr):
+        response = self.sinkhole.answer_locally(data)
+        if response is not None:
+            self.transport.sendto(response, addr)
+        else:
+            asyncio.ensure_future(self._forward(data, addr))
+    
+    async def _forward(self, data, addr):
+        response = await self.sinkhole.forward(data)
+        if response is not None and self.transport is not None:
+            self.transport.sendto(response, addr)
+
+class _UpstreamProtocol(asyncio.DatagramProtocol):
+    """Matches upstream responses to pending queries by transaction ID"""
+    
+    def __init__(self):
+        self.pending = {}
+    
+    def datagram_received(self, data, addr):
+        if len(data) >= 2:
+            future = self.pending.pop(struct.unpack_from("!H", data)[0], None)
+            if future is not None and not future.done():
+                future.set_result(data)
+
+class DnsSinkhole:
+    """
+    Asyncio DNS stub resolver that sinkholes blocked names
+    
+    Blocked names are answered with NXDOMAIN without leaving the machine.
+    Other queries are forwarded upstream under a fresh transaction ID and
+    the answers are cached for their TTL, so repeated lookups are served
+    from memory.
+    """
+    
+    def __init__(self, blocklist=None, upstream=("1.1.1.1", 53), host="127.0.0.1", port=DEFAULT_PORT,
+                 timeout=2.0, cache=None):
+        """
+        Initialize the sinkhole
+        
+        Args:
+            blocklist: DomainBlocklist to enforce (a new empty one if None)
+            upstream: (host, port) of the resolver to forward to
+            host: Address to listen on
+            port: Port to listen on (0 picks a free port; 53 needs root)
+            timeout: Seconds to wait for the upstream resolver
+            cache: AnswerCache to use (a new one if None)
+        """
+        self.blocklist = blocklist if blocklist is not None else DomainBlocklist()
+        self.upstream = upstream
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.cache = cache if cache is not None else AnswerCache()
+        self.blocked_count = 0
+        self.forwarded_count = 0
+        self.address = None
+        self._loop = None
+        self._thread = None
+        self._server = None
+        self._upstream = None
+        self._upstream_protocol = None
+    
+    @property
+    def is_running(self):
+        """Whether the sinkhole is serving queries"""
+        return self._thread is not None
+    
+    def start(self):
+        """
+        Start serving from a background thread
+        
+        Returns:
+            tuple: The (host, port) the sinkhole listens on
+        """
+        if self._thread is not None:
+            return self.address
+        
+        ready = threading.Event()
+        errors = []
+        self._loop = asyncio.new_event_loop()
+        
+        def run():
+            asyncio.set_event_loop(self._loop)
+            try:
+                self._loop.run_until_complete(self._open())
+            except Exception as e:
+                errors.append(e)
+                ready.set()
+                return
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self._close())
+            self._loop.close()
+        
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread = None
+            raise errors[0]
+        return self.address
+    
+    def stop(self):
+        """Stop serving"""
+        if self._thread is None:
+            return False
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        return True
+    
+    def answer_locally(self, query):
+        """
+        Answer a query from the blocklist or the cache
+        
+        Args:
+            query: Raw DNS query
+        
+        Returns:
+            bytes: The response, or None if the query must go upstream
+        """
+        try:
+            name, qtype, qclass, question_end = parse_question(query)
+        except ValueError:
+            return None
+        
+        if self.blocklist.is_blocked(name):
+            self.blocked_count += 1
+            return build_nxdomain(query, question_end)
+        
+        entry = self.cache.lookup((name, qtype, qclass))
+        if entry is None:
+            return None
+        # Clients must not keep the answer longer than the upstream allowed
+        cached = age_ttls(entry[0], question_end, int(entry[1]))
+        # Echo the client's ID and question (including its letter case)
+        return query[:2] + cached[2:DNS_HEADER.size] + query[DNS_HEADER.size:question_end] + cached[question_end:]
+    
+    async def forward(self, query):
+        """
+        Send a query upstream and cache the answer
+        
+        Args:
+            query: Raw DNS query
+        
+        Returns:
+            bytes: The upstream response, or None on timeout
+        """
+        pending = self._upstream_protocol.pending
+        upstream_id = random.getrandbits(16)
+        while upstream_id in pending:
+            upstream_id = random.getrandbits(16)
+        future = self._loop.create_future()
+        pending[upstream_id] = future
+        self._upstream.sendto(struct.pack("!H", upstream_id) + query[2:])
+        self.forwarded_count += 1
+        
+        try:
+            response = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            pending.pop(upstream_id, None)
+            return None
+        
+        response = query[:2] + response[2:]
+        try:
+            name, qtype, qclass, question_end = parse_question(response)
+        except ValueError:
+            return response
+        flags = DNS_HEADER.unpack_from(response)[1]
+        if not flags & FLAG_TC:
+            ttl = get_answer_ttl(response, question_end)
+            if ttl is not None:
+                self.cache.put((name, qtype, qclass), response, ttl)
+        return response
+    
+    async def _open(self):
+        """Bind the listening and upstream sockets"""
+        self._server, _ = await self._loop.create_datagram_endpoint(
+            lambda: _ServerProtocol(self), local_addr=(self.host, self.port))
+        self._upstream, self._upstream_protocol = await self._loop.create_datagram_endpoint(
+            _UpstreamProtocol, remote_addr=self.upstream)
+        self.address = self._server.get_extra_info("sockname")[:2]
+    
+    async def _close(self):
+        """Close the sockets"""
+        for transport in (self._server, self._upstream):
+            if transport is not None:
+                transport.close()
+
+class DnsSinkholeBackend(BlockingBackend):
+    """
+    Blocks websites through a DnsSinkhole instead of the hosts file
+    
+    Needs no administrator rights (unless listening on port 53) and
+    supports wildcard subdomains.
+    """
+    
+    name = "dns"
+    
+    def __init__(self, sinkhole=None):
+        """
+        Initialize the backend
+        
+        Args:
+            sinkhole: DnsSinkhole to control (a default one if None)
+        """
+        self.sinkhole = sinkhole if sinkhole is not None else DnsSinkhole()
+    
+    def block(self, sites):
+        """Block websites, starting the sinkhole if needed"""
+        before = len(self.sinkhole.blocklist)
+        for site in sites:
+            self.sinkhole.blocklist.add(site)
+        self.sinkhole.start()
+        return len(self.sinkhole.blocklist) != before
+    
+    def unblock(self, sites):
+        """Unblock websites"""
+        before = len(self.sinkhole.blocklist)
+        for site in sites:
+            self.sinkhole.blocklist.remove(site)
+        return len(self.sinkhole.blocklist) != before
+    
+    def unblock_all(self, sites=()):
+        """Unblock every website (imported lists are kept)"""
+        blocklist = self.sinkhole.blocklist
+        changed = bool(blocklist.exact or blocklist.wildcards)
+        blocklist.clear(imported=False)
+        return changed
+    
+    def is_blocked(self, site):
+        """Check whether a website is blocked"""
+        return any(self.sinkhole.blocklist.is_blocked(host) for host in site_hostnames(site))
+    
+    def block_list(self, blocklist):
+        """Block an imported list, wildcards included, starting the sinkhole if needed"""
+        added = self.sinkhole.blocklist.add_list(blocklist)
+        self.sinkhole.start()
+        return added and len(blocklist) > 0
+    
+    def unblock_lists(self):
+        """Remove every imported list"""
+        changed = bool(self.sinkhole.blocklist.imported)
+        self.sinkhole.blocklist.imported = []
+        return changed
+    
+    def close(self):
+        """Stop the sinkhole"""
+        self.sinkhole.stop()
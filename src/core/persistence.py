@@ -0,0 +1,121 @@
+"""
+Write-behind persistence for Study Timer Pro
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+from .scheduler import get_default_scheduler
+
+def write_json_atomic(path, data):
+    """
+    Replace a JSON file without ever leaving it half written
+    
+    Args:
+        path: File to write
+        data: JSON-serialisable data
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".data-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as temp_file:
+            json.dump(data, temp_file)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+class WriteBehind:
+    """
+    Coalesces bursts of save requests into one background write
+    
+    mark_dirty() only stores the latest data and (re)arms a named timer on
+    the shared scheduler, so the caller never waits for the disk.  The
+    write happens once no new request has arrived for `delay` seconds, or
+    at the latest `max_delay` seconds after the first unsaved request.
+    """
+    
+    def __init__(self, write, delay=0.5, max_delay=5.0, scheduler=None):
+        """
+        Initialize the writer
+        
+        Args:
+            write: Function called as write(data) on the scheduler thread
+            delay: Quiet period in seconds before writing
+            max_delay: Longest a request may wait while requests keep coming
+            scheduler: TimerScheduler to use (the shared one by default)
+        """
+        self.write = write
+        self.delay = delay
+        self.max_delay = max_delay
+        self.scheduler = scheduler if scheduler is not None else get_default_scheduler()
+        self.timer_name = f"write-behind-{id(self)}"
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.pending = None
+        self.first_dirty_at = None
+        self.request_count = 0
+        self.write_count = 0
+    
+    @property
+    def is_dirty(self):
+        """Whether a request is waiting to be written"""
+        return self.pending is not None
+    
+    @property
+    def writes_avoided(self):
+        """Number of save requests that were merged into a later write"""
+        return self.request_count - self.write_count - (1 if self.is_dirty else 0)
+    
+    def mark_dirty(self, data):
+        """
+        Request a write of the given data
+        
+        Args:
+            data: Snapshot to write; it must not be modified afterwards
+        """
+        with self.lock:
+            now = self.scheduler.clock()
+            self.pending = data
+            self.request_count += 1
+            if self.first_dirty_at is None:
+                self.first_dirty_at = now
+            deadline = min(now + self.delay, self.first_dirty_at + self.max_delay)
+            self.scheduler.schedule_at(self.timer_name, deadline, self._on_timer)
+    
+    def flush(self):
+        """
+        Write any pending data now, waiting for it to finish
+        
+        Returns:
+            bool: True if something was written
+        """
+        with self.write_lock:
+            with self.lock:
+                data = self.pending
+                self.pending = None
+                self.first_dirty_at = None
+                self.scheduler.cancel(self.timer_name)
+            if data is None:
+                return False
+            
+            try:
+                self.write(data)
+            except Exception as e:
+                print(f"Error writing data: {e}")
+                # Keep it for the next request or flush unless newer data arrived
+                with self.lock:
+                    if self.pending is None:
+                        self.pending = data
+                return False
+            self.write_count += 1
+            return True
+    
+    def _on_timer(self, name):
+        """Write once the quiet period is over"""
+        self.flush()
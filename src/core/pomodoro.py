@@ -0,0 +1,148 @@
+"""
+Pomodoro phase state machine for Study Timer Pro
+"""
+
+import time
+
+from .timer import Countdown
+
+FOCUS = "focus"
+SHORT_BREAK = "short_break"
+LONG_BREAK = "long_break"
+
+PHASE_NAMES = {
+    FOCUS: "Focus",
+    SHORT_BREAK: "Short Break",
+    LONG_BREAK: "Long Break",
+}
+
+class PomodoroEngine:
+    """
+    Headless state machine cycling through focus and break phases
+    
+    The engine never sleeps or starts threads: the owner calls update() from
+    whatever tick source it has (the Tk event loop, a test, a simulation) and
+    the engine works out from its clock which phase it should be in.
+    """
+    
+    def __init__(self, focus_seconds, short_break_seconds, long_break_seconds,
+                 sessions_before_long_break=4, session_count=1,
+                 clock=time.monotonic, on_transition=None):
+        """
+        Initialize the engine
+        
+        Args:
+            focus_seconds: Length of a focus phase in seconds
+            short_break_seconds: Length of a short break in seconds
+            long_break_seconds: Length of a long break in seconds
+            sessions_before_long_break: Focus sessions per long break
+            session_count: Number of the current focus session (1-based)
+            clock: Function returning the current monotonic time in seconds
+            on_transition: Function called as on_transition(completed, next)
+                whenever one phase ends and the next begins
+        """
+        if min(focus_seconds, short_break_seconds, long_break_seconds) <= 0:
+            raise ValueError("Phase lengths must be positive")
+        if sessions_before_long_break <= 0:
+            raise ValueError("sessions_before_long_break must be positive")
+        
+        self.durations = {
+            FOCUS: focus_seconds,
+            SHORT_BREAK: short_break_seconds,
+            LONG_BREAK: long_break_seconds,
+        }
+        self.sessions_before_long_break = sessions_before_long_break
+        self.session_count = session_count
+        self.clock = clock
+        self.on_transition = on_transition
+        self.phase = None
+        self.countdown = None
+    
+    @property
+    def is_running(self):
+        """Whether a cycle is in progress"""
+        return self.countdown is not None
+    
+    @property
+    def is_paused(self):
+        """Whether the current phase is paused"""
+        return self.countdown is not None and self.countdown.is_paused
+    
+    def start(self):
+        """Start the cycle with a focus phase"""
+        self._enter_phase(FOCUS)
+        return True
+    
+    def pause(self):
+        """Pause the current phase"""
+        if self.countdown is None:
+            return False
+        return self.countdown.pause()
+    
+    def resume(self):
+        """Resume the current phase"""
+        if self.countdown is None:
+            return False
+        return self.countdown.resume()
+    
+    def stop(self):
+        """Stop the cycle"""
+        self.phase = None
+        self.countdown = None
+        return True
+    
+    def update(self):
+        """
+        Advance through every phase whose deadline has passed
+        
+        Returns:
+            int: Number of transitions fired
+        """
+        transitions = 0
+        while self.countdown is not None and self.countdown.is_finished():
+            completed = self.phase
+            next_phase = self.get_next_phase()
+            if completed != FOCUS:
+                self.session_count += 1
+            
+            # Chain from the old deadline so a late update() never drifts
+            deadline = self.countdown.deadline
+            self._enter_phase(next_phase)
+            self.countdown.deadline = deadline + self.durations[next_phase]
+            
+            transitions += 1
+            if self.on_transition:
+                self.on_transition(completed, next_phase)
+        return transitions
+    
+    def get_next_phase(self):
+        """Get the phase that follows the current one"""
+        if self.phase != FOCUS:
+            return FOCUS
+        if self.session_count % self.sessions_before_long_break == 0:
+            return LONG_BREAK
+        return SHORT_BREAK
+    
+    def get_phase_seconds(self):
+        """Get the full length of the current phase in seconds"""
+        if self.phase is None:
+            return 0
+        return self.durations[self.phase]
+    
+    def get_remaining_time(self):
+        """Get the remaining time of the current phase in whole seconds"""
+        if self.countdown is None:
+            return 0
+        return self.countdown.get_display_seconds()
+    
+    def get_delay_to_next_second(self):
+        """Get the time until the displayed remaining time next changes"""
+        if self.countdown is None or self.countdown.is_paused:
+            return None
+        return self.countdown.get_delay_to_next_second()
+    
+    def _enter_phase(self, phase):
+        """Begin a fresh countdown for the given phase"""
+        self.phase = phase
+        self.countdown = Countdown(self.durations[phase], clock=self.clock)
+        self.countdown.start()
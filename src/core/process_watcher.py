@@ -0,0 +1,339 @@
+"""
+Process launch watching for Study Timer Pro
+"""
+
+import os
+import platform
+import select
+import socket
+import struct
+import threading
+
+import psutil
+
+# Linux process events connector (see linux/connector.h and linux/cn_proc.h)
+NETLINK_CONNECTOR = 11
+CN_IDX_PROC = 1
+CN_VAL_PROC = 1
+NLMSG_DONE = 3
+PROC_CN_MCAST_LISTEN = 1
+PROC_CN_MCAST_IGNORE = 2
+PROC_EVENT_EXEC = 0x00000002
+PROC_EVENT_EXIT = 0x80000000
+
+NLMSG_HEADER = struct.Struct("=IHHII")
+CN_MSG_HEADER = struct.Struct("=IIIIHH")
+PROC_EVENT_HEADER = struct.Struct("=IIQ")
+PROC_EVENT_IDS = struct.Struct("=II")
+
+class ProcConnectorBackend:
+    """
+    Receives exec/exit notifications from the Linux proc connector
+    
+    Needs Linux and CAP_NET_ADMIN (normally root, which website blocking
+    already asks for); open() raises OSError otherwise.
+    """
+    
+    name = "proc-connector"
+    
+    def __init__(self):
+        self.sock = None
+        self.wakeup = None
+    
+    def open(self):
+        """Subscribe to process events"""
+        if platform.system() != "Linux":
+            raise OSError("The proc connector is only available on Linux")
+        
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_CONNECTOR)
+        try:
+            sock.bind((0, CN_IDX_PROC))
+            sock.send(self._control_message(PROC_CN_MCAST_LISTEN))
+        except OSError:
+            sock.close()
+            raise
+        # Closing the netlink socket does not wake a select() that is already
+        # waiting on it, so close() hangs up this pair to interrupt a poll
+        self.wakeup = socket.socketpair()
+        self.sock = sock
+    
+    def close(self):
+        """Unsubscribe from process events and interrupt a pending poll"""
+        if self.wakeup is not None:
+            self.wakeup[1].close()
+        if self.sock is not None:
+            try:
+                self.sock.send(self._control_message(PROC_CN_MCAST_IGNORE))
+            except OSError:
+                pass
+            self.sock.close()
+            self.sock = None
+    
+    def poll(self, known_pids, timeout):
+        """
+        Wait for process events
+        
+        Args:
+            known_pids: PIDs already reported (unused, events are incremental)
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            tuple: (started PIDs, exited PIDs)
+        """
+        started, exited = [], []
+        # close() may run concurrently from another thread
+        sock, wakeup = self.sock, self.wakeup
+        if sock is None:
+            raise OSError("Proc connector is closed")
+        readable, _, _ = select.select([sock, wakeup[0]], [], [], timeout)
+        if wakeup[0] in readable:
+            return started, exited
+        while readable:
+            data = sock.recv(4096)
+            self._parse(data, started, exited)
+            readable, _, _ = select.select([sock], [], [], 0)
+        return started, exited
+    
+    def _control_message(self, operation):
+        """Build a netlink message that (un)subscribes from process events"""
+        payload = struct.pack("=I", operation)
+        cn_msg = CN_MSG_HEADER.pack(CN_IDX_PROC, CN_VAL_PROC, 0, 0, len(payload), 0) + payload
+        header = NLMSG_HEADER.pack(NLMSG_HEADER.size + len(cn_msg), NLMSG_DONE, 0, 0, os.getpid())
+        return header + cn_msg
+    
+    def _parse(self, data, started, exited):
+        """Extract exec and exit events from a netlink datagram"""
+        offset = 0
+        while offset + NLMSG_HEADER.size <= len(data):
+            length = NLMSG_HEADER.unpack_from(data, offset)[0]
+            if length < NLMSG_HEADER.size:
+                break
+            event = offset + NLMSG_HEADER.size + CN_MSG_HEADER.size
+            if event + PROC_EVENT_HEADER.size + PROC_EVENT_IDS.size <= offset + length:
+                what = PROC_EVENT_HEADER.unpack_from(data, event)[0]
+                pid, tgid = PROC_EVENT_IDS.unpack_from(data, event + PROC_EVENT_HEADER.size)
+                # Ignore threads, only whole processes matter
+                if pid == tgid:
+                    if what == PROC_EVENT_EXEC:
+                        started.append(pid)
+                    elif what == PROC_EVENT_EXIT:
+                        exited.append(pid)
+            offset += (length + 3) & ~3
+
+class PidDiffBackend:
+    """
+    Finds new processes by diffing the PID set
+    
+    Listing PIDs is a single directory read on Linux, so this can run many
+    times a second; only PIDs missing from the previous set are inspected.
+    """
+    
+    name = "pid-diff"
+    
+    def __init__(self, interval=0.05):
+        """
+        Initialize the backend
+        
+        Args:
+            interval: Seconds between PID set snapshots
+        """
+        self.interval = interval
+        self._stop = threading.Event()
+    
+    def open(self):
+        """Nothing to set up"""
+        self._stop.clear()
+    
+    def close(self):
+        """Interrupt a pending poll"""
+        self._stop.set()
+    
+    def poll(self, known_pids, timeout):
+        """
+        Wait for the next snapshot and diff it against the known PIDs
+        
+        Args:
+            known_pids: PIDs already reported
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            tuple: (started PIDs, exited PIDs)
+        """
+        self._stop.wait(min(timeout, self.interval))
+        current = set(psutil.pids())
+        return current.difference(known_pids), set(known_pids).difference(current)
+
+class ProcessWatcher:
+    """
+    Reports newly started processes to a callback
+    
+    Uses the Linux proc connector when it is available and falls back to
+    PID-set diffing everywhere else.  Keeps an index of the names of all
+    running processes so each PID is only looked up once.
+    """
+    
+    def __init__(self, on_spawn, backend=None, report_existing=True, on_exit=None):
+        """
+        Initialize the process watcher
+        
+        Args:
+            on_spawn: Function called as on_spawn(pid, name) for each new process
+            backend: Event source to use (auto-detected if None)
+            report_existing: Whether processes already running when the
+                watcher starts are reported as well
+            on_exit: Optional function called as on_exit(pid) when a
+                known process exits
+        """
+        self.on_spawn = on_spawn
+        self.on_exit = on_exit
+        self.backend = backend
+        self.report_existing = report_existing
+        self.pid_index = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = None
+        self._running = False
+    
+    @property
+    def is_running(self):
+        """Whether the watcher thread is active"""
+        return self._running
+    
+    def start(self):
+        """Start watching for new processes"""
+        if self._running:
+            return False
+        
+        if self.backend is None:
+            self.backend = self._select_backend()
+        else:
+            self.backend.open()
+        
+        self._running = True
+        with self._lock:
+            self.pid_index = {}
+        # Each run has its own stop event, so a thread left over from an
+        # earlier run can never be told to keep going by a restart
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop_event,), daemon=True)
+        self._thread.start()
+        return True
+    
+    def stop(self, timeout=1.0):
+        """
+        Stop watching and wait for the watcher thread to finish
+        
+        Args:
+            timeout: Seconds to wait for the thread
+        """
+        if not self._running:
+            return False
+        self._running = False
+        self._stop_event.set()
+        self.backend.close()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        return True
+    
+    def snapshot(self):
+        """
+        Get the current PID index
+        
+        Returns:
+            dict: Mapping of PID to process name
+        """
+        with self._lock:
+            return dict(self.pid_index)
+    
+    def report_all(self):
+        """Report every known process to the callback again"""
+        for pid, name in self.snapshot().items():
+            self._report(pid, name)
+    
+    def _select_backend(self):
+        """Use the proc connector if possible, otherwise PID diffing"""
+        backend = ProcConnectorBackend()
+        try:
+            backend.open()
+            return backend
+        except OSError:
+            backend = PidDiffBackend()
+            backend.open()
+            return backend
+    
+    def _run(self, stop_event):
+        """Watcher thread main loop"""
+        # Seed the index; with an event backend this is the only full scan
+        for pid in psutil.pids():
+            if stop_event.is_set():
+                return
+            self._add(pid, report=self.report_existing)
+        
+        while not stop_event.is_set():
+            try:
+                started, exited = self.backend.poll(self.pid_index, 0.5)
+            except (OSError, ValueError) as e:
+                if stop_event.is_set():
+                    break
+                # Events may have been lost (e.g. ENOBUFS when the netlink
+                # buffer overflows), so resubscribe and rescan every PID
+                print(f"Error watching processes ({self.backend.name}): {e}")
+                self._reopen_backend(stop_event)
+                started, exited = self._rescan()
+            if stop_event.is_set():
+                break
+            
+            with self._lock:
+                for pid in exited:
+                    self.pid_index.pop(pid, None)
+            if self.on_exit:
+                for pid in exited:
+                    self.on_exit(pid)
+            for pid in started:
+                self._add(pid, report=True)
+    
+    def _reopen_backend(self, stop_event):
+        """Reopen the backend after an error, falling back to PID diffing"""
+        try:
+            self.backend.close()
+        except OSError:
+            pass
+        try:
+            self.backend.open()
+        except OSError as e:
+            print(f"Error reopening {self.backend.name} backend, using pid-diff: {e}")
+            self.backend = PidDiffBackend()
+            self.backend.open()
+        # stop() may have closed the old backend while this one was opened
+        if stop_event.is_set():
+            self.backend.close()
+    
+    def _rescan(self):
+        """
+        Diff a full PID listing against the index
+        
+        Returns:
+            tuple: (started PIDs, exited PIDs)
+        """
+        current = set(psutil.pids())
+        with self._lock:
+            known = set(self.pid_index)
+        return current - known, known - current
+    
+    def _add(self, pid, report):
+        """Look up a new PID's name, index it and optionally report it"""
+        try:
+            name = psutil.Process(pid).name()
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return
+        with self._lock:
+            self.pid_index[pid] = name
+        if report:
+            self._report(pid, name)
+    
+    def _report(self, pid, name):
+        """Invoke the spawn callback without letting it kill the thread"""
+        try:
+            self.on_spawn(pid, name)
+        except Exception as e:
+            print(f"Error handling process {name} ({pid}): {e}")
@@ -0,0 +1,255 @@
+"""
+Timer scheduling for Study Timer Pro
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+
+class ScheduledTimer:
+    """
+    A named deadline held by a TimerScheduler
+    """
+    
+    __slots__ = ("name", "deadline", "callback", "sequence", "index")
+    
+    def __init__(self, name, deadline, callback, sequence):
+        self.name = name
+        self.deadline = deadline
+        self.callback = callback
+        self.sequence = sequence  # Keeps equal deadlines in insertion order
+        self.index = -1  # Position in the heap, -1 once removed
+    
+    def __lt__(self, other):
+        return (self.deadline, self.sequence) < (other.deadline, other.sequence)
+
+class TimerScheduler:
+    """
+    Runs any number of named timers from a single thread
+    
+    Deadlines live in an indexed binary heap: every timer knows its heap
+    position, so scheduling, rescheduling and cancelling by name are all
+    O(log n).  The thread sleeps on a condition until the earliest deadline
+    or until the heap changes, so idle timers cost nothing.
+    """
+    
+    def __init__(self, clock=time.monotonic, threaded=True):
+        """
+        Initialize the scheduler
+        
+        Args:
+            clock: Function returning the current monotonic time in seconds
+            threaded: Whether to fire timers from a background thread; when
+                False the owner calls run_pending() itself
+        """
+        self.clock = clock
+        self.threaded = threaded
+        self._heap = []
+        self._timers = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._shutdown = False
+        self.wakeup_count = 0
+        self._wakeup_times = deque()
+    
+    def __len__(self):
+        return len(self._timers)
+    
+    def __contains__(self, name):
+        return name in self._timers
+    
+    def schedule(self, name, delay, callback):
+        """
+        Schedule (or reschedule) a named timer relative to now
+        
+        Args:
+            name: Unique timer name; an existing timer with this name is replaced
+            delay: Seconds from now until the timer fires
+            callback: Function called as callback(name) when the timer fires
+        """
+        return self.schedule_at(name, self.clock() + max(0.0, delay), callback)
+    
+    def schedule_at(self, name, deadline, callback):
+        """
+        Schedule (or reschedule) a named timer at an absolute clock time
+        
+        Args:
+            name: Unique timer name; an existing timer with this name is replaced
+            deadline: Clock time at which the timer fires
+            callback: Function called as callback(name) when the timer fires
+        """
+        with self._condition:
+            existing = self._timers.get(name)
+            if existing is not None:
+                self._remove(existing)
+            
+            timer = ScheduledTimer(name, deadline, callback, next(self._sequence))
+            self._timers[name] = timer
+            timer.index = len(self._heap)
+            self._heap.append(timer)
+            self._sift_up(timer.index)
+            
+            # Only the earliest deadline affects how long the thread sleeps
+            if self._heap[0] is timer:
+                self._condition.notify_all()
+            self._ensure_thread()
+            return timer
+    
+    def cancel(self, name):
+        """
+        Cancel a named timer
+        
+        Returns:
+            bool: True if a timer was cancelled, False if none was scheduled
+        """
+        with self._condition:
+            timer = self._timers.get(name)
+            if timer is None:
+                return False
+            self._remove(timer)
+            return True
+    
+    def get_next_deadline(self):
+        """Get the earliest deadline, or None when nothing is scheduled"""
+        with self._condition:
+            return self._heap[0].deadline if self._heap else None
+    
+    def run_pending(self):
+        """
+        Fire every timer whose deadline has passed
+        
+        Callbacks run outside the scheduler lock, so they may schedule or
+        cancel timers themselves.
+        
+        Returns:
+            int: Number of timers fired
+        """
+        fired = 0
+        while True:
+            with self._condition:
+                if not self._heap or self._heap[0].deadline > self.clock():
+                    return fired
+                timer = self._heap[0]
+                self._remove(timer)
+            
+            try:
+                timer.callback(timer.name)
+            except Exception as e:
+                print(f"Error in timer {timer.name}: {e}")
+            fired += 1
+    
+    def shutdown(self):
+        """Stop the scheduler thread and drop all timers"""
+        with self._condition:
+            self._shutdown = True
+            self._heap.clear()
+            self._timers.clear()
+            self._condition.notify_all()
+    
+    def get_wakeups_per_minute(self):
+        """
+        Get how many times the scheduler thread woke up in the last minute
+        
+        Returns:
+            int: Number of wakeups in the trailing 60 seconds
+        """
+        with self._condition:
+            self._prune_wakeups(self.clock())
+            return len(self._wakeup_times)
+    
+    def _record_wakeup(self):
+        """Count one scheduler thread wakeup"""
+        now = self.clock()
+        self.wakeup_count += 1
+        self._wakeup_times.append(now)
+        self._prune_wakeups(now)
+    
+    def _prune_wakeups(self, now):
+        """Forget wakeups older than one minute"""
+        while self._wakeup_times and now - self._wakeup_times[0] > 60:
+            self._wakeup_times.popleft()
+    
+    def _ensure_thread(self):
+        """Start the scheduler thread on first use"""
+        if self.threaded and self._thread is None and not self._shutdown:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+    
+    def _run(self):
+        """Sleep until the earliest deadline, then fire what is due"""
+        while True:
+            with self._condition:
+                while not self._shutdown:
+                    if self._heap:
+                        delay = self._heap[0].deadline - self.clock()
+                        if delay <= 0:
+                            break
+                        self._condition.wait(delay)
+                    else:
+                        self._condition.wait()
+                    self._record_wakeup()
+                if self._shutdown:
+                    return
+            
+            self.run_pending()
+    
+    # Indexed heap helpers (callers hold the lock)
+    def _remove(self, timer):
+        """Remove a timer from the heap and the name index"""
+        del self._timers[timer.name]
+        index = timer.index
+        last = self._heap.pop()
+        timer.index = -1
+        if last is not timer:
+            last.index = index
+            self._heap[index] = last
+            if index > 0 and last < self._heap[(index - 1) // 2]:
+                self._sift_up(index)
+            else:
+                self._sift_down(index)
+    
+    def _swap(self, i, j):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        heap[i].index = i
+        heap[j].index = j
+    
+    def _sift_up(self, index):
+        heap = self._heap
+        while index > 0:
+            parent = (index - 1) // 2
+            if not heap[index] < heap[parent]:
+                break
+            self._swap(index, parent)
+            index = parent
+    
+    def _sift_down(self, index):
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and heap[child] < heap[smallest]:
+                    smallest = child
+            if smallest == index:
+                return
+            self._swap(index, smallest)
+            index = smallest
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+def get_default_scheduler():
+    """
+    Get the process-wide scheduler shared by all timers
+    
+    Returns:
+        TimerScheduler: The shared scheduler, created on first use
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = TimerScheduler()
+        return _default_scheduler
@@ -0,0 +1,247 @@
+"""
+Session event log for Study Timer Pro
+"""
+
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+from .pomodoro import FOCUS
+
+class SessionLog:
+    """
+    Append-only log of timer phases stored as newline-delimited JSON
+    
+    Each record holds the start and end timestamps (seconds since the
+    epoch), the phase, the task being worked on, how often the phase was
+    interrupted and how many seconds it spent paused.  Recording a phase is
+    a single append; the file is only rewritten by compaction, which runs
+    on a worker thread when loading finds a torn, out-of-order or duplicate
+    line.  A log of valid records is never rewritten, since compaction
+    could not make it any smaller.
+    """
+    
+    def __init__(self, path="study_sessions.ndjson"):
+        """
+        Initialize the log
+        
+        Args:
+            path: File the log is stored in
+        """
+        self.path = path
+        self.records = []
+        self.needs_compaction = False
+        self.compaction_worker = None
+        # Appends wait for a compaction in progress, so none is lost
+        self.lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.records)
+    
+    def load(self):
+        """
+        Read the log from disk, compacting it in the background if it was damaged
+        
+        Returns:
+            int: Number of records loaded
+        """
+        self.records = []
+        self.needs_compaction = False
+        if not os.path.exists(self.path):
+            return 0
+        
+        last_start = None
+        seen = set()
+        with open(self.path, 'r') as log_file:
+            for line in log_file:
+                record = self._parse(line)
+                if record is None or not line.endswith("\n"):
+                    # A crash mid-append leaves a partial last line
+                    self.needs_compaction = True
+                    continue
+                key = (record['start'], record['end'], record['phase'])
+                if key in seen:
+                    # A phase recorded twice (e.g. by two running copies)
+                    self.needs_compaction = True
+                    continue
+                seen.add(key)
+                if last_start is not None and record['start'] < last_start:
+                    self.needs_compaction = True
+                last_start = record['start']
+                self.records.append(record)
+        
+        if self.needs_compaction:
+            self.compaction_worker = threading.Thread(target=self.compact, daemon=True)
+            self.compaction_worker.start()
+        return len(self.records)
+    
+    def append(self, start, end, phase=FOCUS, task=None, interruptions=0, paused=0.0):
+        """
+        Record a finished (or stopped) phase
+        
+        Args:
+            start: Timestamp the phase started at
+            end: Timestamp the phase ended at
+            phase: Phase name ("focus", "short_break" or "long_break")
+            task: Task worked on, if any
+            interruptions: Number of times the phase was paused
+            paused: Seconds the phase spent paused
+        
+        Returns:
+            dict: The stored record
+        """
+        record = {
+            'start': round(start, 3),
+            'end': round(max(end, start), 3),
+            'phase': phase,
+            'task': task,
+            'interruptions': interruptions,
+            'paused': round(max(paused, 0.0), 3),
+        }
+        with self.lock:
+            self.write_record(record)
+            self.records.append(record)
+        return record
+    
+    def write_record(self, record):
+        """Append one record to the file"""
+        with open(self.path, 'a') as log_file:
+            log_file.write(json.dumps(record, separators=(",", ":")) + "\n")
+    
+    def compact(self):
+        """Rewrite the log with only the loaded records, in start order"""
+        with self.lock:
+            self._rewrite()
+    
+    def _rewrite(self):
+        """Write the records to a temp file and rename it over the log (lock held)"""
+        # The records become a new list, so holders of the old one (the
+        # analytics engine) can tell it was replaced
+        self.records = sorted(self.records, key=lambda record: record['start'])
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(prefix=".sessions-", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as temp_file:
+                for record in self.records:
+                    temp_file.write(json.dumps(record, separators=(",", ":")) + "\n")
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_path, self.path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.needs_compaction = False
+    
+    def clear(self):
+        """Delete every record"""
+        with self.lock:
+            self.records = []
+            if os.path.exists(self.path):
+                os.remove(self.path)
+    
+    def get_daily_totals(self, phase=FOCUS):
+        """
+        Get active seconds per day
+        
+        Args:
+            phase: Phase to count
+        
+        Returns:
+            dict: {"YYYY-MM-DD": seconds}
+        """
+        totals = {}
+        for record in self._select(phase):
+            for hour, seconds in self.split_by_hour(record):
+                day = hour.strftime("%Y-%m-%d")
+                totals[day] = totals.get(day, 0) + seconds
+        return {day: int(round(seconds)) for day, seconds in totals.items()}
+    
+    def get_hourly_totals(self, day, phase=FOCUS):
+        """
+        Get active seconds for each hour of one day
+        
+        Args:
+            day: datetime.date to report on
+            phase: Phase to count
+        
+        Returns:
+            list: 24 values in seconds, index 0 being midnight
+        """
+        totals = [0.0] * 24
+        day_start = datetime.combine(day, datetime.min.time()).timestamp()
+        day_end = datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
+        for record in self._select(phase):
+            if record['end'] <= day_start or record['start'] >= day_end:
+                continue
+            for hour, seconds in self.split_by_hour(record):
+                if hour.date() == day:
+                    totals[hour.hour] += seconds
+        return [int(round(seconds)) for seconds in totals]
+    
+    def get_task_totals(self, phase=FOCUS):
+        """
+        Get active seconds per task
+        
+        Args:
+            phase: Phase to count
+        
+        Returns:
+            dict: {task: seconds}; time without a task is under None
+        """
+        totals = {}
+        for record in self._select(phase):
+            task = record.get('task')
+            totals[task] = totals.get(task, 0) + self.get_active_seconds(record)
+        return {task: int(round(seconds)) for task, seconds in totals.items()}
+    
+    @staticmethod
+    def get_active_seconds(record):
+        """Get the seconds a record spent running (not paused)"""
+        return max(record['end'] - record['start'] - record.get('paused', 0), 0)
+    
+    def _select(self, phase):
+        """Iterate over the records of one phase"""
+        return (record for record in self.records if record['phase'] == phase)
+    
+    def split_by_hour(self, record):
+        """
+        Spread a record's active time over the local hours it spans
+        
+        Pauses are not timestamped, so they are spread evenly too.
+        
+        Yields:
+            tuple: (datetime of the hour start, active seconds in that hour)
+        """
+        start, end = record['start'], record['end']
+        if end <= start:
+            return
+        active_share = self.get_active_seconds(record) / (end - start)
+        hour = datetime.fromtimestamp(start).replace(minute=0, second=0, microsecond=0)
+        while True:
+            next_hour = hour + timedelta(hours=1)
+            boundary = next_hour.timestamp()
+            seconds = min(end, boundary) - max(start, hour.timestamp())
+            if seconds > 0:
+                yield hour, seconds * active_share
+            if boundary >= end:
+                return
+            hour = next_hour
+    
+    def _parse(self, line):
+        """Decode one line, returning None if it is not a valid record"""
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                return None
+            record['start'] = float(record['start'])
+            record['end'] = float(record['end'])
+            record.setdefault('phase', FOCUS)
+            record.setdefault('task', None)
+            record.setdefault('interruptions', 0)
+            record.setdefault('paused', 0.0)
+            return record
+        except (ValueError, KeyError, TypeError):
+            return None
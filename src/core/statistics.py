@@ -2,31 +2,192 @@
 Statistics tracking functionality for Study Timer Pro
 """
 
-from datetime import datetime, timedelta
+import calendar
+from array import array
+from datetime import date, datetime, timedelta
+
+# Minimum study time for a day to count towards a streak
+STREAK_MIN_SECONDS = 10 * 60
+
+class StreakTracker:
+    """
+    Current and longest run of consecutive qualifying days
+    
+    A day qualifies once it has at least `min_seconds` of study time.  Days
+    normally qualify in date order, so add_day() is O(1); only imports,
+    resets and out-of-order days need a full recompute().
+    """
+    
+    def __init__(self, min_seconds=STREAK_MIN_SECONDS):
+        """
+        Initialize the tracker
+        
+        Args:
+            min_seconds: Study time a day needs to count
+        """
+        self.min_seconds = min_seconds
+        self.current = 0  # Run ending on last_day
+        self.longest = 0
+        self.last_day = None  # Ordinal of the latest qualifying day
+    
+    def add_day(self, ordinal):
+        """
+        Record that a day has just qualified
+        
+        Args:
+            ordinal: date.toordinal() of the day
+        
+        Returns:
+            bool: False if the day is before the last qualifying day, in
+                which case the caller must recompute()
+        """
+        if self.last_day is not None and ordinal <= self.last_day:
+            return ordinal == self.last_day
+        
+        if self.last_day is not None and ordinal == self.last_day + 1:
+            self.current += 1
+        else:
+            self.current = 1
+        self.last_day = ordinal
+        self.longest = max(self.longest, self.current)
+        return True
+    
+    def recompute(self, seconds, first_ordinal):
+        """
+        Rebuild the streaks from the seconds of every day
+        
+        Args:
+            seconds: Seconds per day, index 0 being first_ordinal
+            first_ordinal: date.toordinal() of index 0 (None if empty)
+        """
+        self.current = 0
+        self.longest = 0
+        self.last_day = None
+        if first_ordinal is None:
+            return
+        
+        min_seconds = self.min_seconds
+        run = longest = last_run = 0
+        last_index = None
+        for index, day_seconds in enumerate(seconds):
+            if day_seconds >= min_seconds:
+                run += 1
+                last_index, last_run = index, run
+                if run > longest:
+                    longest = run
+            else:
+                run = 0
+        
+        if last_index is not None:
+            self.current = last_run
+            self.longest = longest
+            self.last_day = first_ordinal + last_index
+    
+    def get_current_streak(self, ordinal):
+        """
+        Get the streak that ends on a day
+        
+        Args:
+            ordinal: date.toordinal() of the day (normally today)
+        
+        Returns:
+            int: Consecutive qualifying days up to and including that day,
+                or None when the day is before the last qualifying day
+        """
+        if self.last_day is None or ordinal > self.last_day:
+            return 0
+        if ordinal == self.last_day:
+            return self.current
+        return None
 
 class StatisticsManager:
     """
     Manages statistics for study sessions
+    
+    Seconds per day are kept in an array('I') indexed by
+    date.toordinal() - first_ordinal, so a day is one index and a range of
+    days is a slice sum.  "YYYY-MM-DD" strings only appear when loading
+    and saving (load() / to_dict()).  The overall total and the streaks
+    are kept running.
     """
     
-    def __init__(self):
-        """Initialize the statistics manager"""
-        self.daily_stats = {}  # Format: {"YYYY-MM-DD": seconds}
+    def __init__(self, daily_stats=None):
+        """
+        Initialize the statistics manager
+        
+        Args:
+            daily_stats: Existing {"YYYY-MM-DD": seconds} data, if any
+        """
+        self.first_ordinal = None
+        self.seconds = array('I')
+        self.total_seconds = 0
+        self.streak = StreakTracker()
         self.completed_tasks = []
+        if daily_stats:
+            self.load(daily_stats)
+    
+    @property
+    def daily_stats(self):
+        """{"YYYY-MM-DD": seconds} for every day with study time (built on demand)"""
+        return self.to_dict()
+    
+    def load(self, daily_stats):
+        """
+        Replace the statistics with legacy {"YYYY-MM-DD": seconds} data
+        
+        Args:
+            daily_stats: {"YYYY-MM-DD": seconds}
+        """
+        days = {}
+        for day_str, seconds in daily_stats.items():
+            try:
+                ordinal = date.fromisoformat(day_str).toordinal()
+                days[ordinal] = days.get(ordinal, 0) + max(int(seconds), 0)
+            except (TypeError, ValueError):
+                continue
+        
+        self.first_ordinal = None
+        self.seconds = array('I')
+        self.total_seconds = 0
+        if days:
+            self.first_ordinal = min(days)
+            self.seconds = array('I', [0]) * (max(days) - self.first_ordinal + 1)
+            for ordinal, seconds in days.items():
+                self.seconds[ordinal - self.first_ordinal] = seconds
+            self.total_seconds = sum(days.values())
+        self.streak.recompute(self.seconds, self.first_ordinal)
     
-    def add_session_time(self, seconds):
+    def to_dict(self):
+        """
+        Convert the statistics to the legacy format
+        
+        Returns:
+            dict: {"YYYY-MM-DD": seconds} for every day with study time
+        """
+        first = self.first_ordinal
+        return {date.fromordinal(first + index).isoformat(): seconds
+                for index, seconds in enumerate(self.seconds) if seconds}
+    
+    def add_session_time(self, seconds, day=None):
         """
         Add completed session time to statistics
         
         Args:
             seconds: Duration of the session in seconds
+            day: datetime.date the time belongs to (today by default)
         """
-        today = datetime.now().date().strftime("%Y-%m-%d")
+        if day is None:
+            day = datetime.now().date()
+        ordinal = day.toordinal()
+        index = self._ensure_index(ordinal)
+        before = self.seconds[index]
+        self.seconds[index] = before + seconds
+        self.total_seconds += seconds
         
-        if today in self.daily_stats:
-            self.daily_stats[today] += seconds
-        else:
-            self.daily_stats[today] = seconds
+        # Only the moment a day reaches the minimum changes the streaks
+        min_seconds = self.streak.min_seconds
+        if before < min_seconds <= before + seconds and not self.streak.add_day(ordinal):
+            self.streak.recompute(self.seconds, self.first_ordinal)
     
     def add_completed_task(self, task):
         """
@@ -40,51 +201,103 @@ class StatisticsManager:
         task_with_timestamp = f"{timestamp} - {task}"
         self.completed_tasks.append(task_with_timestamp)
     
-    def get_today_time(self):
+    def get_day_time(self, ordinal):
+        """
+        Get the study time of one day
+        
+        Args:
+            ordinal: date.toordinal() of the day
+        
+        Returns:
+            int: Study time in seconds
+        """
+        if self.first_ordinal is None:
+            return 0
+        index = ordinal - self.first_ordinal
+        if 0 <= index < len(self.seconds):
+            return self.seconds[index]
+        return 0
+    
+    def get_days_time(self, first_day, count):
+        """
+        Get the study time of consecutive days
+        
+        Args:
+            first_day: datetime.date of the first day
+            count: Number of days
+        
+        Returns:
+            array: Seconds for each day (zero where nothing was recorded)
+        """
+        result = array('I', [0]) * count
+        if self.first_ordinal is None:
+            return result
+        start = first_day.toordinal() - self.first_ordinal
+        low, high = max(start, 0), min(start + count, len(self.seconds))
+        if low < high:
+            result[low - start:high - start] = self.seconds[low:high]
+        return result
+    
+    def get_range_time(self, first_day, last_day):
+        """
+        Get the total study time of a range of days
+        
+        Args:
+            first_day: datetime.date of the first day
+            last_day: datetime.date of the last day (inclusive)
+        
+        Returns:
+            int: Study time in seconds
+        """
+        if self.first_ordinal is None:
+            return 0
+        low = max(first_day.toordinal() - self.first_ordinal, 0)
+        high = min(last_day.toordinal() - self.first_ordinal + 1, len(self.seconds))
+        return sum(self.seconds[low:high]) if low < high else 0
+    
+    def get_today_time(self, day=None):
         """
         Get today's total study time in seconds
         
+        Args:
+            day: datetime.date to report on instead of today
+        
         Returns:
             int: Total study time in seconds
         """
-        today = datetime.now().date().strftime("%Y-%m-%d")
-        return self.daily_stats.get(today, 0)
+        if day is None:
+            day = datetime.now().date()
+        return self.get_day_time(day.toordinal())
     
-    def get_week_time(self):
+    def get_week_time(self, day=None):
         """
         Get this week's total study time in seconds
         
+        Args:
+            day: datetime.date in the week (Monday to Sunday) to report on instead of today
+        
         Returns:
             int: Total study time in seconds
         """
-        current_date = datetime.now().date()
-        start_of_week = current_date - timedelta(days=current_date.weekday())
-        week_seconds = 0
-        
-        for i in range(7):
-            day_date = start_of_week + timedelta(days=i)
-            day_str = day_date.strftime("%Y-%m-%d")
-            if day_str in self.daily_stats:
-                week_seconds += self.daily_stats[day_str]
-        
-        return week_seconds
+        if day is None:
+            day = datetime.now().date()
+        monday = day - timedelta(days=day.weekday())
+        return self.get_range_time(monday, monday + timedelta(days=6))
     
-    def get_month_time(self):
+    def get_month_time(self, day=None):
         """
         Get this month's total study time in seconds
         
+        Args:
+            day: datetime.date in the month to report on instead of today
+        
         Returns:
             int: Total study time in seconds
         """
-        current_date = datetime.now().date()
-        month_prefix = current_date.strftime("%Y-%m")
-        month_seconds = 0
-        
-        for day_str, seconds in self.daily_stats.items():
-            if day_str.startswith(month_prefix):
-                month_seconds += seconds
-        
-        return month_seconds
+        if day is None:
+            day = datetime.now().date()
+        days_in_month = calendar.monthrange(day.year, day.month)[1]
+        return self.get_range_time(day.replace(day=1), day.replace(day=days_in_month))
     
     def get_total_time(self):
         """
@@ -93,30 +306,41 @@ class StatisticsManager:
         Returns:
             int: Total study time in seconds
         """
-        return sum(self.daily_stats.values())
+        return self.total_seconds
     
-    def get_streak_days(self):
+    def get_streak_days(self, day=None):
         """
         Calculate the current streak of consecutive study days
         
+        Args:
+            day: datetime.date the streak ends on instead of today
+        
         Returns:
             int: Number of consecutive days with study sessions
         """
-        today = datetime.now().date()
-        streak = 0
-        current_date = today
-        
-        # Count backwards from today
-        while True:
-            date_str = current_date.strftime("%Y-%m-%d")
-            if date_str in self.daily_stats and self.daily_stats[date_str] >= 10 * 60:  # At least 10 minutes
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
+        if day is None:
+            day = datetime.now().date()
+        streak = self.streak.get_current_streak(day.toordinal())
+        if streak is not None:
+            return streak
         
+        # A day in the past: count backwards from it
+        index = day.toordinal() - self.first_ordinal
+        streak = 0
+        while index >= 0 and self.seconds[index] >= self.streak.min_seconds:
+            streak += 1
+            index -= 1
         return streak
     
+    def get_longest_streak(self):
+        """
+        Get the longest run of consecutive study days ever
+        
+        Returns:
+            int: Number of days
+        """
+        return self.streak.longest
+    
     def get_study_days(self):
         """
         Get a list of days with study sessions
@@ -124,7 +348,7 @@ class StatisticsManager:
         Returns:
             list: List of date strings with study sessions
         """
-        return list(self.daily_stats.keys())
+        return list(self.to_dict())
     
     def format_time(self, seconds):
         """
@@ -161,5 +385,17 @@ class StatisticsManager:
     
     def reset_statistics(self):
         """Reset all statistics"""
-        self.daily_stats = {}
-        self.completed_tasks = []
\ No newline at end of file
+        self.load({})
+        self.completed_tasks = []
+    
+    def _ensure_index(self, ordinal):
+        """Grow the array to cover a day and return its index"""
+        if self.first_ordinal is None:
+            self.first_ordinal = ordinal
+            self.seconds = array('I', [0])
+        elif ordinal < self.first_ordinal:
+            self.seconds = array('I', [0]) * (self.first_ordinal - ordinal) + self.seconds
+            self.first_ordinal = ordinal
+        elif ordinal - self.first_ordinal >= len(self.seconds):
+            self.seconds.extend(array('I', [0]) * (ordinal - self.first_ordinal - len(self.seconds) + 1))
+        return ordinal - self.first_ordinal
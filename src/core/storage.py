@@ -0,0 +1,350 @@
+"""
+SQLite storage backend for Study Timer Pro
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+from datetime import datetime
+
+from .session_log import SessionLog
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blocked_apps (
+    name TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS blocked_sites (
+    site TEXT PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    created_day TEXT,
+    completed_day TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_completed_day ON tasks (done, completed_day);
+CREATE TABLE IF NOT EXISTS daily_stats (
+    day TEXT PRIMARY KEY,
+    seconds INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    day TEXT NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    phase TEXT NOT NULL,
+    task TEXT,
+    interruptions INTEGER NOT NULL DEFAULT 0,
+    paused REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_day ON sessions (day, start);
+"""
+
+# Keys of the settings data that have their own table
+TABLE_KEYS = ('locked_apps', 'blocked_websites', 'todo_list', 'completed_tasks', 'daily_stats')
+
+def _today():
+    """Get today's date as "YYYY-MM-DD" """
+    return datetime.now().strftime("%Y-%m-%d")
+
+class SqliteStore:
+    """
+    Settings, tasks, blocked items and sessions in a SQLite database
+    
+    The database runs in WAL mode.  save() compares the data with what was
+    last loaded or saved and only writes the rows that changed, so locking
+    an app or finishing a task is a single-row upsert or delete however
+    much history has built up.
+    """
+    
+    def __init__(self, path="study_timer_data.db"):
+        """
+        Open (and if needed create) the database
+        
+        Args:
+            path: Database file
+        """
+        self.path = path
+        # Autocommit: multi-row changes use explicit transactions
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.saved = self._empty_snapshot()
+        self.rows_written = 0
+    
+    def close(self):
+        """Close the database"""
+        with self.lock:
+            self.connection.close()
+    
+    def has_data(self):
+        """Whether settings have ever been saved to the database"""
+        with self.lock:
+            return self.connection.execute("SELECT 1 FROM kv LIMIT 1").fetchone() is not None
+    
+    def load(self):
+        """
+        Read everything except the sessions
+        
+        Returns:
+            dict: Data in the same shape as the JSON data file
+        """
+        with self.lock:
+            cursor = self.connection.cursor()
+            data = {key: json.loads(value) for key, value in cursor.execute("SELECT key, value FROM kv")}
+            data['locked_apps'] = [row[0] for row in
+                                   cursor.execute("SELECT name FROM blocked_apps ORDER BY rowid")]
+            data['blocked_websites'] = [row[0] for row in
+                                        cursor.execute("SELECT site FROM blocked_sites ORDER BY rowid")]
+            tasks = cursor.execute("SELECT text, done FROM tasks ORDER BY id").fetchall()
+            data['todo_list'] = [text for text, done in tasks if not done]
+            data['completed_tasks'] = [text for text, done in tasks if done]
+            data['daily_stats'] = dict(cursor.execute("SELECT day, seconds FROM daily_stats"))
+            self.saved = self._snapshot(data)
+        return data
+    
+    def save(self, data):
+        """
+        Write the rows that changed since the last load or save
+        
+        Args:
+            data: Data in the same shape as the JSON data file
+        
+        Returns:
+            int: Number of rows written
+        """
+        return self.save_with_sessions(data, ())
+    
+    def save_with_sessions(self, data, records):
+        """
+        Write the rows that changed and insert session records, all in one
+        transaction (so either everything is stored or nothing is)
+        
+        Args:
+            data: Data in the same shape as the JSON data file
+            records: Records as built by SessionLog.append()
+        
+        Returns:
+            int: Number of rows written
+        """
+        new = self._snapshot(data)
+        old = self.saved
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN")
+            try:
+                written = self._save_changes(cursor, old, new)
+                written += self._insert_sessions(cursor, records)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            self.saved = new
+            self.rows_written += written
+        return written
+    
+    def add_sessions(self, records):
+        """
+        Insert session records in one transaction
+        
+        Args:
+            records: Records as built by SessionLog.append()
+        """
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN")
+            try:
+                written = self._insert_sessions(cursor, records)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            self.rows_written += written
+    
+    def get_sessions(self, start_day=None, end_day=None):
+        """
+        Read session records in start order
+        
+        Args:
+            start_day: First "YYYY-MM-DD" day to include, or None
+            end_day: Last "YYYY-MM-DD" day to include, or None
+        
+        Returns:
+            list: Record dicts
+        """
+        query = "SELECT start, end, phase, task, interruptions, paused FROM sessions"
+        conditions, parameters = [], []
+        if start_day is not None:
+            conditions.append("day >= ?")
+            parameters.append(start_day)
+        if end_day is not None:
+            conditions.append("day <= ?")
+            parameters.append(end_day)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY start"
+        
+        with self.lock:
+            rows = self.connection.execute(query, parameters).fetchall()
+        return [{'start': start, 'end': end, 'phase': phase, 'task': task,
+                 'interruptions': interruptions, 'paused': paused}
+                for start, end, phase, task, interruptions, paused in rows]
+    
+    def clear_sessions(self):
+        """Delete every session record"""
+        with self.lock:
+            self.connection.execute("DELETE FROM sessions")
+    
+    def _save_changes(self, cursor, old, new):
+        """Write the differences between two snapshots and return the row count"""
+        written = 0
+        for key, value in new['kv'].items():
+            if old['kv'].get(key) != value:
+                cursor.execute("INSERT INTO kv (key, value) VALUES (?, ?) "
+                               "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                               (key, value))
+                written += 1
+        
+        written += self._save_set(cursor, "blocked_apps", "name",
+                                  old['locked_apps'], new['locked_apps'])
+        written += self._save_set(cursor, "blocked_sites", "site",
+                                  old['blocked_websites'], new['blocked_websites'])
+        written += self._save_tasks(cursor, 0, old['todo_list'], new['todo_list'])
+        written += self._save_tasks(cursor, 1, old['completed_tasks'], new['completed_tasks'])
+        
+        for day, seconds in new['daily_stats'].items():
+            if old['daily_stats'].get(day) != seconds:
+                cursor.execute("INSERT INTO daily_stats (day, seconds) VALUES (?, ?) "
+                               "ON CONFLICT (day) DO UPDATE SET seconds = excluded.seconds",
+                               (day, seconds))
+                written += 1
+        for day in old['daily_stats'].keys() - new['daily_stats'].keys():
+            cursor.execute("DELETE FROM daily_stats WHERE day = ?", (day,))
+            written += 1
+        return written
+    
+    def _insert_sessions(self, cursor, records):
+        """Insert session records and return the row count"""
+        rows = [(datetime.fromtimestamp(record['start']).strftime("%Y-%m-%d"),
+                 record['start'], record['end'], record['phase'], record.get('task'),
+                 record.get('interruptions', 0), record.get('paused', 0.0))
+                for record in records]
+        cursor.executemany(
+            "INSERT INTO sessions (day, start, end, phase, task, interruptions, paused) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+    
+    def _save_set(self, cursor, table, column, old, new):
+        """Insert and delete the members of a set table that changed"""
+        written = 0
+        for value in old.keys() - new.keys():
+            cursor.execute(f"DELETE FROM {table} WHERE {column} = ?", (value,))
+            written += 1
+        for value in new:
+            if value not in old:
+                cursor.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (value,))
+                written += 1
+        return written
+    
+    def _save_tasks(self, cursor, done, old, new):
+        """Insert and delete the tasks of one list that changed"""
+        written = 0
+        for text, count in (old - new).items():
+            for _ in range(count):
+                cursor.execute("DELETE FROM tasks WHERE id = (SELECT id FROM tasks "
+                               "WHERE text = ? AND done = ? ORDER BY id DESC LIMIT 1)",
+                               (text, done))
+                written += 1
+        for text, count in (new - old).items():
+            for _ in range(count):
+                cursor.execute("INSERT INTO tasks (text, done, created_day, completed_day) "
+                               "VALUES (?, ?, ?, ?)",
+                               (text, done, _today(), _today() if done else None))
+                written += 1
+        return written
+    
+    def _snapshot(self, data):
+        """Copy the data into the form save() compares"""
+        return {
+            'kv': {key: json.dumps(value) for key, value in data.items() if key not in TABLE_KEYS},
+            # Dicts keep the list order for apps and sites
+            'locked_apps': dict.fromkeys(data.get('locked_apps', [])),
+            'blocked_websites': dict.fromkeys(data.get('blocked_websites', [])),
+            'todo_list': Counter(data.get('todo_list', [])),
+            'completed_tasks': Counter(data.get('completed_tasks', [])),
+            'daily_stats': dict(data.get('daily_stats', {})),
+        }
+    
+    def _empty_snapshot(self):
+        """Snapshot of an empty database"""
+        return self._snapshot({})
+
+class SqliteSessionLog(SessionLog):
+    """SessionLog that keeps its records in the sessions table"""
+    
+    def __init__(self, store):
+        """
+        Initialize the log
+        
+        Args:
+            store: SqliteStore holding the sessions
+        """
+        super().__init__(store.path)
+        self.store = store
+    
+    def load(self):
+        """Read the records from the database"""
+        self.records = self.store.get_sessions()
+        self.needs_compaction = False
+        return len(self.records)
+    
+    def write_record(self, record):
+        """Insert one record"""
+        self.store.add_sessions([record])
+    
+    def compact(self):
+        """Nothing to do: the database keeps the records"""
+        self.needs_compaction = False
+    
+    def clear(self):
+        """Delete every record"""
+        self.records = []
+        self.store.clear_sessions()
+
+def migrate_json_file(store, json_path="study_timer_data.json", session_log_path=None):
+    """
+    Copy the JSON data file (and session log) into an empty database
+    
+    Both are written in one transaction, so a failed migration leaves the
+    database empty and is simply tried again on the next start.
+    
+    Args:
+        store: SqliteStore to fill
+        json_path: JSON data file written by Settings.save_settings()
+        session_log_path: NDJSON session log to import, or None
+    
+    Returns:
+        bool: True if anything was migrated
+    """
+    if store.has_data() or not os.path.exists(json_path):
+        return False
+    
+    with open(json_path, 'r') as json_file:
+        data = json.load(json_file)
+    
+    records = []
+    if session_log_path and os.path.exists(session_log_path):
+        session_log = SessionLog(session_log_path)
+        session_log.load()
+        records = session_log.records
+    store.save_with_sessions(data, records)
+    return True
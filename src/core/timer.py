@@ -2,31 +2,132 @@
 Timer logic for Study Timer Pro
 """
 
+import itertools
+import math
 import time
 import threading
+from collections import deque
 from datetime import datetime
 
+from .scheduler import get_default_scheduler
+
+class Countdown:
+    """
+    Deadline-based countdown measured against a monotonic clock
+    
+    Remaining time is always derived from the deadline rather than from the
+    number of ticks seen, so late or missed ticks never accumulate into drift.
+    """
+    
+    def __init__(self, seconds, clock=time.monotonic):
+        """
+        Initialize the countdown
+        
+        Args:
+            seconds: Duration in seconds
+            clock: Function returning the current monotonic time in seconds
+        """
+        self.clock = clock
+        self.total_seconds = seconds
+        self.deadline = None
+        self.paused_remaining = None
+    
+    def start(self):
+        """Start the countdown from its full duration"""
+        self.deadline = self.clock() + self.total_seconds
+        self.paused_remaining = None
+    
+    def pause(self):
+        """Freeze the remaining time"""
+        if self.deadline is not None and self.paused_remaining is None:
+            self.paused_remaining = max(0.0, self.deadline - self.clock())
+            return True
+        return False
+    
+    def resume(self):
+        """Continue counting down from the frozen remaining time"""
+        if self.paused_remaining is not None:
+            self.deadline = self.clock() + self.paused_remaining
+            self.paused_remaining = None
+            return True
+        return False
+    
+    @property
+    def is_paused(self):
+        """Whether the countdown is currently paused"""
+        return self.paused_remaining is not None
+    
+    def get_remaining(self):
+        """Get the exact remaining time in seconds"""
+        if self.deadline is None:
+            return float(self.total_seconds)
+        if self.paused_remaining is not None:
+            return self.paused_remaining
+        return max(0.0, self.deadline - self.clock())
+    
+    def get_display_seconds(self):
+        """Get the remaining time rounded up to whole seconds, as displayed"""
+        return int(math.ceil(self.get_remaining()))
+    
+    def is_finished(self):
+        """Check whether the deadline has been reached"""
+        return (self.deadline is not None and not self.is_paused
+                and self.get_remaining() <= 0)
+    
+    def get_delay_to_next_second(self):
+        """
+        Get the time until the displayed value next changes
+        
+        Returns:
+            float: Delay in seconds (0 once the countdown has finished)
+        """
+        remaining = self.get_remaining()
+        if remaining <= 0:
+            return 0.0
+        fraction = remaining - math.floor(remaining)
+        return fraction if fraction > 0 else 1.0
+
 class TimerManager:
     """
     Manages the timer functionality for the Pomodoro technique
     """
     
-    def __init__(self, update_callback=None, complete_callback=None):
+    _names = itertools.count(1)
+    
+    def __init__(self, update_callback=None, complete_callback=None,
+                 clock=time.monotonic, threaded=True, scheduler=None):
         """
         Initialize the timer manager
         
         Args:
             update_callback: Function to call on each timer update
             complete_callback: Function to call when timer completes
+            clock: Function returning the current monotonic time in seconds
+                (pass a core.clock.FakeClock to control time in tests)
+            threaded: Whether to drive the timer from a scheduler thread;
+                when False the owner calls tick() itself
+            scheduler: TimerScheduler to run on (defaults to the shared one)
         """
         self.update_callback = update_callback
         self.complete_callback = complete_callback
+        self.clock = clock
+        self.threaded = threaded
+        self.scheduler = scheduler
+        if threaded and scheduler is None:
+            self.scheduler = get_default_scheduler()
+        self.name = f"timer-{next(self._names)}"
         self.is_running = False
         self.is_paused = False
-        self.current_timer = None
+        self.countdown = None
         self.remaining_seconds = 0
         self.start_time = None
         self.pause_time = None
+        self.timer_type = None
+        self.last_reported = None
+        
+        self._lock = threading.RLock()
+        self.wakeup_count = 0
+        self._wakeup_times = deque()
     
     def start_timer(self, seconds, timer_type="focus"):
         """
@@ -36,47 +137,59 @@ class TimerManager:
             seconds: Duration in seconds
             timer_type: Type of timer (focus, short_break, long_break)
         """
-        self.stop_timer()  # Stop any existing timer
-        
-        self.is_running = True
-        self.is_paused = False
-        self.remaining_seconds = seconds
-        self.start_time = time.time()
-        self.timer_type = timer_type
-        
-        # Start timer in a separate thread
-        self.current_timer = threading.Thread(
-            target=self._run_timer,
-            args=(seconds,),
-            daemon=True
-        )
-        self.current_timer.start()
+        with self._lock:
+            self.stop_timer()  # Stop any existing timer
+            
+            self.is_running = True
+            self.is_paused = False
+            self.remaining_seconds = seconds
+            self.start_time = self.clock()
+            self.timer_type = timer_type
+            self.last_reported = None
+            self.countdown = Countdown(seconds, clock=self.clock)
+            self.countdown.start()
+            
+            # Restarting reuses the same named scheduler entry, so no
+            # stale callbacks from the previous timer can survive
+            self._schedule(0)
         
         return True
     
     def pause_timer(self):
         """Pause the current timer"""
-        if self.is_running and not self.is_paused:
-            self.is_paused = True
-            self.pause_time = time.time()
-            return True
-        return False
+        with self._lock:
+            if self.is_running and not self.is_paused:
+                self.is_paused = True
+                self.pause_time = self.clock()
+                if self.countdown:
+                    self.countdown.pause()
+                    self.remaining_seconds = self.countdown.get_display_seconds()
+                self._unschedule()
+                return True
+            return False
     
     def resume_timer(self):
         """Resume a paused timer"""
-        if self.is_running and self.is_paused:
-            self.is_paused = False
-            # Adjust start time to account for pause duration
-            if self.pause_time:
-                pause_duration = time.time() - self.pause_time
-                self.start_time += pause_duration
-            return True
-        return False
+        with self._lock:
+            if self.is_running and self.is_paused:
+                self.is_paused = False
+                # Adjust start time to account for pause duration
+                if self.pause_time:
+                    pause_duration = self.clock() - self.pause_time
+                    self.start_time += pause_duration
+                if self.countdown:
+                    self.countdown.resume()
+                    self._schedule(self.countdown.get_delay_to_next_second())
+                return True
+            return False
     
     def stop_timer(self):
         """Stop the current timer"""
-        self.is_running = False
-        self.is_paused = False
+        with self._lock:
+            self.is_running = False
+            self.is_paused = False
+            self.countdown = None
+            self._unschedule()
         return True
     
     def get_remaining_time(self):
@@ -84,12 +197,10 @@ class TimerManager:
         if not self.is_running:
             return 0
         
-        if self.is_paused:
+        if self.is_paused or self.countdown is None:
             return self.remaining_seconds
         
-        elapsed = time.time() - self.start_time
-        remaining = max(0, self.remaining_seconds - int(elapsed))
-        return remaining
+        return self.countdown.get_display_seconds()
     
     def get_formatted_time(self):
         """Get the remaining time formatted as MM:SS"""
@@ -106,26 +217,89 @@ class TimerManager:
         progress = 100 - (remaining / total_seconds * 100)
         return min(100, max(0, progress))
     
-    def _run_timer(self, total_seconds):
-        """Internal method to run the timer"""
-        self.remaining_seconds = total_seconds
-        
-        while self.is_running and self.remaining_seconds > 0:
-            if not self.is_paused:
-                # Calculate remaining time
-                elapsed = time.time() - self.start_time
-                self.remaining_seconds = max(0, total_seconds - int(elapsed))
-                
-                # Call update callback if provided
-                if self.update_callback:
-                    self.update_callback(self.remaining_seconds, self.timer_type)
-                
-                # Check if timer completed
-                if self.remaining_seconds <= 0:
-                    self.is_running = False
-                    if self.complete_callback:
-                        self.complete_callback(self.timer_type)
-                    break
-            
-            # Sleep briefly to avoid high CPU usage
-            time.sleep(0.1)
\ No newline at end of file
+    def tick(self):
+        """
+        Process the time elapsed since the last tick
+        
+        Calls the update callback when the remaining whole seconds changed
+        and, once the countdown has finished, the complete callback.  Used by
+        the scheduler and, with a fake clock, directly by tests and
+        simulations.
+        
+        Returns:
+            int: Remaining time in seconds
+        """
+        countdown = self.countdown
+        if not self.is_running or self.is_paused or countdown is None:
+            return self.get_remaining_time()
+        
+        self.remaining_seconds = countdown.get_display_seconds()
+        
+        # Call update callback if provided and the value changed
+        if self.update_callback and self.remaining_seconds != self.last_reported:
+            self.last_reported = self.remaining_seconds
+            self.update_callback(self.remaining_seconds, self.timer_type)
+        
+        # Check if timer completed
+        if countdown.is_finished() and self.countdown is countdown:
+            with self._lock:
+                self.is_running = False
+                self.countdown = None
+                self._unschedule()
+            if self.complete_callback:
+                self.complete_callback(self.timer_type)
+        
+        return self.remaining_seconds
+    
+    def get_wakeups_per_minute(self):
+        """
+        Get how many times this timer woke up in the last minute
+        
+        Returns:
+            int: Number of wakeups in the trailing 60 seconds
+        """
+        with self._lock:
+            self._prune_wakeups(self.clock())
+            return len(self._wakeup_times)
+    
+    def _record_wakeup(self):
+        """Count one timer wakeup"""
+        now = self.clock()
+        self.wakeup_count += 1
+        self._wakeup_times.append(now)
+        self._prune_wakeups(now)
+    
+    def _prune_wakeups(self, now):
+        """Forget wakeups older than one minute"""
+        while self._wakeup_times and now - self._wakeup_times[0] > 60:
+            self._wakeup_times.popleft()
+    
+    def _schedule(self, delay):
+        """Ask the scheduler to wake this timer after the given delay"""
+        if self.scheduler is not None:
+            countdown = self.countdown
+            self.scheduler.schedule(self.name, delay,
+                                    lambda name: self._on_wakeup(countdown))
+    
+    def _unschedule(self):
+        """Remove this timer from the scheduler"""
+        if self.scheduler is not None:
+            self.scheduler.cancel(self.name)
+    
+    def _on_wakeup(self, countdown):
+        """
+        Handle a scheduler wakeup
+        
+        Ticks, then sleeps until just after the displayed second next
+        changes.  Wakeups belonging to a previous countdown are ignored.
+        """
+        with self._lock:
+            if self.countdown is not countdown or self.is_paused:
+                return
+            self._record_wakeup()
+        
+        self.tick()
+        
+        with self._lock:
+            if self.countdown is countdown and not self.is_paused:
+                self._schedule(countdown.get_delay_to_next_second() + 0.001)
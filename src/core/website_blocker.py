@@ -2,8 +2,21 @@
 Website blocking functionality for Study Timer Pro
 """
 
+import copy
 import os
 import platform
+import shutil
+import tempfile
+
+REDIRECT_IP = "127.0.0.1"
+MANAGED_BEGIN = "# >>> Study Timer Pro blocked websites >>>"
+MANAGED_END = "# <<< Study Timer Pro blocked websites <<<"
+# Imported lists get a section each, tagged with the list's digest
+IMPORTED_BEGIN = "# >>> Study Timer Pro imported blocklist"
+IMPORTED_END = "# <<< Study Timer Pro imported blocklist <<<"
+
+# Addresses that make a hosts entry a block rather than a real mapping
+BLOCKING_IPS = frozenset({"127.0.0.1", "0.0.0.0", "::1", "::"})
 
 def get_hosts_path():
     """
@@ -17,6 +30,497 @@ def get_hosts_path():
     else:
         return "/etc/hosts"
 
+def normalize_site(site):
+    """
+    Turn user input such as "https://www.example.com/path" into a hostname
+    
+    Args:
+        site: Website as typed by the user
+    
+    Returns:
+        str: Lowercase hostname without the "www." prefix
+    """
+    site = site.strip().lower()
+    for prefix in ("http://", "https://"):
+        if site.startswith(prefix):
+            site = site[len(prefix):]
+    site = site.split("/", 1)[0].split(":", 1)[0]
+    if site.startswith("*."):
+        site = site[2:]  # "*.example.com" reduces to the domain itself
+    if site.startswith("www."):
+        site = site[4:]
+    elif "." not in site:
+        site = f"{site}.com"
+    return site
+
+def site_hostnames(site):
+    """
+    Get the hostnames that have to be redirected to block a website
+    
+    Args:
+        site: Website as typed by the user
+    
+    Returns:
+        tuple: The bare and "www." hostnames
+    """
+    host = normalize_site(site)
+    return (host, f"www.{host}")
+
+class HostsIndex:
+    """
+    Parsed view of a hosts file
+    
+    Unmanaged (ip, hostname) entries live in a dict keyed by hostname and
+    the managed section in a set, so lookups are O(1) and match whole
+    hostnames only.  Imported list sections are skipped and only their
+    digests are kept; the lists themselves answer lookups for them.
+    """
+    
+    def __init__(self, lines):
+        """
+        Parse hosts file lines
+        
+        Args:
+            lines: Lines of the hosts file without line endings
+        """
+        outside = []
+        managed = set()
+        addresses = {}
+        imported = []
+        in_section = False
+        in_imported = False
+        for line in lines:
+            stripped = line.strip()
+            if in_imported:
+                in_imported = stripped != IMPORTED_END
+                continue
+            if stripped.startswith(IMPORTED_BEGIN):
+                in_imported = True
+                imported.extend(stripped[len(IMPORTED_BEGIN):].split()[:1])
+                continue
+            if stripped == MANAGED_BEGIN:
+                in_section = True
+                continue
+            if stripped == MANAGED_END:
+                in_section = False
+                continue
+            if not in_section:
+                outside.append(line)
+            
+            fields = stripped.split("#", 1)[0].split()
+            if len(fields) < 2:
+                continue
+            if in_section:
+                managed.update(hostname.lower() for hostname in fields[1:])
+            else:
+                for hostname in fields[1:]:
+                    # Like the system resolver, the first entry for a name wins
+                    addresses.setdefault(hostname.lower(), fields[0])
+        
+        self.outside = tuple(outside)
+        self.managed = frozenset(managed)
+        self.addresses = addresses
+        self.imported = tuple(imported)
+    
+    def __len__(self):
+        return len(self.addresses) + len(self.managed - self.addresses.keys())
+    
+    def with_section(self, outside, managed, imported=()):
+        """
+        Get the index of this file after its managed section is replaced
+        
+        Args:
+            outside: Lines kept outside the managed section
+            managed: Hostnames in the new managed section
+            imported: Digests of the imported list sections written
+        
+        Returns:
+            HostsIndex: The index of the rewritten file
+        """
+        if len(outside) != len(self.outside):
+            # Lines were dropped, so the unmanaged entries need parsing again
+            index = HostsIndex(outside)
+        else:
+            index = copy.copy(self)
+        index.managed = frozenset(managed)
+        index.imported = tuple(imported)
+        return index
+    
+    def lookup(self, hostname):
+        """
+        Get the address a hostname is mapped to
+        
+        Args:
+            hostname: Hostname to look up
+        
+        Returns:
+            str: The mapped IP address, or None if the name has no entry
+        """
+        hostname = hostname.lower()
+        ip = self.addresses.get(hostname)
+        if ip is None and hostname in self.managed:
+            return REDIRECT_IP
+        return ip
+    
+    def has_entry(self, ip, hostname):
+        """Check whether the file maps the hostname to the given address"""
+        return self.lookup(hostname) == ip
+    
+    def is_blocked(self, hostname):
+        """Check whether the hostname is redirected to a blocking address"""
+        return self.lookup(hostname) in BLOCKING_IPS
+
+_index_cache = {}
+
+def load_hosts_index(hosts_path=None):
+    """
+    Get the parsed index of a hosts file
+    
+    The index is cached and only rebuilt when the file's inode, mtime or
+    size changes (an atomic rewrite always changes the inode).
+    
+    Args:
+        hosts_path: Hosts file to read (defaults to the system one)
+    
+    Returns:
+        HostsIndex: The parsed hosts file
+    """
+    hosts_path = hosts_path or get_hosts_path()
+    stat = os.stat(hosts_path)
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    cached = _index_cache.get(hosts_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    with open(hosts_path, 'r') as hosts_file:
+        # Streamed, so imported sections are never held in memory
+        index = HostsIndex(line.rstrip("\r\n") for line in hosts_file)
+    _index_cache[hosts_path] = (signature, index)
+    return index
+
+def _store_hosts_index(hosts_path, index):
+    """Cache the index of a hosts file that was just written"""
+    stat = os.stat(hosts_path)
+    _index_cache[hosts_path] = ((stat.st_ino, stat.st_mtime_ns, stat.st_size), index)
+
+class BlockingBackend:
+    """
+    Interface for the ways websites can be blocked
+    
+    Sites are passed as the user typed them; each backend decides which
+    hostnames that covers.
+    """
+    
+    name = "base"
+    
+    def block(self, sites):
+        """Block websites, returning True if anything changed"""
+        raise NotImplementedError
+    
+    def unblock(self, sites):
+        """Unblock websites, returning True if anything changed"""
+        raise NotImplementedError
+    
+    def unblock_all(self, sites=()):
+        """Remove every block, returning True if anything changed"""
+        raise NotImplementedError
+    
+    def is_blocked(self, site):
+        """Check whether a website is blocked"""
+        raise NotImplementedError
+    
+    def block_list(self, blocklist):
+        """Block every domain of an imported CompactBlocklist"""
+        raise NotImplementedError
+    
+    def unblock_lists(self):
+        """Remove every imported list, returning True if anything changed"""
+        raise NotImplementedError
+    
+    def close(self):
+        """Release whatever the backend holds (nothing by default)"""
+
+class HostsBlocklist(BlockingBackend):
+    """
+    Owns a delimited section of the hosts file holding blocked websites
+    
+    Every change is applied as a set diff: the file is read once, the
+    managed section is regenerated and the result replaces the hosts file
+    in a single atomic write (temp file, fsync, rename).  Nothing is
+    written when the blocked set is unchanged.
+    
+    Imported lists stay CompactBlocklists: they are streamed into their
+    own sections when the file is written and are not touched by
+    unblock_all().
+    """
+    
+    name = "hosts"
+    
+    def __init__(self, hosts_path=None):
+        """
+        Initialize the blocklist
+        
+        Args:
+            hosts_path: Hosts file to manage (defaults to the system one)
+        """
+        self.hosts_path = hosts_path or get_hosts_path()
+        self.write_count = 0
+        self.imported = {}  # digest -> CompactBlocklist
+    
+    def get_blocked(self):
+        """
+        Get the hostnames in the managed section
+        
+        Returns:
+            set: Blocked hostnames
+        """
+        return set(load_hosts_index(self.hosts_path).managed)
+    
+    def is_blocked(self, site):
+        """
+        Check whether the hosts file redirects a website anywhere
+        
+        Entries outside the managed section (for example an ad-block hosts
+        list) count as well.
+        
+        Args:
+            site: Website to check
+        
+        Returns:
+            bool: True if blocked, False otherwise
+        """
+        index = load_hosts_index(self.hosts_path)
+        return any(index.is_blocked(host) or
+                   any(blocklist.lookup(host) for blocklist in self.imported.values())
+                   for host in site_hostnames(site))
+    
+    def block(self, sites):
+        """
+        Block websites
+        
+        Args:
+            sites: Websites to block
+        
+        Returns:
+            bool: True if the hosts file was rewritten
+        """
+        outside, managed = self._read()
+        hostnames = {host for site in sites for host in site_hostnames(site)}
+        return self._apply(outside, managed | hostnames, managed != managed | hostnames)
+    
+    def block_list(self, blocklist):
+        """
+        Block every domain of an imported blocklist
+        
+        The hosts file has no wildcards, so each listed domain is added
+        exactly as listed.  Nothing is written if the file already holds
+        the list (for example from an earlier run).
+        
+        Args:
+            blocklist: CompactBlocklist to add
+        
+        Returns:
+            bool: True if the hosts file was rewritten
+        """
+        digest = blocklist.digest()
+        if digest in self.imported:
+            return False
+        self.imported[digest] = blocklist
+        if digest in load_hosts_index(self.hosts_path).imported:
+            return False
+        outside, managed = self._read()
+        return self._apply(outside, managed, True)
+    
+    def unblock_lists(self):
+        """
+        Remove every imported list
+        
+        Returns:
+            bool: True if the hosts file was rewritten
+        """
+        written = load_hosts_index(self.hosts_path).imported
+        self.imported = {}
+        outside, managed = self._read()
+        return self._apply(outside, managed, bool(written))
+    
+    def unblock(self, sites):
+        """
+        Unblock websites
+        
+        Args:
+            sites: Websites to unblock
+        
+        Returns:
+            bool: True if the hosts file was rewritten
+        """
+        outside, managed = self._read()
+        hostnames = {host for site in sites for host in site_hostnames(site)}
+        kept = self._drop_legacy_entries(outside, hostnames)
+        wanted = managed - hostnames
+        return self._apply(kept, wanted, wanted != managed or len(kept) != len(outside))
+    
+    def unblock_all(self, sites=()):
+        """
+        Remove every managed entry (imported lists are kept)
+        
+        Args:
+            sites: Websites that may still have entries outside the
+                managed section from older versions of the app
+        
+        Returns:
+            bool: True if the hosts file was rewritten
+        """
+        outside, managed = self._read()
+        hostnames = {host for site in sites for host in site_hostnames(site)}
+        kept = self._drop_legacy_entries(outside, hostnames)
+        return self._apply(kept, set(), bool(managed) or len(kept) != len(outside))
+    
+    def _read(self):
+        """
+        Split the hosts file into unmanaged lines and managed hostnames
+        
+        Returns:
+            tuple: (list of lines outside the section, set of hostnames)
+        """
+        index = load_hosts_index(self.hosts_path)
+        return list(index.outside), set(index.managed)
+    
+    def _drop_legacy_entries(self, outside, hostnames):
+        """Remove "127.0.0.1 host" lines written outside the section by older versions"""
+        if not hostnames:
+            return outside
+        kept = []
+        for line in outside:
+            fields = line.split()
+            if len(fields) == 2 and fields[0] == REDIRECT_IP and fields[1].lower() in hostnames:
+                continue
+            kept.append(line)
+        return kept
+    
+    def _apply(self, outside, wanted, changed):
+        """
+        Write the unmanaged lines followed by the managed section
+        
+        Args:
+            outside: Lines to keep outside the managed section
+            wanted: Hostnames the managed section should hold
+            changed: Whether anything differs from the file on disk
+        
+        Returns:
+            bool: True if the file was written
+        """
+        if not changed:
+            return False
+        
+        lines = list(outside)
+        while lines and not lines[-1].strip():
+            lines.pop()
+        if wanted:
+            lines.append("")
+            lines.append(MANAGED_BEGIN)
+            lines.extend(f"{REDIRECT_IP} {host}" for host in sorted(wanted))
+            lines.append(MANAGED_END)
+        imported = dict(self.imported)
+        
+        def write(hosts_file):
+            hosts_file.write("\n".join(lines) + "\n")
+            for digest, blocklist in imported.items():
+                hosts_file.write(f"\n{IMPORTED_BEGIN} {digest} >>>\n")
+                hosts_file.writelines(f"{REDIRECT_IP} {domain}\n" for domain in blocklist.iter_domains())
+                hosts_file.write(IMPORTED_END + "\n")
+        
+        index = load_hosts_index(self.hosts_path).with_section(outside, wanted, imported)
+        self._write_atomic(write)
+        _store_hosts_index(self.hosts_path, index)
+        return True
+    
+    def _write_atomic(self, write):
+        """
+        Replace the hosts file without ever leaving it half written
+        
+        Falls back to rewriting the file in place when it cannot be replaced
+        by a rename, e.g. when /etc/hosts is a bind mount (EBUSY, as in
+        Docker) or the new file could not be given the original owner or
+        SELinux label.
+        
+        Args:
+            write: Function that writes the new contents to an open file
+        """
+        try:
+            self._replace_file(write)
+        except OSError:
+            self._write_in_place(write)
+        self.write_count += 1
+    
+    def _replace_file(self, write):
+        """Write a temp file with the hosts file's mode, owner and label and rename it over it"""
+        stat = os.stat(self.hosts_path)
+        directory = os.path.dirname(os.path.abspath(self.hosts_path))
+        fd, temp_path = tempfile.mkstemp(prefix=".hosts-", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as temp_file:
+                write(temp_file)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            shutil.copymode(self.hosts_path, temp_path)
+            if hasattr(os, 'chown') and (stat.st_uid, stat.st_gid) != _owner(temp_path):
+                os.chown(temp_path, stat.st_uid, stat.st_gid)
+            _copy_selinux_label(self.hosts_path, temp_path)
+            os.replace(temp_path, self.hosts_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    
+    def _write_in_place(self, write):
+        """Truncate and rewrite the hosts file itself (keeps its inode, owner and label)"""
+        with open(self.hosts_path, 'r+') as hosts_file:
+            hosts_file.seek(0)
+            write(hosts_file)
+            hosts_file.truncate()
+            hosts_file.flush()
+            os.fsync(hosts_file.fileno())
+
+def _owner(path):
+    """Get the (uid, gid) of a file"""
+    stat = os.stat(path)
+    return stat.st_uid, stat.st_gid
+
+def _copy_selinux_label(source, target):
+    """Give target the SELinux label of source, if source has one"""
+    if not hasattr(os, 'getxattr'):
+        return
+    try:
+        label = os.getxattr(source, 'security.selinux')
+    except OSError:
+        return  # No SELinux (or no label): nothing to keep
+    os.setxattr(target, 'security.selinux', label)
+
+_backend = None
+
+def get_blocking_backend():
+    """
+    Get the backend the module-level blocking functions use
+    
+    Returns:
+        BlockingBackend: The active backend (hosts file editing by default)
+    """
+    global _backend
+    if _backend is None:
+        _backend = HostsBlocklist()
+    return _backend
+
+def set_blocking_backend(backend):
+    """
+    Choose how websites are blocked
+    
+    Args:
+        backend: A BlockingBackend, or None to go back to the hosts file
+    """
+    global _backend
+    _backend = backend
+
 def block_website(site):
     """
     Block a website by adding it to the hosts file
@@ -30,43 +534,28 @@ def block_website(site):
     Raises:
         PermissionError: If the hosts file cannot be modified
     """
-    hosts_path = get_hosts_path()
+    return block_websites([site])
+
+def block_websites(sites):
+    """
+    Block several websites with a single hosts file write
     
-    # Ensure the site has a domain format
-    if not site.startswith("www.") and not site.startswith("http"):
-        if "." not in site:
-            site = f"www.{site}.com"
-        elif not site.startswith("www."):
-            site = f"www.{site}"
+    Args:
+        sites: Websites to block
     
-    # Remove http/https prefix if present
-    if site.startswith("http://"):
-        site = site[7:]
-    elif site.startswith("https://"):
-        site = site[8:]
+    Returns:
+        bool: True if successful, False otherwise
     
+    Raises:
+        PermissionError: If the hosts file cannot be modified
+    """
     try:
-        with open(hosts_path, 'r') as hosts_file:
-            content = hosts_file.read()
-            
-            # Check if site is already blocked
-            if site in content:
-                return True
-        
-        with open(hosts_path, 'a') as hosts_file:
-            hosts_file.write(f"\n127.0.0.1 {site}")
-            # Also block non-www version if www version is provided
-            if site.startswith("www."):
-                hosts_file.write(f"\n127.0.0.1 {site[4:]}")
-            # Also block www version if non-www version is provided
-            else:
-                hosts_file.write(f"\n127.0.0.1 www.{site}")
-        
+        get_blocking_backend().block(sites)
         return True
     except PermissionError:
         raise PermissionError("Need administrator privileges to block websites")
     except Exception as e:
-        print(f"Error blocking website {site}: {e}")
+        print(f"Error blocking websites {', '.join(sites)}: {e}")
         return False
 
 def unblock_website(site):
@@ -82,17 +571,8 @@ def unblock_website(site):
     Raises:
         PermissionError: If the hosts file cannot be modified
     """
-    hosts_path = get_hosts_path()
-    
     try:
-        with open(hosts_path, 'r') as hosts_file:
-            lines = hosts_file.readlines()
-        
-        with open(hosts_path, 'w') as hosts_file:
-            for line in lines:
-                if site not in line:
-                    hosts_file.write(line)
-        
+        get_blocking_backend().unblock([site])
         return True
     except PermissionError:
         raise PermissionError("Need administrator privileges to unblock websites")
@@ -110,12 +590,8 @@ def is_website_blocked(site):
     Returns:
         bool: True if blocked, False otherwise
     """
-    hosts_path = get_hosts_path()
-    
     try:
-        with open(hosts_path, 'r') as hosts_file:
-            content = hosts_file.read()
-            return site in content
+        return get_blocking_backend().is_blocked(site)
     except Exception as e:
         print(f"Error checking if website {site} is blocked: {e}")
         return False
@@ -133,20 +609,11 @@ def unblock_all_websites(website_list):
     Raises:
         PermissionError: If the hosts file cannot be modified
     """
-    hosts_path = get_hosts_path()
-    
     try:
-        with open(hosts_path, 'r') as hosts_file:
-            lines = hosts_file.readlines()
-        
-        with open(hosts_path, 'w') as hosts_file:
-            for line in lines:
-                if not any(site in line for site in website_list):
-                    hosts_file.write(line)
-        
+        get_blocking_backend().unblock_all(website_list)
         return True
     except PermissionError:
         raise PermissionError("Need administrator privileges to unblock websites")
     except Exception as e:
         print(f"Error unblocking all websites: {e}")
-        return False
\ No newline at end of file
+        return False
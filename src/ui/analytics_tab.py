@@ -5,8 +5,9 @@ Analytics tab implementation for Study Timer Pro
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from core.analytics import AnalyticsEngine
+from ui.study_chart import StudyTimeChart
 
 class AnalyticsTab:
     def __init__(self, parent, app):
@@ -16,6 +17,13 @@ class AnalyticsTab:
         # Create main frame
         self.frame = tk.Frame(parent, bg=self.settings.colors['bg'])
         
+        # NumPy view of the study history, kept up to date as sessions are recorded
+        self.engine = None
+        
+        # Chart kept between refreshes and the view it shows
+        self.chart = None
+        self.chart_view = "weekly"
+        
         # Create UI components
         self.create_analytics_panel()
         
@@ -120,89 +128,56 @@ class AnalyticsTab:
         # Create initial chart
         self.create_study_time_chart()
     
-    def create_study_time_chart(self, view_type="weekly"):
-        """Create a chart showing study time data"""
-        # Clear existing chart
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
-        
-        fig = plt.Figure(figsize=(8, 4), dpi=100)
-        ax = fig.add_subplot(111)
+    def create_study_time_chart(self, view_type=None):
+        """Show study time data, updating the existing chart in place"""
+        if view_type is not None:
+            self.chart_view = view_type
+        if self.chart is None:
+            self.chart = StudyTimeChart(self.chart_frame, self.settings.colors)
         
         # Get data based on view type
-        if view_type == "daily":
-            self.create_daily_chart(ax)
-        elif view_type == "monthly":
-            self.create_monthly_chart(ax)
+        if self.chart_view == "daily":
+            data = self.get_daily_chart_data()
+        elif self.chart_view == "monthly":
+            data = self.get_monthly_chart_data()
         else:  # weekly (default)
-            self.create_weekly_chart(ax)
-        
-        # Customize chart style
-        ax.set_facecolor(self.settings.colors['bg'])
-        fig.patch.set_facecolor(self.settings.colors['bg'])
-        
-        # Adjust text colors
-        ax.title.set_color(self.settings.colors['fg'])
-        ax.xaxis.label.set_color(self.settings.colors['fg'])
-        ax.yaxis.label.set_color(self.settings.colors['fg'])
-        ax.tick_params(colors=self.settings.colors['fg'])
-        
-        # Add chart to frame
-        canvas = FigureCanvasTkAgg(fig, master=self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            data = self.get_weekly_chart_data()
+        self.chart.show(self.chart_view, **data)
+    
+    def get_engine(self):
+        """Return the analytics engine, adding new sessions or reloading it if the log was replaced"""
+        statistics = self.settings.statistics
+        records = self.settings.session_log.records
+        if self.engine is None or not self.engine.sync(statistics, records):
+            self.engine = AnalyticsEngine.from_history(statistics, records)
+        return self.engine
     
-    def create_weekly_chart(self, ax):
-        """Create a weekly view chart"""
+    def get_weekly_chart_data(self):
+        """Get the data of the weekly view chart"""
         # Get data for weekly view
         days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        times = [0, 0, 0, 0, 0, 0, 0]  # in minutes
         
         # Get actual data if available
         today = datetime.now().date()
         start_of_week = today - timedelta(days=today.weekday())
+        times = self.get_engine().get_daily_series(start_of_week, 7) // 60  # in minutes
         
-        for i in range(7):
-            day_date = start_of_week + timedelta(days=i)
-            day_str = day_date.strftime("%Y-%m-%d")
-            if day_str in self.settings.daily_stats:
-                times[i] = self.settings.daily_stats[day_str] // 60  # Convert seconds to minutes
-        
-        # Create bar chart
-        bars = ax.bar(days, times, color=self.settings.colors['accent'])
-        
-        # Add labels and title
-        ax.set_ylabel('Study Time (minutes)')
-        ax.set_title('Weekly Study Time')
-        
-        # Add value labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{int(height)}',
-                   ha='center', va='bottom', color=self.settings.colors['fg'])
+        return {'positions': days, 'values': times, 'title': 'Weekly Study Time',
+                'ylabel': 'Study Time (minutes)', 'value_labels': True}
     
-    def create_daily_chart(self, ax):
-        """Create a daily view chart"""
-        # Get data for daily view (hours of the day)
-        today = datetime.now().date().strftime("%Y-%m-%d")
-        
-        # For now, we'll just show a placeholder
-        # In a real implementation, you would track study time by hour
+    def get_daily_chart_data(self):
+        """Get the data of the daily view chart"""
+        # Get data for daily view (hours of the day) from the session log
+        today = datetime.now().date()
         hours = list(range(24))
-        times = [0] * 24  # Placeholder data
-        
-        # Create bar chart
-        bars = ax.bar(hours, times, color=self.settings.colors['accent'])
+        times = self.get_engine().get_hourly_series(today) / 60  # in minutes
         
-        # Add labels and title
-        ax.set_xlabel('Hour of Day')
-        ax.set_ylabel('Study Time (minutes)')
-        ax.set_title('Today\'s Study Time by Hour')
-        ax.set_xticks(range(0, 24, 2))  # Show every 2 hours
+        return {'positions': hours, 'values': times, 'title': 'Today\'s Study Time by Hour',
+                'xlabel': 'Hour of Day', 'ylabel': 'Study Time (minutes)',
+                'xticks': range(0, 24, 2)}  # Show every 2 hours
     
-    def create_monthly_chart(self, ax):
-        """Create a monthly view chart"""
+    def get_monthly_chart_data(self):
+        """Get the data of the monthly view chart"""
         # Get data for monthly view
         today = datetime.now().date()
         first_day = today.replace(day=1)
@@ -217,24 +192,12 @@ class AnalyticsTab:
         
         # Prepare data
         days = list(range(1, days_in_month + 1))
-        times = [0] * days_in_month
-        
-        # Fill in actual data
-        for day in range(1, days_in_month + 1):
-            day_str = f"{today.year}-{today.month:02d}-{day:02d}"
-            if day_str in self.settings.daily_stats:
-                times[day-1] = self.settings.daily_stats[day_str] // 60  # Convert seconds to minutes
-        
-        # Create bar chart
-        bars = ax.bar(days, times, color=self.settings.colors['accent'])
-        
-        # Add labels and title
-        ax.set_xlabel('Day of Month')
-        ax.set_ylabel('Study Time (minutes)')
-        ax.set_title(f'Study Time for {today.strftime("%B %Y")}')
+        times = self.get_engine().get_daily_series(first_day, days_in_month) // 60  # in minutes
         
-        # Set x-ticks to show every 5 days
-        ax.set_xticks(range(1, days_in_month + 1, 5))
+        return {'positions': days, 'values': times,
+                'title': f'Study Time for {today.strftime("%B %Y")}',
+                'xlabel': 'Day of Month', 'ylabel': 'Study Time (minutes)',
+                'xticks': range(1, days_in_month + 1, 5)}  # Show every 5 days
     
     def update_chart_view(self, view_type):
         """Update the chart to show a different view"""
@@ -242,34 +205,14 @@ class AnalyticsTab:
     
     def update_statistics_display(self):
         """Update all statistics displays"""
-        # Update time statistics
-        today = datetime.now().date().strftime("%Y-%m-%d")
-        today_seconds = self.settings.daily_stats.get(today, 0)
-        today_hours, remainder = divmod(today_seconds, 3600)
-        today_minutes = remainder // 60
-        
-        self.today_time_label.config(text=f"Today's Study Time: {today_hours}h {today_minutes}m")
-        
-        # Calculate week time
-        current_date = datetime.now().date()
-        start_of_week = current_date - timedelta(days=current_date.weekday())
-        week_seconds = 0
-        
-        for i in range(7):
-            day_date = start_of_week + timedelta(days=i)
-            day_str = day_date.strftime("%Y-%m-%d")
-            if day_str in self.settings.daily_stats:
-                week_seconds += self.settings.daily_stats[day_str]
-        
-        week_hours, remainder = divmod(week_seconds, 3600)
-        week_minutes = remainder // 60
-        self.week_time_label.config(text=f"This Week's Study Time: {week_hours}h {week_minutes}m")
-        
-        # Total time
-        total_seconds = sum(self.settings.daily_stats.values())
-        total_hours, remainder = divmod(total_seconds, 3600)
-        total_minutes = remainder // 60
-        self.total_time_label.config(text=f"Total Study Time: {total_hours}h {total_minutes}m")
+        # Update time statistics from the running totals
+        statistics = self.settings.statistics
+        self.today_time_label.config(
+            text=f"Today's Study Time: {statistics.format_time(statistics.get_today_time())}")
+        self.week_time_label.config(
+            text=f"This Week's Study Time: {statistics.format_time(statistics.get_week_time())}")
+        self.total_time_label.config(
+            text=f"Total Study Time: {statistics.format_time(statistics.get_total_time())}")
         
         # Tasks completed
         self.completed_tasks_label.config(text=f"Completed Tasks: {len(self.settings.completed_tasks)}")
@@ -277,13 +220,12 @@ class AnalyticsTab:
         # Update goal progress
         self.update_goal_progress()
         
-        # Update chart
+        # Update chart (only the bars that changed are redrawn)
         self.create_study_time_chart()
     
     def update_goal_progress(self):
         """Update the daily goal progress bar"""
-        today = datetime.now().date().strftime("%Y-%m-%d")
-        today_seconds = self.settings.daily_stats.get(today, 0)
+        today_seconds = self.settings.statistics.get_today_time()
         goal_minutes = int(self.settings.daily_goal.get())
         goal_seconds = goal_minutes * 60
         
@@ -297,9 +239,9 @@ class AnalyticsTab:
         if hasattr(self, 'chart_frame'):
             if width < 900:
                 # Smaller chart for small windows
-                for widget in self.chart_frame.winfo_children():
-                    if isinstance(widget, tk.Canvas):
-                        widget.config(width=width-100)
+                widget = self.chart.get_widget() if self.chart is not None else None
+                if widget is not None:
+                    widget.config(width=width-100)
             else:
                 # Regular chart size
                 pass
@@ -312,7 +254,9 @@ class AnalyticsTab:
         # Update all widgets
         self.update_widget_colors(self.frame)
         
-        # Update chart
+        # Recolor the chart in place
+        if self.chart is not None:
+            self.chart.set_colors(self.settings.colors)
         self.create_study_time_chart()
     
     def update_widget_colors(self, widget):
@@ -0,0 +1,106 @@
+"""
+Window background image rendering for Study Timer Pro
+"""
+
+import os
+from collections import OrderedDict
+
+class BackgroundImage:
+    """
+    Renders the background image at window sizes, reusing earlier work
+    
+    The decoded file comes from the shared ImageCache and is held until
+    its path or mtime changes.  Rendering with high_quality=False uses a fast filter and is
+    not kept, for the many sizes a window goes through while it is being
+    dragged.  High quality (LANCZOS) renders are kept in an LRU keyed by
+    (path, mtime, width, height), so returning to a recent size is free.
+    """
+    
+    def __init__(self, cache_size=8, make_photo=None, images=None):
+        """
+        Initialize the renderer
+        
+        Args:
+            cache_size: Number of high quality renders to keep
+            make_photo: Function turning a PIL image into what is shown
+                (ImageTk.PhotoImage by default)
+            images: ImageCache to decode with (the shared one by default)
+        """
+        if images is None:
+            from utils.image_cache import get_default_image_cache
+            images = get_default_image_cache()
+        self.images = images
+        self.cache_size = cache_size
+        self.make_photo = make_photo
+        self.source_key = None
+        self.source = None
+        self.renders = OrderedDict()
+        self.decode_count = 0
+        self.resize_count = 0
+    
+    def render(self, path, size, high_quality=True):
+        """
+        Get the image resized to a window size
+        
+        Args:
+            path: Image file
+            size: (width, height) in pixels
+            high_quality: Use LANCZOS and keep the result, rather than a
+                fast filter for a size that is about to change again
+        
+        Returns:
+            The photo made by make_photo
+        """
+        from PIL import Image
+        
+        mtime = os.path.getmtime(path)
+        key = (path, mtime, size[0], size[1])
+        photo = self.renders.get(key)
+        if photo is not None:
+            self.renders.move_to_end(key)
+            return photo
+        
+        source = self.get_source(path, mtime)
+        resample = Image.LANCZOS if high_quality else Image.NEAREST
+        photo = self._make_photo(source.resize(size, resample))
+        self.resize_count += 1
+        if high_quality:
+            self.renders[key] = photo
+            while len(self.renders) > self.cache_size:
+                self.renders.popitem(last=False)
+        return photo
+    
+    def get_source(self, path, mtime=None):
+        """
+        Get the decoded image, reading the file only if it changed
+        
+        Args:
+            path: Image file
+            mtime: Modification time of the file, if already known
+        
+        Returns:
+            PIL.Image.Image: The decoded image
+        """
+        if mtime is None:
+            mtime = os.path.getmtime(path)
+        if self.source_key != (path, mtime):
+            self.source = self.images.get_image(path)
+            self.source_key = (path, mtime)
+            self.decode_count += 1
+            # Renders of an older version of the file are stale
+            for key in [key for key in self.renders if key[:2] != self.source_key]:
+                del self.renders[key]
+        return self.source
+    
+    def clear(self):
+        """Forget the decoded image and every render"""
+        self.source_key = None
+        self.source = None
+        self.renders.clear()
+    
+    def _make_photo(self, image):
+        """Turn a resized PIL image into a photo"""
+        if self.make_photo is not None:
+            return self.make_photo(image)
+        from PIL import ImageTk
+        return ImageTk.PhotoImage(image)
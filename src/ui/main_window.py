@@ -6,14 +6,16 @@ import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 import json
-import pygame
 
+from ui.background_image import BackgroundImage
 from ui.timer_tab import TimerTab
-from ui.analytics_tab import AnalyticsTab
-from ui.settings_tab import SettingsTab
 from utils.settings import Settings
+from utils.image_cache import get_default_image_cache
+from utils.sound_manager import SoundManager
 from utils.notifications import NotificationManager
-from PIL import Image, ImageTk
+
+# Quiet period after the last resize before the background is redrawn with LANCZOS
+BACKGROUND_RESIZE_DELAY = 150  # milliseconds
 
 class StudyTimerApp:
     def __init__(self, root):
@@ -23,13 +25,21 @@ class StudyTimerApp:
         self.root.minsize(800, 600)
         self.root.resizable(True, True)
         
-        # Initialize pygame mixer for sound playback
-        pygame.mixer.init()
-        
         # Load settings
         self.settings = Settings()
         self.settings.load_settings()
         
+        # All sounds play through the sound manager, which follows the volume
+        # settings and keeps the chimes decoded (the pygame mixer is started
+        # by the first sound that is loaded or played)
+        self.sound_manager = SoundManager(self.settings.volume_level.get() / 100.0,
+                                          self.settings.is_muted.get())
+        self.settings.volume_level.trace_add('write', self.update_sound_volume)
+        self.settings.is_muted.trace_add('write', self.update_sound_volume)
+        for variable in (self.settings.sound_notifications, self.settings.start_sound_path,
+                         self.settings.end_sound_path):
+            variable.trace_add('write', self.preload_sounds)
+        
         # Set app icon
         self.set_app_icon()
         
@@ -46,8 +56,36 @@ class StudyTimerApp:
         # Bind window resize event
         self.root.bind("<Configure>", self.on_window_resize)
         
+        # Background image, kept decoded and rendered per window size
+        self.background = BackgroundImage()
+        self.bg_image_label = None
+        self.bg_shown = None
+        self.bg_resize_job = None
+        
         # Apply background image if set
         self.apply_background_image()
+        
+        # Decode the chimes once the window is up
+        self.root.after_idle(self.preload_sounds)
+    
+    def update_sound_volume(self, *args):
+        """Apply the volume and mute settings to every sound"""
+        try:
+            self.sound_manager.set_volume(self.settings.volume_level.get() / 100.0)
+        except tk.TclError:
+            return  # Not a number yet
+        if self.settings.is_muted.get():
+            self.sound_manager.mute()
+        else:
+            self.sound_manager.unmute()
+    
+    def preload_sounds(self, *args):
+        """Decode the configured chimes in the background so they play instantly"""
+        if not self.settings.sound_notifications.get():
+            return
+        sound_paths = [self.settings.start_sound_path.get(), self.settings.end_sound_path.get()]
+        if any(sound_paths):
+            self.sound_manager.preload_async(sound_paths)
     
     def set_app_icon(self):
         """Set the application icon"""
@@ -55,7 +93,7 @@ class StudyTimerApp:
             # Check for custom app icon
             custom_icon_path = self.settings.custom_app_icon.get()
             if custom_icon_path and os.path.exists(custom_icon_path):
-                icon_photo = ImageTk.PhotoImage(Image.open(custom_icon_path))
+                icon_photo = get_default_image_cache().get_photo(custom_icon_path)
                 self.root.iconphoto(True, icon_photo)
             else:
                 # Use default icon
@@ -71,15 +109,42 @@ class StudyTimerApp:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Create tabs
+        # Create the timer tab now and the others when first selected, so
+        # matplotlib and PIL are only imported if they are needed
         self.timer_tab = TimerTab(self.notebook, self)
-        self.analytics_tab = AnalyticsTab(self.notebook, self)
-        self.settings_tab = SettingsTab(self.notebook, self)
+        self.analytics_tab = None
+        self.settings_tab = None
+        self.lazy_tabs = {}
         
         # Add tabs to notebook
         self.notebook.add(self.timer_tab.frame, text="Timer")
-        self.notebook.add(self.analytics_tab.frame, text="Analytics")
-        self.notebook.add(self.settings_tab.frame, text="Settings")
+        self.add_lazy_tab("analytics_tab", "Analytics")
+        self.add_lazy_tab("settings_tab", "Settings")
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+    
+    def add_lazy_tab(self, name, text):
+        """Add an empty notebook page that is filled in when first selected"""
+        page = tk.Frame(self.notebook, bg=self.settings.colors['bg'])
+        self.notebook.add(page, text=text)
+        self.lazy_tabs[str(page)] = (name, page)
+    
+    def on_tab_changed(self, event):
+        """Build a lazily created tab the first time it is selected"""
+        entry = self.lazy_tabs.pop(self.notebook.select(), None)
+        if entry is not None:
+            self.build_tab(*entry)
+    
+    def build_tab(self, name, page):
+        """Create a tab inside its notebook page"""
+        if name == "analytics_tab":
+            from ui.analytics_tab import AnalyticsTab
+            tab = AnalyticsTab(page, self)
+        else:
+            from ui.settings_tab import SettingsTab
+            tab = SettingsTab(page, self)
+        tab.frame.pack(fill=tk.BOTH, expand=True)
+        setattr(self, name, tab)
+        return tab
     
     def create_menu(self):
         """Create the application menu"""
@@ -128,44 +193,80 @@ class StudyTimerApp:
             # Update layout if needed for responsive design
             width, height = event.width, event.height
             self.timer_tab.adjust_layout_for_size(width, height)
-            self.analytics_tab.adjust_layout_for_size(width, height)
+            if self.analytics_tab is not None:
+                self.analytics_tab.adjust_layout_for_size(width, height)
             
-            # Reapply background image to fit new size
-            if self.settings.background_image_path.get():
-                self.apply_background_image()
+            # Refit the background image: a quick resize now and a LANCZOS
+            # one once the window has stopped changing size
+            if self.settings.background_image_path.get() and self.bg_image_label is not None:
+                size = (width, height)
+                if self.bg_shown is None or self.bg_shown[1] != size:
+                    self.apply_background_image(size, high_quality=False)
+                    if self.bg_resize_job is not None:
+                        self.root.after_cancel(self.bg_resize_job)
+                    self.bg_resize_job = self.root.after(BACKGROUND_RESIZE_DELAY,
+                                                         self.finish_background_resize)
     
-    def apply_background_image(self):
-        """Apply the selected background image"""
-        # Remove existing background if any
-        if hasattr(self, 'bg_image_label'):
-            self.bg_image_label.destroy()
-        
+    def finish_background_resize(self):
+        """Redraw the background in high quality at the final window size"""
+        self.bg_resize_job = None
+        self.apply_background_image()
+    
+    def apply_background_image(self, size=None, high_quality=True):
+        """
+        Apply the selected background image
+        
+        Args:
+            size: (width, height) to fit, or None for the current window size
+            high_quality: Resize with LANCZOS (False while the window is being resized)
+        """
         # If a background image is set, apply it
         bg_path = self.settings.background_image_path.get()
-        if bg_path and os.path.exists(bg_path):
-            try:
-                from PIL import Image, ImageTk
-                
-                # Load and resize image to fit window
-                image = Image.open(bg_path)
-                width, height = self.root.winfo_width(), self.root.winfo_height()
-                
-                # If window hasn't been drawn yet, use default size
-                if width <= 1:
-                    width, height = 1100, 700
-                
-                image = image.resize((width, height), Image.LANCZOS)
-                bg_image = ImageTk.PhotoImage(image)
-                
-                # Create label with image
-                self.bg_image_label = tk.Label(self.root, image=bg_image)
-                self.bg_image_label.image = bg_image  # Keep a reference
-                self.bg_image_label.place(x=0, y=0, relwidth=1, relheight=1)
-                
-                # Move notebook to top
-                self.notebook.lift()
-            except Exception as e:
+        if not bg_path or not os.path.exists(bg_path):
+            self.remove_background_image()
+            return
+        
+        if size is None:
+            size = (self.root.winfo_width(), self.root.winfo_height())
+            # If window hasn't been drawn yet, use default size
+            if size[0] <= 1:
+                size = (1100, 700)
+        
+        # The mtime makes an image edited in place count as a new one
+        shown = (bg_path, os.stat(bg_path).st_mtime_ns, size, high_quality)
+        if shown == self.bg_shown:
+            return
+        try:
+            bg_image = self.background.render(bg_path, size, high_quality)
+        except Exception as e:
+            if high_quality:
                 messagebox.showerror("Error", f"Failed to apply background image: {e}")
+            else:
+                print(f"Error resizing background image: {e}")
+            return
+        
+        if self.bg_image_label is None:
+            # Create label with image
+            self.bg_image_label = tk.Label(self.root, image=bg_image)
+            self.bg_image_label.place(x=0, y=0, relwidth=1, relheight=1)
+            
+            # Move notebook to top
+            self.notebook.lift()
+        else:
+            self.bg_image_label.config(image=bg_image)
+        self.bg_image_label.image = bg_image  # Keep a reference
+        self.bg_shown = shown
+    
+    def remove_background_image(self):
+        """Remove the background image"""
+        if self.bg_resize_job is not None:
+            self.root.after_cancel(self.bg_resize_job)
+            self.bg_resize_job = None
+        if self.bg_image_label is not None:
+            self.bg_image_label.destroy()
+            self.bg_image_label = None
+        self.bg_shown = None
+        self.background.clear()
     
     def change_theme(self, theme_name):
         """Change the application theme"""
@@ -179,10 +280,14 @@ class StudyTimerApp:
         # Update root and notebook
         self.root.configure(bg=self.settings.colors['bg'])
         
-        # Update tabs
+        # Update tabs (tabs not built yet pick up the theme when created)
         self.timer_tab.apply_theme()
-        self.analytics_tab.apply_theme()
-        self.settings_tab.apply_theme()
+        if self.analytics_tab is not None:
+            self.analytics_tab.apply_theme()
+        if self.settings_tab is not None:
+            self.settings_tab.apply_theme()
+        for name, page in self.lazy_tabs.values():
+            page.configure(bg=self.settings.colors['bg'])
         
         # Update notebook style
         style = ttk.Style()
@@ -280,9 +385,10 @@ class StudyTimerApp:
         """Reset all statistics data"""
         if messagebox.askyesno("Reset Statistics", 
                               "Are you sure you want to reset all statistics? This cannot be undone."):
-            self.settings.daily_stats = {}
+            self.settings.reset_statistics()
             self.settings.completed_tasks = []
-            self.analytics_tab.update_statistics_display()
+            if self.analytics_tab is not None:
+                self.analytics_tab.update_statistics_display()
             self.timer_tab.calculate_streak()
             self.settings.save_settings()
             messagebox.showinfo("Reset", "Statistics have been reset.")
@@ -339,5 +445,6 @@ class StudyTimerApp:
             self.timer_tab.unlock_all_apps()
             self.timer_tab.unblock_all_websites()
             self.settings.save_settings()
+            self.settings.flush_settings()
             self.root.destroy()
 
@@ -8,7 +8,9 @@ import os
 import platform
 import subprocess
 import shutil
-from PIL import Image, ImageTk
+
+from core.dns_sinkhole import DEFAULT_PORT
+from utils.image_cache import get_default_image_cache
 
 class SettingsTab:
     def __init__(self, parent, app):
@@ -71,6 +73,44 @@ class SettingsTab:
                      activebackground=self.settings.colors['bg'],
                      activeforeground=self.settings.colors['fg']).pack(anchor=tk.W, padx=10, pady=5)
         
+        # Website blocking settings
+        site_block_frame = tk.LabelFrame(self.scrollable_frame,
+                                       text="Website Blocking Settings",
+                                       bg=self.settings.colors['bg'],
+                                       fg=self.settings.colors['fg'],
+                                       font=('Arial', 10, 'bold'))
+        site_block_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        for text, value in (("Edit the hosts file (needs administrator rights)", "hosts"),
+                            ("Local DNS sinkhole (no administrator rights, supports *.domain)", "dns")):
+            tk.Radiobutton(site_block_frame,
+                         text=text,
+                         variable=self.settings.blocking_backend,
+                         value=value,
+                         bg=self.settings.colors['bg'],
+                         fg=self.settings.colors['text'],
+                         selectcolor=self.settings.colors['bg'],
+                         activebackground=self.settings.colors['bg'],
+                         activeforeground=self.settings.colors['fg']).pack(anchor=tk.W, padx=10, pady=2)
+        
+        tk.Label(site_block_frame,
+               text="DNS sinkhole port:",
+               bg=self.settings.colors['bg'],
+               fg=self.settings.colors['fg']).pack(anchor=tk.W, padx=10, pady=5)
+        
+        tk.Entry(site_block_frame,
+               textvariable=self.settings.dns_port,
+               bg=self.settings.colors['bg'],
+               fg=self.settings.colors['text']).pack(fill=tk.X, padx=10, pady=5)
+        
+        tk.Label(site_block_frame,
+               text="Point your system or browser DNS at 127.0.0.1 on this port "
+                    "(see the developer guide).",
+               bg=self.settings.colors['bg'],
+               fg=self.settings.colors['text'],
+               justify=tk.LEFT,
+               wraplength=400).pack(anchor=tk.W, padx=10, pady=5)
+        
         # Notification settings
         notif_frame = tk.LabelFrame(self.scrollable_frame,
                                   text="Notification Settings",
@@ -123,15 +163,13 @@ class SettingsTab:
                               variable=self.settings.volume_level,
                               bg=self.settings.colors['bg'], 
                               fg=self.settings.colors['fg'],
-                              highlightthickness=0,
-                              command=self.update_volume)
+                              highlightthickness=0)
         volume_scale.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
         
         # Mute checkbox
         tk.Checkbutton(volume_frame,
                      text="Mute",
                      variable=self.settings.is_muted,
-                     command=self.toggle_mute,
                      bg=self.settings.colors['bg'],
                      fg=self.settings.colors['text'],
                      selectcolor=self.settings.colors['bg'],
@@ -397,20 +435,6 @@ class SettingsTab:
                 fg=self.settings.colors['text'],
                 width=20).pack(pady=5)
     
-    def update_volume(self, *args):
-        """Update volume level for all sounds"""
-        import pygame
-        volume = self.settings.volume_level.get() / 100.0
-        pygame.mixer.music.set_volume(volume)
-    
-    def toggle_mute(self):
-        """Toggle mute state for all sounds"""
-        import pygame
-        if self.settings.is_muted.get():
-            pygame.mixer.music.set_volume(0)
-        else:
-            pygame.mixer.music.set_volume(self.settings.volume_level.get() / 100.0)
-    
     def browse_sound_file(self, sound_type):
         """Browse for a sound file"""
         filetypes = [("Sound files", "*.wav *.mp3 *.ogg"), ("All files", "*.*")]
@@ -436,29 +460,22 @@ class SettingsTab:
             messagebox.showinfo("Sound Test", "Sound is currently muted.")
             return
         
-        try:
-            import pygame
-            if sound_type == "start" and self.settings.start_sound_path.get():
-                sound = pygame.mixer.Sound(self.settings.start_sound_path.get())
-                sound.set_volume(self.settings.volume_level.get() / 100.0)
-                sound.play()
-            elif sound_type == "end" and self.settings.end_sound_path.get():
-                sound = pygame.mixer.Sound(self.settings.end_sound_path.get())
-                sound.set_volume(self.settings.volume_level.get() / 100.0)
-                sound.play()
-            elif sound_type == "background" and self.settings.background_music_path.get():
-                # Stop any currently playing music
-                pygame.mixer.music.stop()
-                
-                # Load and play the background music
-                pygame.mixer.music.load(self.settings.background_music_path.get())
-                pygame.mixer.music.set_volume(self.settings.volume_level.get() / 100.0)
-                pygame.mixer.music.play()
-                
-                # Stop after 5 seconds (for testing)
-                self.app.root.after(5000, pygame.mixer.music.stop)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to play sound: {e}")
+        # Volume is applied by the sound manager
+        sound_manager = self.app.sound_manager
+        played = True
+        if sound_type == "start" and self.settings.start_sound_path.get():
+            played = sound_manager.play_sound(self.settings.start_sound_path.get(), channel="preview")
+        elif sound_type == "end" and self.settings.end_sound_path.get():
+            played = sound_manager.play_sound(self.settings.end_sound_path.get(), channel="preview")
+        elif sound_type == "background" and self.settings.background_music_path.get():
+            played = sound_manager.play_background_music(self.settings.background_music_path.get(), loop=False)
+            
+            # Stop after 5 seconds (for testing)
+            if played:
+                self.app.root.after(5000, sound_manager.stop_background_music)
+        
+        if not played:
+            messagebox.showerror("Error", "Failed to play sound. Check that the file exists and is a supported format.")
     
     def browse_study_image(self):
         """Browse for study image"""
@@ -503,10 +520,8 @@ class SettingsTab:
         study_image_path = self.settings.custom_study_image.get()
         if study_image_path and os.path.exists(study_image_path):
             try:
-                # Load and resize image for preview
-                img = Image.open(study_image_path)
-                img = img.resize((150, 150), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
+                # Load and resize image for preview (cached until the file changes)
+                photo = get_default_image_cache().get_photo(study_image_path, (150, 150))
                 
                 # Display preview
                 preview_label = tk.Label(self.study_image_preview_frame, image=photo, bg=self.settings.colors['bg'])
@@ -566,10 +581,8 @@ class SettingsTab:
         app_icon_path = self.settings.custom_app_icon.get()
         if app_icon_path and os.path.exists(app_icon_path):
             try:
-                # Load and resize image for preview
-                img = Image.open(app_icon_path)
-                img = img.resize((64, 64), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
+                # Load and resize image for preview (cached until the file changes)
+                photo = get_default_image_cache().get_photo(app_icon_path, (64, 64))
                 
                 # Display preview
                 preview_label = tk.Label(self.app_icon_preview_frame, image=photo, bg=self.settings.colors['bg'])
@@ -608,9 +621,7 @@ class SettingsTab:
         self.settings.background_image_path.set("")
         
         # Remove background label if it exists
-        if hasattr(self.app, 'bg_image_label'):
-            self.app.bg_image_label.destroy()
-            delattr(self.app, 'bg_image_label')
+        self.app.remove_background_image()
     
     def reset_all_settings(self):
         """Reset all settings to default values"""
@@ -624,6 +635,8 @@ class SettingsTab:
             # Reset app blocking settings
             self.settings.strict_mode.set(False)
             self.settings.auto_block.set(False)
+            self.settings.blocking_backend.set("hosts")
+            self.settings.dns_port.set(str(DEFAULT_PORT))
             
             # Reset notification settings
             self.settings.desktop_notifications.set(True)
@@ -682,6 +695,10 @@ class SettingsTab:
             # Apply app icon
             self.app.set_app_icon()
             
+            # Switch website blocking backend if it changed
+            if hasattr(self.app, 'timer_tab'):
+                self.app.timer_tab.apply_blocking_backend()
+            
             # Save all settings to file
             self.settings.save_settings()
             messagebox.showinfo("Settings", "Settings saved successfully!")
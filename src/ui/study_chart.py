@@ -0,0 +1,176 @@
+"""
+Persistent study time bar chart for Study Timer Pro
+"""
+
+import math
+import tkinter as tk
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+class StudyTimeChart:
+    """
+    One figure, canvas and set of bars reused for every refresh
+    
+    The bars are only created when the view changes (a different view type
+    or number of bars).  Bars and value labels are animated artists: every
+    full draw saves the background without them, so a refresh that keeps
+    the title and the (rounded) y limit only restores that background,
+    redraws the bars in place and blits the axes.  Anything else changes
+    the background and goes through draw_idle(), which Tk coalesces with
+    any other pending redraw.  A refresh with the same data and colors
+    draws nothing.
+    """
+    
+    def __init__(self, master=None, colors=None, figsize=(8, 4), dpi=100):
+        """
+        Initialize the chart
+        
+        Args:
+            master: Tk widget to pack the canvas into, or None for an
+                off-screen canvas (benchmarks and tests)
+            colors: Theme colors with 'bg', 'fg' and 'accent'
+            figsize: Figure size in inches
+            dpi: Figure resolution
+        """
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.ax = self.figure.add_subplot(111)
+        if master is not None:
+            self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+            self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        else:
+            self.canvas = FigureCanvasAgg(self.figure)
+        self.colors = dict(colors or {'bg': 'white', 'fg': 'black', 'accent': 'tab:blue'})
+        self.view_key = None
+        self.bars = []
+        self.value_labels = []
+        self.shown = None
+        self.background = None
+        self.rebuild_count = 0
+        self.draw_count = 0
+        self.blit_count = 0
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def get_widget(self):
+        """Get the Tk widget of the canvas (None when off-screen)"""
+        if isinstance(self.canvas, FigureCanvasTkAgg):
+            return self.canvas.get_tk_widget()
+        return None
+    
+    def show(self, view_type, positions, values, title, xlabel=None, ylabel=None,
+             xticks=None, value_labels=False):
+        """
+        Show data, reusing the existing bars when the view is the same
+        
+        Args:
+            view_type: Name of the view ("daily", "weekly", "monthly")
+            positions: Bar positions or category names
+            values: Bar heights
+            title: Chart title
+            xlabel: X axis label, if any
+            ylabel: Y axis label, if any
+            xticks: X tick positions, or None for the default
+            value_labels: Whether to write each value above its bar
+        
+        Returns:
+            bool: True if the chart was redrawn
+        """
+        values = [float(value) for value in values]
+        view_key = (view_type, len(values), value_labels)
+        if view_key != self.view_key:
+            self._build(view_key, positions, values, xlabel, ylabel, xticks, value_labels)
+        
+        shown = (tuple(values), title, tuple(sorted(self.colors.items())))
+        if shown == self.shown:
+            return False
+        
+        for bar, value in zip(self.bars, values):
+            bar.set_height(value)
+        for bar, label, value in zip(self.bars, self.value_labels, values):
+            label.set_text(f'{int(value)}')
+            label.set_y(value)
+        
+        top = self._nice_limit(max(values, default=0) * 1.1)
+        background_changed = (self.shown is None or self.background is None or
+                              title != self.shown[1] or top != self.ax.get_ylim()[1])
+        self.shown = shown
+        if background_changed:
+            self.ax.set_title(title)
+            self.ax.set_ylim(0, top)
+            self.canvas.draw_idle()
+            self.draw_count += 1
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_animated()
+            self.canvas.blit(self.figure.bbox)
+            self.blit_count += 1
+        return True
+    
+    def set_colors(self, colors):
+        """
+        Recolor the chart for a new theme without rebuilding it
+        
+        Args:
+            colors: Theme colors with 'bg', 'fg' and 'accent'
+        """
+        self.colors = dict(colors)
+        self._apply_colors()
+        self.shown = None  # Full redraw on the next show()
+    
+    def _build(self, view_key, positions, values, xlabel, ylabel, xticks, value_labels):
+        """Create the bars and axis decorations for a new view"""
+        self.ax.clear()
+        self.bars = list(self.ax.bar(positions, values))
+        self.value_labels = []
+        if value_labels:
+            for bar in self.bars:
+                self.value_labels.append(self.ax.text(bar.get_x() + bar.get_width() / 2., 0, '',
+                                                      ha='center', va='bottom'))
+        # Left out of full draws so the background can be reused
+        for artist in self.bars + self.value_labels:
+            artist.set_animated(True)
+        if xlabel:
+            self.ax.set_xlabel(xlabel)
+        if ylabel:
+            self.ax.set_ylabel(ylabel)
+        if xticks is not None:
+            self.ax.set_xticks(xticks)
+        self.view_key = view_key
+        self.shown = None
+        self.background = None
+        self.rebuild_count += 1
+        self._apply_colors()
+    
+    def _apply_colors(self):
+        """Color the figure, axes, bars and labels from self.colors"""
+        bg, fg = self.colors['bg'], self.colors['fg']
+        self.figure.patch.set_facecolor(bg)
+        self.ax.set_facecolor(bg)
+        self.ax.title.set_color(fg)
+        self.ax.xaxis.label.set_color(fg)
+        self.ax.yaxis.label.set_color(fg)
+        self.ax.tick_params(colors=fg)
+        for bar in self.bars:
+            bar.set_color(self.colors['accent'])
+        for label in self.value_labels:
+            label.set_color(fg)
+    
+    def _on_draw(self, event):
+        """Save the background of a full draw and add the bars on top"""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+    
+    def _draw_animated(self):
+        """Draw the bars and value labels over the current background"""
+        for artist in self.bars + self.value_labels:
+            self.ax.draw_artist(artist)
+    
+    @staticmethod
+    def _nice_limit(value):
+        """Round a y limit up to 1, 2 or 5 times a power of ten (at least 1)"""
+        if value <= 1:
+            return 1.0
+        scale = 10 ** math.floor(math.log10(value))
+        for step in (1, 2, 5, 10):
+            if value <= step * scale:
+                return float(step * scale)
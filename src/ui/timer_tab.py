@@ -8,19 +8,25 @@ import threading
 import time
 import random
 import calendar
-from datetime import datetime, timedelta
+from datetime import datetime
 import platform
 import subprocess
-import psutil
 import os
-from PIL import Image, ImageTk
-from io import BytesIO
-import requests
 
+from utils.image_cache import get_default_image_cache
 from utils.notifications import show_notification
-from core.timer import TimerManager
-from core.app_blocker import block_application, unblock_application
-from core.website_blocker import block_website, unblock_website, get_hosts_path
+from utils.remote_image import RemoteImageCache, STUDY_IMAGE_URL
+from core.pomodoro import PomodoroEngine, FOCUS, PHASE_NAMES
+from core.app_blocker import block_application, block_applications, terminate_processes, unblock_application
+from core.app_matcher import AppMatcher
+from core.process_watcher import ProcessWatcher
+from core.website_blocker import (block_website, block_websites, unblock_website, unblock_all_websites,
+                                  get_blocking_backend, set_blocking_backend)
+from core.dns_sinkhole import DnsSinkhole, DnsSinkholeBackend, DEFAULT_PORT
+from core.blocklist import load_blocklist_file
+
+STUDY_IMAGE_SIZE = (250, 250)
+DEFAULT_STUDY_IMAGE = os.path.join("resources", "images", "study_image.png")
 
 class TimerTab:
     def __init__(self, parent, app):
@@ -36,7 +42,19 @@ class TimerTab:
         self.paused = False
         self.remaining_seconds = 0
         self.start_time = None
-        self.current_timer_thread = None
+        self.engine = None
+        self.countdown_job = None
+        self.displayed_seconds = None
+        
+        # Current phase as recorded in the session log
+        self.phase_started_at = None
+        self.phase_paused_seconds = 0.0
+        self.phase_interruptions = 0
+        self.pause_started_at = None
+        
+        # Study image downloads run in the background
+        self.remote_images = RemoteImageCache()
+        self.study_image_worker = None
         
         # Create UI components
         self.setup_frames()
@@ -44,7 +62,12 @@ class TimerTab:
         self.create_center_panel()
         self.create_right_panel()
         
-        # Start monitoring thread
+        # Block websites the way the settings ask for (switching backend
+        # re-imports the saved blocklists, otherwise it is done here)
+        if not self.apply_blocking_backend():
+            self.load_blocklists(self.settings.imported_blocklists)
+        
+        # Create the locked app watcher
         self.start_monitoring()
         
         # Create minimized window
@@ -287,8 +310,8 @@ class TimerTab:
         self.image_frame = tk.Frame(self.center_frame, bg=self.settings.colors['bg'])
         self.image_frame.pack(pady=10)
         
-        # Load and display study image
-        self.load_study_image()
+        # Load and display study image once the timer is on screen
+        self.app.root.after_idle(self.load_study_image)
         
         # Session counter
         self.session_frame = tk.Frame(self.center_frame, bg=self.settings.colors['bg'])
@@ -308,69 +331,67 @@ class TimerTab:
         self.session_indicators = []
     
     def load_study_image(self):
-        """Load and display the study image"""
+        """Load and display the study image without waiting for the network"""
         # Clear any existing widgets in the image frame
         for widget in self.image_frame.winfo_children():
             widget.destroy()
         
+        # Text until (or unless) an image can be shown
+        self.study_image_label = tk.Label(self.image_frame,
+                                        text="Study Time!",
+                                        font=('Arial', 24, 'bold'),
+                                        bg=self.settings.colors['bg'],
+                                        fg=self.settings.colors['fg'])
+        self.study_image_label.pack(pady=10)
+        
+        # Check if custom study image is set
+        custom_image_path = self.settings.custom_study_image.get()
+        if custom_image_path and os.path.exists(custom_image_path):
+            self.show_study_image(custom_image_path)
+            return
+        
+        # Default image: the copy downloaded on an earlier run, else the bundled one
+        cached_path = self.remote_images.get_cached_path(STUDY_IMAGE_URL, STUDY_IMAGE_SIZE)
+        self.show_study_image(cached_path or DEFAULT_STUDY_IMAGE)
+        self.refresh_study_image()
+    
+    def show_study_image(self, path):
+        """Show an image file in the study image label, keeping the text if it cannot be loaded"""
+        if not os.path.exists(path):
+            return False
         try:
-            # Check if custom study image is set
-            custom_image_path = self.settings.custom_study_image.get()
-            
-            if custom_image_path and os.path.exists(custom_image_path):
-                # Load custom image from file
-                img_data = Image.open(custom_image_path)
-                img_data = img_data.resize((250, 250), Image.LANCZOS)
-                img = ImageTk.PhotoImage(img_data)
-                
-                img_label = tk.Label(self.image_frame,
-                                   image=img,
-                                   bg=self.settings.colors['bg'])
-                img_label.image = img  # Keep a reference to prevent garbage collection
-                img_label.pack(pady=10)
-            else:
-                # Try to load default image from URL
-                try:
-                    response = requests.get("https://hebbkx1anhila5yf.public.blob.vercel-storage.com/Post2-tZfCun4BBdFUBdGHLDq3XeBP2UHwFc.png")
-                    img_data = Image.open(BytesIO(response.content))
-                    img_data = img_data.resize((250, 250), Image.LANCZOS)
-                    img = ImageTk.PhotoImage(img_data)
-                    
-                    img_label = tk.Label(self.image_frame,
-                                       image=img,
-                                       bg=self.settings.colors['bg'])
-                    img_label.image = img
-                    img_label.pack(pady=10)
-                except Exception as e:
-                    print(f"Error loading image from URL: {e}")
-                    # Try to load local default image
-                    default_img_path = os.path.join("resources", "images", "study_image.png")
-                    if os.path.exists(default_img_path):
-                        img_data = Image.open(default_img_path)
-                        img_data = img_data.resize((250, 250), Image.LANCZOS)
-                        img = ImageTk.PhotoImage(img_data)
-                        
-                        img_label = tk.Label(self.image_frame,
-                                           image=img,
-                                           bg=self.settings.colors['bg'])
-                        img_label.image = img
-                        img_label.pack(pady=10)
-                    else:
-                        # Fallback to text
-                        tk.Label(self.image_frame,
-                               text="Study Time!",
-                               font=('Arial', 24, 'bold'),
-                               bg=self.settings.colors['bg'],
-                               fg=self.settings.colors['fg']).pack(pady=10)
+            img = get_default_image_cache().get_photo(path, STUDY_IMAGE_SIZE)
         except Exception as e:
             print(f"Error loading study image: {e}")
-            # Fallback to text
-            tk.Label(self.image_frame,
-                   text="Study Time!",
-                   font=('Arial', 24, 'bold'),
-                   bg=self.settings.colors['bg'],
-                   fg=self.settings.colors['fg']).pack(pady=10)
+            return False
+        
+        self.study_image_label.config(image=img, text="")
+        self.study_image_label.image = img  # Keep a reference to prevent garbage collection
+        return True
     
+    def refresh_study_image(self):
+        """Download the default study image in the background if it is due for a check"""
+        if self.study_image_worker is not None and self.study_image_worker.is_alive():
+            return
+        if not self.remote_images.needs_refresh(STUDY_IMAGE_URL, STUDY_IMAGE_SIZE):
+            return
+        
+        result = {}
+        
+        def work():
+            result['path'] = self.remote_images.refresh(STUDY_IMAGE_URL, STUDY_IMAGE_SIZE)
+        
+        def check():
+            if worker.is_alive():
+                self.frame.after(200, check)
+            elif result.get('path') and not self.settings.custom_study_image.get():
+                self.show_study_image(result['path'])
+        
+        worker = threading.Thread(target=work, daemon=True)
+        self.study_image_worker = worker
+        worker.start()
+        check()
+
     def create_right_panel(self):
         """Create the right panel with app locker, website blocker, and to-do list"""
         # App locker
@@ -481,6 +502,18 @@ class TimerTab:
                                       fg=self.settings.colors['text'])
         self.unblock_button.pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
         
+        tk.Button(site_btn_frame,
+                text="Import List",
+                command=self.import_blocklist,
+                bg=self.settings.colors['button'],
+                fg=self.settings.colors['text']).pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
+        
+        tk.Button(site_btn_frame,
+                text="Clear Lists",
+                command=self.clear_blocklists,
+                bg=self.settings.colors['button'],
+                fg=self.settings.colors['text']).pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
+        
         # Blocked websites list
         self.blocked_sites_list = tk.Listbox(sites_frame,
                                            bg=self.settings.colors['bg'],
@@ -643,8 +676,11 @@ class TimerTab:
             
             # Auto-block if enabled
             if self.settings.auto_block.get():
-                for app in self.settings.locked_apps:
-                    block_application(app)
+                block_applications(self.settings.locked_apps, self.get_process_index(), self.app_matcher)
+            
+            # Watch for locked apps being launched during the session
+            self.app_matcher.update(self.settings.locked_apps)
+            self.process_watcher.start()
             
             # Change button states based on strict mode
             if self.settings.strict_mode.get():
@@ -668,37 +704,25 @@ class TimerTab:
             self.timer_progress['maximum'] = total_seconds
             self.timer_progress['value'] = 0
             
-            # Start the timer thread
-            self.current_timer_thread = threading.Thread(
-                target=self.run_timer,
-                args=(focus, short, long, sessions),
-                daemon=True
-            )
-            self.current_timer_thread.start()
+            # Start the phase engine and drive it from the Tk event loop
+            self.engine = PomodoroEngine(focus * 60, short * 60, long * 60,
+                                         sessions_before_long_break=sessions,
+                                         session_count=self.settings.session_count,
+                                         on_transition=self.on_phase_transition)
+            self.engine.start()
+            self.begin_phase_record(time.time())
+            self.displayed_seconds = None
+            self.tick_countdown()
             
             # Show desktop notification if enabled
             if self.settings.desktop_notifications.get():
                 show_notification("Study Session Started", "Your focus time has begun. Stay focused!")
             
             # Play start sound if enabled
-            if self.settings.sound_notifications.get() and self.settings.start_sound_path.get():
-                try:
-                    import pygame
-                    sound = pygame.mixer.Sound(self.settings.start_sound_path.get())
-                    sound.set_volume(0 if self.settings.is_muted.get() else self.settings.volume_level.get() / 100.0)
-                    sound.play()
-                except Exception as e:
-                    print(f"Error playing start sound: {e}")
+            self.play_cue("start")
             
             # Play background music if available
-            if self.settings.sound_notifications.get() and self.settings.background_music_path.get():
-                try:
-                    import pygame
-                    pygame.mixer.music.load(self.settings.background_music_path.get())
-                    pygame.mixer.music.set_volume(0 if self.settings.is_muted.get() else self.settings.volume_level.get() / 100.0)
-                    pygame.mixer.music.play(-1)  # Loop indefinitely
-                except Exception as e:
-                    print(f"Error playing background music: {e}")
+            self.play_background_music()
             
         except ValueError as e:
             messagebox.showerror("Error", "Please enter valid times (1-120 min for focus, 1-30 min for breaks, 1-10 sessions)")
@@ -710,11 +734,18 @@ class TimerTab:
                 # Resume the timer
                 self.paused = False
                 self.pause_button.config(text="Pause")
+                if self.pause_started_at is not None:
+                    self.phase_paused_seconds += time.time() - self.pause_started_at
+                    self.pause_started_at = None
+                if self.engine and self.engine.resume():
+                    self.tick_countdown()
+                
+                # Close locked apps opened while paused
+                self.process_watcher.report_all()
                 
                 # Resume background music if it was playing
                 if self.settings.sound_notifications.get() and self.settings.background_music_path.get():
-                    import pygame
-                    pygame.mixer.music.unpause()
+                    self.app.sound_manager.resume_background_music()
                 
                 # Show notification
                 if self.settings.desktop_notifications.get():
@@ -723,10 +754,14 @@ class TimerTab:
                 # Pause the timer
                 self.paused = True
                 self.pause_button.config(text="Resume")
+                self.phase_interruptions += 1
+                self.pause_started_at = time.time()
+                if self.engine:
+                    self.engine.pause()
+                self.cancel_countdown_tick()
                 
                 # Pause background music
-                import pygame
-                pygame.mixer.music.pause()
+                self.app.sound_manager.pause_background_music()
                 
                 # Show notification
                 if self.settings.desktop_notifications.get():
@@ -735,16 +770,20 @@ class TimerTab:
     def stop_session(self):
         """Stop the current session"""
         if self.is_timer_running:
-            # Calculate total focus time for this session
+            # Record the unfinished phase in the session log
             end_time = time.time()
-            session_time = int(end_time - self.start_time)
-            
-            # Update statistics
-            self.update_daily_stats(session_time)
+            if self.pause_started_at is not None:
+                self.phase_paused_seconds += end_time - self.pause_started_at
+                self.pause_started_at = None
+            if self.engine and self.engine.phase:
+                self.record_phase(self.engine.phase, end_time)
             
             # Stop the timer
             self.is_timer_running = False
             self.paused = False
+            self.cancel_countdown_tick()
+            self.engine = None
+            self.process_watcher.stop()
             self.start_button.config(state=tk.NORMAL)
             self.pause_button.config(state=tk.DISABLED, text="Pause")
             self.reset_button.config(state=tk.NORMAL)
@@ -754,8 +793,7 @@ class TimerTab:
             self.unblock_button.config(state=tk.NORMAL)
             
             # Stop background music
-            import pygame
-            pygame.mixer.music.stop()
+            self.app.sound_manager.stop_background_music()
             
             # Unblock all apps and websites if not in strict mode
             if not self.settings.strict_mode.get():
@@ -774,134 +812,147 @@ class TimerTab:
         self.timer_progress['value'] = 0
         self.update_session_indicators()
     
-    def run_timer(self, focus, short, long, sessions_before_long):
-        """Run the timer with focus and break periods"""
-        total_seconds = focus * 60
-        self.remaining_seconds = total_seconds
-        
-        while self.is_timer_running:
-            # Focus period
-            self.run_countdown(total_seconds, "Focus")
-            if not self.is_timer_running:
-                break
-            
-            # Break period
-            break_time = long if self.settings.session_count % sessions_before_long == 0 else short
-            break_type = "Long Break" if self.settings.session_count % sessions_before_long == 0 else "Short Break"
-            break_seconds = break_time * 60
-            
-            # Show notification
-            if self.settings.desktop_notifications.get():
-                show_notification("Break Time", f"Time for a {break_type.lower()}! ({break_time} minutes)")
-            
-            # Play end sound
-            if self.settings.sound_notifications.get() and self.settings.end_sound_path.get():
-                try:
-                    import pygame
-                    sound = pygame.mixer.Sound(self.settings.end_sound_path.get())
-                    sound.set_volume(0 if self.settings.is_muted.get() else self.settings.volume_level.get() / 100.0)
-                    sound.play()
-                except Exception as e:
-                    print(f"Error playing end sound: {e}")
-            
-            # Stop background music during break
-            import pygame
-            pygame.mixer.music.stop()
-            
-            # Enable controls during break
-            self.lock_button.config(state=tk.NORMAL)
-            self.unlock_button.config(state=tk.NORMAL)
-            self.block_button.config(state=tk.NORMAL)
-            self.unblock_button.config(state=tk.NORMAL)
-            
-            # Reset progress bar for break
-            self.timer_progress['maximum'] = break_seconds
-            self.timer_progress['value'] = 0
-            
-            self.run_countdown(break_seconds, break_type)
-            
-            if self.is_timer_running:
-                self.settings.session_count += 1
-                self.session_label.config(text=f"SESSION NO:- {self.settings.session_count}")
-                self.update_session_indicators()
-                
-                # Reset progress bar for next focus session
-                self.timer_progress['maximum'] = total_seconds
-                self.timer_progress['value'] = 0
-                
-                # Show notification
-                if self.settings.desktop_notifications.get():
-                    show_notification("Focus Time", "Break is over. Time to focus!")
-                
-                # Play start sound
-                if self.settings.sound_notifications.get() and self.settings.start_sound_path.get():
-                    try:
-                        import pygame
-                        sound = pygame.mixer.Sound(self.settings.start_sound_path.get())
-                        sound.set_volume(0 if self.settings.is_muted.get() else self.settings.volume_level.get() / 100.0)
-                        sound.play()
-                    except Exception as e:
-                        print(f"Error playing start sound: {e}")
-                
-                # Resume background music for focus session
-                if self.settings.sound_notifications.get() and self.settings.background_music_path.get():
-                    try:
-                        import pygame
-                        pygame.mixer.music.load(self.settings.background_music_path.get())
-                        pygame.mixer.music.set_volume(0 if self.settings.is_muted.get() else self.settings.volume_level.get() / 100.0)
-                        pygame.mixer.music.play(-1)  # Loop indefinitely
-                    except Exception as e:
-                        print(f"Error playing background music: {e}")
-                
-                # Disable controls during focus based on strict mode
-                if self.settings.strict_mode.get():
-                    self.lock_button.config(state=tk.DISABLED)
-                    self.unlock_button.config(state=tk.DISABLED)
-                    self.block_button.config(state=tk.DISABLED)
-                    self.unblock_button.config(state=tk.DISABLED)
+    def on_phase_transition(self, completed_phase, next_phase):
+        """Handle the engine finishing one phase and starting the next"""
+        self.settings.session_count = self.engine.session_count
+        
+        # The next phase started exactly when the completed one ran out
+        end_time = (self.phase_started_at + self.phase_paused_seconds +
+                    self.engine.durations[completed_phase])
+        self.record_phase(completed_phase, end_time)
+        self.begin_phase_record(end_time)
+        
+        self.finish_countdown(completed_phase)
+        
+        if next_phase == FOCUS:
+            self.start_next_focus()
+        else:
+            self.start_break(next_phase)
+        
+        # The dialog runs a nested event loop, in which the session may be
+        # stopped, so it is only shown once this transition is complete
+        self.app.root.after_idle(self.show_time_up, completed_phase)
     
-    def run_countdown(self, seconds, phase_type="Focus"):
-        """Run the countdown timer"""
-        self.remaining_seconds = seconds
-        
-        while self.remaining_seconds > 0 and self.is_timer_running:
-            if not self.paused:
-                minutes, secs = divmod(int(self.remaining_seconds), 60)
-                time_text = f"{minutes:02d}:{secs:02d}"
-                self.time_display.config(text=time_text)
-                self.minimized_time_display.config(text=time_text)
-                self.minimized_session_label.config(text=f"SESSION NO:- {self.settings.session_count}")
-                self.minimized_phase_label.config(text=phase_type)
-                
-                # Update progress bar
-                self.timer_progress['value'] = self.timer_progress['maximum'] - self.remaining_seconds
-                
-                self.app.root.update()
-                time.sleep(1)  # Sleep for 1 second
-                self.remaining_seconds -= 1
-            else:
-                # When paused, just update UI and wait
-                self.app.root.update()
-                time.sleep(0.1)
+    def start_break(self, break_phase):
+        """Update the UI for the break that follows a completed focus period"""
+        break_type = PHASE_NAMES[break_phase]
+        break_seconds = self.engine.get_phase_seconds()
+        break_time = break_seconds // 60
+        
+        # Show notification
+        if self.settings.desktop_notifications.get():
+            show_notification("Break Time", f"Time for a {break_type.lower()}! ({break_time} minutes)")
+        
+        # Play end sound
+        self.play_cue("end")
+        
+        # Stop background music during break
+        self.app.sound_manager.stop_background_music()
+        
+        # Enable controls during break
+        self.lock_button.config(state=tk.NORMAL)
+        self.unlock_button.config(state=tk.NORMAL)
+        self.block_button.config(state=tk.NORMAL)
+        self.unblock_button.config(state=tk.NORMAL)
+        
+        # Reset progress bar for break
+        self.timer_progress['maximum'] = break_seconds
+        self.timer_progress['value'] = 0
+    
+    def start_next_focus(self):
+        """Update the UI for the next focus period once a break has finished"""
+        total_seconds = self.engine.get_phase_seconds()
         
-        # Ensure we display exactly 00:00 at the end
-        if self.is_timer_running and not self.paused:
-            self.time_display.config(text="00:00")
-            self.timer_progress['value'] = self.timer_progress['maximum']
+        self.session_label.config(text=f"SESSION NO:- {self.settings.session_count}")
+        self.update_session_indicators()
+        
+        # Reset progress bar for next focus session
+        self.timer_progress['maximum'] = total_seconds
+        self.timer_progress['value'] = 0
+        
+        # Show notification
+        if self.settings.desktop_notifications.get():
+            show_notification("Focus Time", "Break is over. Time to focus!")
+        
+        # Play start sound
+        self.play_cue("start")
+        
+        # Resume background music for focus session
+        self.play_background_music()
+        
+        # Disable controls during focus based on strict mode
+        if self.settings.strict_mode.get():
+            self.lock_button.config(state=tk.DISABLED)
+            self.unlock_button.config(state=tk.DISABLED)
+            self.block_button.config(state=tk.DISABLED)
+            self.unblock_button.config(state=tk.DISABLED)
+    
+    def tick_countdown(self):
+        """Advance the engine, repaint if the displayed second changed and reschedule"""
+        self.countdown_job = None
+        if not self.is_timer_running or self.engine is None:
+            return
+        
+        # Fires on_phase_transition for every phase that has ended
+        self.engine.update()
+        if not self.is_timer_running or self.engine is None:
+            return
+        
+        remaining = self.engine.get_remaining_time()
+        if remaining != self.displayed_seconds:
+            self.displayed_seconds = remaining
+            self.remaining_seconds = remaining
             
-            # Play end sound
-            if self.settings.sound_notifications.get() and self.settings.end_sound_path.get():
-                try:
-                    import pygame
-                    sound = pygame.mixer.Sound(self.settings.end_sound_path.get())
-                    sound.set_volume(0 if self.settings.is_muted.get() else self.settings.volume_level.get() / 100.0)
-                    sound.play()
-                except Exception as e:
-                    print(f"Error playing end sound: {e}")
+            minutes, secs = divmod(remaining, 60)
+            time_text = f"{minutes:02d}:{secs:02d}"
+            self.time_display.config(text=time_text)
+            self.minimized_time_display.config(text=time_text)
+            self.minimized_session_label.config(text=f"SESSION NO:- {self.settings.session_count}")
+            self.minimized_phase_label.config(text=PHASE_NAMES[self.engine.phase])
             
-            self.app.root.attributes('-topmost', True)
-            messagebox.showinfo("Time's up!", f"The {phase_type.lower()} timer has finished.")
-            self.app.root.attributes('-topmost', False)
+            # Update progress bar
+            self.timer_progress['value'] = self.timer_progress['maximum'] - remaining
+        
+        delay = self.engine.get_delay_to_next_second()
+        if delay is not None:
+            # Wake up just after the displayed second changes
+            self.countdown_job = self.app.root.after(int(delay * 1000) + 1, self.tick_countdown)
+    
+    def cancel_countdown_tick(self):
+        """Cancel the pending countdown tick, if any"""
+        if self.countdown_job is not None:
+            self.app.root.after_cancel(self.countdown_job)
+            self.countdown_job = None
+    
+    def play_cue(self, cue):
+        """Play the start or end chime from the sound bank, if enabled"""
+        if not self.settings.sound_notifications.get():
+            return
+        if cue == "start":
+            sound_path = self.settings.start_sound_path.get()
+        else:
+            sound_path = self.settings.end_sound_path.get()
+        self.app.sound_manager.play_sound(sound_path, channel=cue)
+    
+    def play_background_music(self):
+        """Start the looping background music, if enabled"""
+        if self.settings.sound_notifications.get() and self.settings.background_music_path.get():
+            self.app.sound_manager.play_background_music(self.settings.background_music_path.get())
+    
+    def finish_countdown(self, phase):
+        """Handle the end of a phase countdown"""
+        # Ensure we display exactly 00:00 at the end
+        self.time_display.config(text="00:00")
+        self.timer_progress['value'] = self.timer_progress['maximum']
+        
+        # Play end sound
+        self.play_cue("end")
+    
+    def show_time_up(self, phase):
+        """Tell the user a phase has finished"""
+        self.app.root.attributes('-topmost', True)
+        messagebox.showinfo("Time's up!", f"The {PHASE_NAMES[phase].lower()} timer has finished.")
+        self.app.root.attributes('-topmost', False)
     
     # App and website blocking methods
     def lock_app(self):
@@ -910,7 +961,8 @@ class TimerTab:
         if app and app not in self.settings.locked_apps:
             self.settings.locked_apps.append(app)
             self.locked_apps_list.insert(tk.END, app)
-            block_application(app)
+            self.app_matcher.update(self.settings.locked_apps)
+            block_application(app, self.get_process_index())
             self.settings.save_settings()
 
     def add_custom_app(self):
@@ -928,6 +980,7 @@ class TimerTab:
         if selection:
             app = self.locked_apps_list.get(selection)
             self.settings.locked_apps.remove(app)
+            self.app_matcher.update(self.settings.locked_apps)
             self.locked_apps_list.delete(selection)
             unblock_application(app)
             self.settings.save_settings()
@@ -935,6 +988,7 @@ class TimerTab:
     def unlock_all_apps(self):
         """Unlock all locked applications"""
         self.settings.locked_apps.clear()
+        self.app_matcher.update(self.settings.locked_apps)
         self.locked_apps_list.delete(0, tk.END)
         self.settings.save_settings()
     
@@ -968,23 +1022,140 @@ class TimerTab:
     
     def unblock_all_websites(self):
         """Unblock all blocked websites"""
-        hosts_path = get_hosts_path()
         try:
-            with open(hosts_path, 'r') as hosts_file:
-                lines = hosts_file.readlines()
-            
-            with open(hosts_path, 'w') as hosts_file:
-                for line in lines:
-                    if not any(site in line for site in self.settings.blocked_websites):
-                        hosts_file.write(line)
-            
-            self.settings.blocked_websites.clear()
-            self.blocked_sites_list.delete(0, tk.END)
-            self.settings.save_settings()
+            if unblock_all_websites(self.settings.blocked_websites):
+                self.settings.blocked_websites.clear()
+                self.blocked_sites_list.delete(0, tk.END)
+                self.settings.save_settings()
         except PermissionError:
             messagebox.showwarning("Permission Error", 
                                  "Need admin privileges to unblock websites.\n\nTry running the application as administrator.")
     
+    def apply_blocking_backend(self):
+        """
+        Switch website blocking to the backend chosen in the settings
+        
+        The blocked websites and imported blocklists are moved to the new
+        backend.  If the DNS sinkhole cannot listen on its port the current
+        backend is kept.
+        
+        Returns:
+            bool: True if the backend was switched
+        """
+        current = get_blocking_backend()
+        if self.settings.blocking_backend.get() == "dns":
+            try:
+                port = int(self.settings.dns_port.get())
+            except ValueError:
+                port = DEFAULT_PORT
+            if current.name == "dns" and current.sinkhole.port == port:
+                return False
+            backend = DnsSinkholeBackend(DnsSinkhole(port=port))
+            try:
+                backend.sinkhole.start()
+            except OSError as e:
+                print(f"Error starting DNS sinkhole on port {port}: {e}")
+                self.settings.blocking_backend.set(current.name)
+                messagebox.showwarning("DNS Sinkhole",
+                                     f"Could not listen on port {port}: {e}\n\n"
+                                     f"Website blocking keeps using the {current.name} backend.")
+                return False
+        elif current.name == "hosts":
+            return False
+        else:
+            backend = None
+        
+        sites = list(self.settings.blocked_websites)
+        try:
+            if sites:
+                unblock_all_websites(sites)
+            current.unblock_lists()
+            current.close()
+            set_blocking_backend(backend)
+            if sites:
+                block_websites(sites)
+        except PermissionError:
+            messagebox.showwarning("Permission Error", 
+                                 "Need admin privileges to change how websites are blocked.\n\nTry running the application as administrator.")
+            if get_blocking_backend() is current:
+                # The old blocks could not be removed, so keep using them
+                if backend is not None:
+                    backend.close()
+                self.settings.blocking_backend.set(current.name)
+                return False
+        self.load_blocklists(self.settings.imported_blocklists)
+        return True
+    
+    def import_blocklist(self):
+        """Import a hosts, AdBlock or plain domain blocklist in the background"""
+        from tkinter import filedialog
+        
+        filename = filedialog.askopenfilename(
+            filetypes=[("Blocklists", "*.txt *.hosts *.list"), ("All files", "*.*")],
+            title="Import Blocklist"
+        )
+        if filename:
+            self.load_blocklists([filename], report=True)
+    
+    def load_blocklists(self, paths, report=False):
+        """
+        Block the domains of blocklist files in the background
+        
+        Each list stays a CompactBlocklist inside the blocking backend.
+        
+        Args:
+            paths: Blocklist files to import
+            report: Whether to show the result and remember the file, for a
+                list the user just picked
+        """
+        paths = list(paths)
+        if not paths:
+            return
+        result = {}
+        
+        def work():
+            for path in paths:
+                try:
+                    blocklist = load_blocklist_file(path)
+                    get_blocking_backend().block_list(blocklist)
+                    result['count'] = result.get('count', 0) + len(blocklist)
+                except Exception as e:
+                    print(f"Error importing blocklist {path}: {e}")
+                    result['error'] = e
+        
+        def check():
+            if worker.is_alive():
+                self.frame.after(100, check)
+            elif not report:
+                return
+            elif isinstance(result.get('error'), PermissionError):
+                messagebox.showwarning("Permission Error", 
+                                     "Need admin privileges to block websites.\n\nTry running the application as administrator.")
+            elif 'error' in result:
+                messagebox.showerror("Import Error", f"Failed to import blocklist: {result['error']}")
+            else:
+                # Remembered so the list is blocked again on the next start
+                for path in paths:
+                    if path not in self.settings.imported_blocklists:
+                        self.settings.imported_blocklists.append(path)
+                self.settings.save_settings()
+                messagebox.showinfo("Import", f"Blocked {result['count']:,} domains from the list.")
+        
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        check()
+    
+    def clear_blocklists(self):
+        """Stop blocking every imported blocklist"""
+        try:
+            get_blocking_backend().unblock_lists()
+        except PermissionError:
+            messagebox.showwarning("Permission Error", 
+                                 "Need admin privileges to unblock websites.\n\nTry running the application as administrator.")
+            return
+        self.settings.imported_blocklists.clear()
+        self.settings.save_settings()
+    
     # Task management methods
     def add_task(self):
         """Add a task to the to-do list"""
@@ -1074,15 +1245,17 @@ class TimerTab:
         # Get calendar for current month
         cal = calendar.monthcalendar(self.calendar_date.year, self.calendar_date.month)
         
-        # Highlight days with completed study sessions
-        study_days = self.get_study_days()
+        # Highlight days with completed study sessions (index day - 1)
+        first_of_month = self.calendar_date.replace(day=1)
+        days_in_month = calendar.monthrange(first_of_month.year, first_of_month.month)[1]
+        month_times = self.settings.statistics.get_days_time(first_of_month, days_in_month)
         today = datetime.now().date()
         
         for week_num, week in enumerate(cal):
             for day_num, day in enumerate(week):
                 if day != 0:
                     # Check if this day had study session
-                    day_str = f"{self.calendar_date.year}-{self.calendar_date.month:02d}-{day:02d}"
+                    study_time = month_times[day - 1]
                     
                     # Check if this is today
                     is_today = (day == today.day and 
@@ -1092,7 +1265,7 @@ class TimerTab:
                     if is_today:
                         bg_color = self.settings.colors['accent']
                         fg_color = self.settings.colors['text']
-                    elif day_str in study_days:
+                    elif study_time:
                         bg_color = self.settings.colors['button']
                         fg_color = self.settings.colors['text']
                     else:
@@ -1107,8 +1280,7 @@ class TimerTab:
                     day_label.grid(row=week_num, column=day_num, padx=1, pady=1)
                     
                     # Add tooltip for study time on this day
-                    if day_str in study_days:
-                        study_time = self.settings.daily_stats.get(day_str, 0)
+                    if study_time:
                         hours, remainder = divmod(study_time, 3600)
                         minutes = remainder // 60
                         self.create_tooltip(day_label, f"Study time: {hours}h {minutes}m")
@@ -1138,17 +1310,34 @@ class TimerTab:
     
     def get_study_days(self):
         """Return list of days with completed study sessions"""
-        return list(self.settings.daily_stats.keys())
+        return self.settings.statistics.get_study_days()
     
     # Statistics methods
-    def update_daily_stats(self, session_time):
-        """Update daily statistics with completed session time"""
-        today = datetime.now().date().strftime("%Y-%m-%d")
-        
-        if today in self.settings.daily_stats:
-            self.settings.daily_stats[today] += session_time
-        else:
-            self.settings.daily_stats[today] = session_time
+    def begin_phase_record(self, started_at):
+        """Start tracking a new phase for the session log"""
+        self.phase_started_at = started_at
+        self.phase_paused_seconds = 0.0
+        self.phase_interruptions = 0
+    
+    def get_current_task(self):
+        """Return the to-do item selected while studying, if any"""
+        selection = self.todo_listbox.curselection()
+        if not selection:
+            return None
+        return self.todo_listbox.get(selection[0])
+    
+    def record_phase(self, phase, end_time):
+        """Append a phase to the session log and update the statistics"""
+        if self.phase_started_at is None:
+            return
+        
+        self.settings.record_session(self.phase_started_at, end_time, phase,
+                                     task=self.get_current_task(),
+                                     interruptions=self.phase_interruptions,
+                                     paused=self.phase_paused_seconds)
+        self.phase_started_at = None
+        if phase != FOCUS:
+            return
         
         # Update streak info
         self.calculate_streak()
@@ -1158,18 +1347,7 @@ class TimerTab:
     
     def calculate_streak(self):
         """Calculate the current study streak"""
-        today = datetime.now().date()
-        streak = 0
-        current_date = today
-        
-        # Count backwards from today
-        while True:
-            date_str = current_date.strftime("%Y-%m-%d")
-            if date_str in self.settings.daily_stats and self.settings.daily_stats[date_str] >= 10 * 60:  # At least 10 minutes
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
+        streak = self.settings.statistics.get_streak_days()
         
         # Update streak display
         self.streak_label.config(text=f"Current Streak: {streak} days")
@@ -1206,22 +1384,20 @@ class TimerTab:
         return f"{now.strftime('%d %b %Y')}\n{now.strftime('%I:%M %p')}"
     
     def start_monitoring(self):
-        """Start the app monitoring thread"""
-        self.monitor_thread = threading.Thread(target=self.monitor_apps, daemon=True)
-        self.monitor_thread.start()
+        """Create the process watcher that enforces locked apps"""
+        self.app_matcher = AppMatcher(self.settings.locked_apps)
+        self.process_watcher = ProcessWatcher(self.monitor_apps, on_exit=self.app_matcher.forget)
+    
+    def get_process_index(self):
+        """Get the watcher's PID index, or None to list processes directly"""
+        if self.process_watcher.is_running:
+            return self.process_watcher.snapshot()
+        return None
     
-    def monitor_apps(self):
-        """Monitor and block apps that should be locked"""
-        while True:
-            if self.is_timer_running and not self.paused and self.settings.locked_apps:
-                for proc in psutil.process_iter(['name']):
-                    try:
-                        for app in self.settings.locked_apps:
-                            if app.lower() in proc.info['name'].lower():
-                                proc.kill()
-                    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                        pass
-            time.sleep(1)
+    def monitor_apps(self, pid, name):
+        """Kill a newly seen process if it belongs to a locked app"""
+        if self.is_timer_running and not self.paused and self.app_matcher.match_pid(pid, name):
+            terminate_processes([pid])
     
     def adjust_layout_for_size(self, width, height):
         """Adjust layout based on window dimensions"""
@@ -0,0 +1,184 @@
+"""
+Shared image cache for Study Timer Pro
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+class ImageCache:
+    """
+    Decoded images and thumbnails shared by every widget
+    
+    Entries are keyed by (kind, path, mtime, size), so an edited file is a
+    miss and its old entries are dropped.  Full images, resized thumbnails
+    and Tk photos of those thumbnails are kept in one LRU bounded by an
+    estimate of their memory use (width x height x bytes per pixel).
+    Thumbnails of JPEG files are decoded with Image.draft(), which lets the
+    decoder scale down by up to 8x before the final resize.
+    """
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Initialize the cache
+        
+        Args:
+            max_bytes: Memory the cached images may use
+        """
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (value, bytes)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+    
+    def get_image(self, path):
+        """
+        Get a whole image, decoded once
+        
+        Args:
+            path: Image file
+        
+        Returns:
+            PIL.Image.Image: The decoded image (shared; do not modify it)
+        """
+        return self._get('image', path, None, self._load_image)
+    
+    def get_thumbnail(self, path, size):
+        """
+        Get an image resized to an exact size
+        
+        Args:
+            path: Image file
+            size: (width, height) in pixels
+        
+        Returns:
+            PIL.Image.Image: The resized image (shared; do not modify it)
+        """
+        return self._get('thumbnail', path, tuple(size), self._load_thumbnail)
+    
+    def get_photo(self, path, size=None):
+        """
+        Get a Tk photo of an image, resized if a size is given
+        
+        Must be called from the Tk thread.
+        
+        Args:
+            path: Image file
+            size: (width, height) in pixels, or None for the original size
+        
+        Returns:
+            ImageTk.PhotoImage: The photo (keep a reference while it is shown)
+        """
+        size = tuple(size) if size is not None else None
+        return self._get('photo', path, size, self._load_photo)
+    
+    def invalidate(self, path=None):
+        """
+        Drop the entries of one file, or of every file
+        
+        Args:
+            path: Image file, or None to empty the cache
+        """
+        with self.lock:
+            for key in [key for key in self.entries if path is None or key[1] == path]:
+                self._remove(key)
+    
+    def get_stats(self):
+        """
+        Get the cache counters
+        
+        Returns:
+            dict: hits, misses, evictions, entries and bytes
+        """
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self.entries), 'bytes': self.total_bytes}
+    
+    def _get(self, kind, path, size, load):
+        """Look an entry up, loading and storing it on a miss"""
+        mtime = os.path.getmtime(path)
+        key = (kind, path, mtime, size)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            # Entries of an older version of the file are stale
+            for stale in [stale for stale in self.entries if stale[1] == path and stale[2] != mtime]:
+                self._remove(stale)
+        
+        value, nbytes = load(path, size)
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+        return value
+    
+    def _remove(self, key):
+        """Remove one entry (lock held)"""
+        value, nbytes = self.entries.pop(key)
+        self.total_bytes -= nbytes
+    
+    def _load_image(self, path, size):
+        """Decode a whole image"""
+        from PIL import Image
+        
+        with Image.open(path) as image:
+            image.load()
+            image = image.copy() if image.mode in ('RGB', 'RGBA', 'L') else image.convert('RGBA')
+        return image, self._size_of(image)
+    
+    def _load_thumbnail(self, path, size):
+        """Decode and resize an image, using the JPEG draft mode and a cached original"""
+        from PIL import Image
+        
+        with self.lock:
+            cached = [value for key, (value, _) in self.entries.items()
+                      if key[0] == 'image' and key[1] == path]
+        if cached:
+            source = cached[-1]
+            thumbnail = source.resize(size, Image.LANCZOS, reducing_gap=3.0)
+        else:
+            with Image.open(path) as image:
+                if image.format == 'JPEG':
+                    image.draft('RGB', size)
+                if image.mode not in ('RGB', 'RGBA', 'L'):
+                    image = image.convert('RGBA')
+                thumbnail = image.resize(size, Image.LANCZOS, reducing_gap=3.0)
+        return thumbnail, self._size_of(thumbnail)
+    
+    def _load_photo(self, path, size):
+        """Make a Tk photo of a whole image or a thumbnail"""
+        from PIL import ImageTk
+        
+        image = self.get_image(path) if size is None else self.get_thumbnail(path, size)
+        return ImageTk.PhotoImage(image), self._size_of(image)
+    
+    @staticmethod
+    def _size_of(image):
+        """Estimated bytes used by an image"""
+        return image.width * image.height * len(image.getbands())
+
+_default_image_cache = None
+_default_image_cache_lock = threading.Lock()
+
+def get_default_image_cache():
+    """
+    Get the image cache shared by the whole application
+    
+    Returns:
+        ImageCache: The shared cache, created on first use
+    """
+    global _default_image_cache
+    with _default_image_cache_lock:
+        if _default_image_cache is None:
+            _default_image_cache = ImageCache()
+        return _default_image_cache
@@ -0,0 +1,169 @@
+"""
+Remote image download cache for Study Timer Pro
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from io import BytesIO
+
+# Default study image shown when no custom image is set
+STUDY_IMAGE_URL = "https://hebbkx1anhila5yf.public.blob.vercel-storage.com/Post2-tZfCun4BBdFUBdGHLDq3XeBP2UHwFc.png"
+IMAGE_CACHE_DIR = "image_cache"
+
+class RemoteImageCache:
+    """
+    Downloaded images, resized and kept on disk
+    
+    Each image is stored already decoded and resized as a PNG named after
+    its URL, size and ETag, so showing it again never touches the network
+    or the original file.  refresh() does the network part and is meant to
+    run on a background thread: it revalidates with the cached ETag
+    (If-None-Match) or Last-Modified date (If-Modified-Since), has a timeout
+    and at most checks a URL once per `refresh_interval`.
+    """
+    
+    def __init__(self, cache_dir=IMAGE_CACHE_DIR, timeout=5.0, refresh_interval=24 * 3600,
+                 session=None):
+        """
+        Initialize the cache
+        
+        Args:
+            cache_dir: Directory holding the images and their metadata
+            timeout: Seconds to wait for the server (connect and read)
+            refresh_interval: Seconds before a cached image is checked again
+            session: requests.Session to use (a new one by default)
+        """
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self.session = session
+    
+    def get_cached_path(self, url, size):
+        """
+        Get the cached image for a URL and size without any network access
+        
+        Args:
+            url: Image URL
+            size: (width, height) the image was resized to
+        
+        Returns:
+            str: Path of the PNG, or None if it has not been downloaded
+        """
+        path = self._load_meta(url, size).get('file')
+        if path:
+            path = os.path.join(self.cache_dir, path)
+            if os.path.exists(path):
+                return path
+        return None
+    
+    def needs_refresh(self, url, size):
+        """
+        Whether the URL is due to be checked again
+        
+        Args:
+            url: Image URL
+            size: (width, height) of the cached image
+        
+        Returns:
+            bool: True if there is no cached image or it was checked long ago
+        """
+        meta = self._load_meta(url, size)
+        if self.get_cached_path(url, size) is None:
+            return True
+        return time.time() - meta.get('checked_at', 0) >= self.refresh_interval
+    
+    def refresh(self, url, size):
+        """
+        Download the image if it changed and store it resized
+        
+        Blocks for up to `timeout` seconds, so call it from a worker thread.
+        
+        Args:
+            url: Image URL
+            size: (width, height) to resize to
+        
+        Returns:
+            str: Path of the new PNG, or None if the cached one is still
+                current or the download failed
+        """
+        import requests
+        from PIL import Image
+        
+        meta = self._load_meta(url, size)
+        headers = {}
+        if self.get_cached_path(url, size):
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        
+        try:
+            if self.session is not None:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            else:
+                with requests.Session() as session:
+                    response = session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                meta['checked_at'] = time.time()
+                self._save_meta(url, size, meta)
+                return None
+            response.raise_for_status()
+            
+            etag = response.headers.get('ETag', '')
+            last_modified = response.headers.get('Last-Modified', '')
+            image = Image.open(BytesIO(response.content))
+            image = image.convert('RGBA').resize(tuple(size), Image.LANCZOS)
+        except Exception as e:
+            print(f"Error downloading image: {e}")
+            return None
+        
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file_name = self._key(url, tuple(size), etag, last_modified) + ".png"
+        path = os.path.join(self.cache_dir, file_name)
+        self._write_atomic(path, 'wb', lambda temp_file: image.save(temp_file, format='PNG'))
+        
+        old_file = meta.get('file')
+        self._save_meta(url, size, {'url': url, 'size': list(size), 'etag': etag,
+                                    'last_modified': last_modified, 'file': file_name,
+                                    'checked_at': time.time()})
+        if old_file and old_file != file_name and os.path.exists(os.path.join(self.cache_dir, old_file)):
+            os.remove(os.path.join(self.cache_dir, old_file))
+        return path
+    
+    def _key(self, *parts):
+        """Stable file name for the given key parts"""
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+    
+    def _meta_path(self, url, size):
+        """Metadata file of a URL and size"""
+        return os.path.join(self.cache_dir, self._key(url, tuple(size)) + ".json")
+    
+    def _load_meta(self, url, size):
+        """Read the metadata of a URL and size ({} if there is none)"""
+        try:
+            with open(self._meta_path(url, size), 'r') as meta_file:
+                return json.load(meta_file)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_meta(self, url, size, meta):
+        """Write the metadata of a URL and size"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._write_atomic(self._meta_path(url, size), 'w',
+                           lambda meta_file: json.dump(meta, meta_file))
+    
+    def _write_atomic(self, path, mode, write):
+        """Write a file through a temp file and rename, so readers never see a partial one"""
+        fd, temp_path = tempfile.mkstemp(prefix=".image-", suffix=os.path.splitext(path)[1],
+                                         dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, mode) as temp_file:
+                write(temp_file)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
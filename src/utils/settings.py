@@ -6,14 +6,33 @@ import os
 import json
 import tkinter as tk
 import random
+from core.dns_sinkhole import DEFAULT_PORT
+from core.persistence import WriteBehind, write_json_atomic
+from core.pomodoro import FOCUS
+from core.session_log import SessionLog
+from core.statistics import StatisticsManager
+from core.storage import SqliteStore, SqliteSessionLog, migrate_json_file
+
+DATA_FILE = 'study_timer_data.json'
+SESSION_LOG_FILE = 'study_sessions.ndjson'
+DATABASE_FILE = 'study_timer_data.db'
+
+# Seconds without changes before settings are written
+SAVE_DELAY = 0.5
 
 class Settings:
     """
     Manages application settings and state
     """
     
-    def __init__(self):
-        """Initialize settings with default values"""
+    def __init__(self, storage=None):
+        """
+        Initialize settings with default values
+        
+        Args:
+            storage: "json" or "sqlite"; by default the STUDY_TIMER_STORAGE
+                environment variable, else "sqlite" if the database exists
+        """
         # Timer settings
         self.focus_time = tk.StringVar(value="25")
         self.short_break = tk.StringVar(value="5")
@@ -24,14 +43,27 @@ class Settings:
         self.session_count = 1
         self.locked_apps = []
         self.blocked_websites = []
+        self.imported_blocklists = []  # Paths of imported blocklist files
         self.todo_list = []
         self.completed_tasks = []
-        self.daily_stats = {}
+        self.statistics = StatisticsManager()
+        
+        # Totals saved before the session log existed; daily_stats adds the log on top
+        self.legacy_daily_stats = {}
+        self.store = None
+        self.session_log = None
+        self.open_storage(storage)
+        self.writer = WriteBehind(self.write_data, delay=SAVE_DELAY)
         
         # App blocking settings
         self.strict_mode = tk.BooleanVar(value=False)
         self.auto_block = tk.BooleanVar(value=False)
         
+        # Website blocking settings ("hosts" edits the hosts file, "dns" runs
+        # the local DNS sinkhole on dns_port)
+        self.blocking_backend = tk.StringVar(value="hosts")
+        self.dns_port = tk.StringVar(value=str(DEFAULT_PORT))
+        
         # Notification settings
         self.desktop_notifications = tk.BooleanVar(value=True)
         self.sound_notifications = tk.BooleanVar(value=True)
@@ -132,14 +164,37 @@ class Settings:
             "Education is the passport to the future, for tomorrow belongs to those who prepare for it today. – Malcolm X"
         ]
     
-    def save_settings(self):
-        """Save settings to a JSON file"""
-        data = {
-            'todo_list': self.todo_list,
-            'locked_apps': self.locked_apps,
-            'blocked_websites': self.blocked_websites,
-            'completed_tasks': self.completed_tasks,
-            'daily_stats': self.daily_stats,
+    @property
+    def daily_stats(self):
+        """Seconds studied per "YYYY-MM-DD" day, built from statistics for exporting"""
+        return self.statistics.daily_stats
+    
+    def open_storage(self, storage=None):
+        """Open the JSON files or the SQLite database the data is kept in"""
+        if storage is None:
+            storage = os.environ.get('STUDY_TIMER_STORAGE')
+        if storage is None:
+            storage = 'sqlite' if os.path.exists(DATABASE_FILE) else 'json'
+        
+        if storage == 'sqlite':
+            try:
+                self.store = SqliteStore(DATABASE_FILE)
+                self.session_log = SqliteSessionLog(self.store)
+                return
+            except Exception as e:
+                print(f"Error opening database, using {DATA_FILE}: {e}")
+                self.store = None
+        self.session_log = SessionLog(SESSION_LOG_FILE)
+    
+    def get_data(self):
+        """Collect everything that is saved between runs (copied, so it can be written later)"""
+        return {
+            'todo_list': list(self.todo_list),
+            'locked_apps': list(self.locked_apps),
+            'blocked_websites': list(self.blocked_websites),
+            'imported_blocklists': list(self.imported_blocklists),
+            'completed_tasks': list(self.completed_tasks),
+            'daily_stats': dict(self.legacy_daily_stats),
             'focus_time': self.focus_time.get(),
             'short_break': self.short_break.get(),
             'long_break': self.long_break.get(),
@@ -148,6 +203,8 @@ class Settings:
             'streak_goal': self.streak_goal_var.get(),
             'strict_mode': self.strict_mode.get(),
             'auto_block': self.auto_block.get(),
+            'blocking_backend': self.blocking_backend.get(),
+            'dns_port': self.dns_port.get(),
             'desktop_notifications': self.desktop_notifications.get(),
             'sound_notifications': self.sound_notifications.get(),
             'theme': self.current_theme,
@@ -162,31 +219,59 @@ class Settings:
             'is_muted': self.is_muted.get(),
             'session_count': self.session_count
         }
+    
+    def save_settings(self):
+        """
+        Save settings in the background
+        
+        Changes made in quick succession are written together once they
+        stop; call flush_settings() to write immediately.
+        """
+        self.writer.mark_dirty(self.get_data())
+    
+    def flush_settings(self):
+        """Write any unsaved settings now"""
+        return self.writer.flush()
+    
+    def write_data(self, data):
+        """Write data to the database, or else to a JSON file"""
         try:
-            with open('study_timer_data.json', 'w') as f:
-                json.dump(data, f)
+            if self.store:
+                self.store.save(data)
+            else:
+                write_json_atomic(DATA_FILE, data)
         except Exception as e:
             print(f"Error saving data: {e}")
     
     def load_settings(self):
-        """Load settings from a JSON file"""
+        """Load settings from the database, or else from a JSON file"""
         try:
-            if not os.path.exists('study_timer_data.json'):
+            if self.store:
+                # One-shot import of the JSON files the first time the database is used
+                if migrate_json_file(self.store, DATA_FILE, SESSION_LOG_FILE):
+                    print(f"Migrated {DATA_FILE} to {DATABASE_FILE}")
+                data = self.store.load()
+            elif os.path.exists(DATA_FILE):
+                with open(DATA_FILE, 'r') as f:
+                    data = json.load(f)
+            else:
+                self.load_session_log()
                 return
                 
-            with open('study_timer_data.json', 'r') as f:
-                data = json.load(f)
-                
             self.todo_list = data.get('todo_list', [])
             self.locked_apps = data.get('locked_apps', [])
             self.blocked_websites = data.get('blocked_websites', [])
+            self.imported_blocklists = data.get('imported_blocklists', [])
             self.completed_tasks = data.get('completed_tasks', [])
-            self.daily_stats = data.get('daily_stats', {})
+            self.legacy_daily_stats = data.get('daily_stats', {})
             self.session_count = data.get('session_count', 1)
             
             # Convert string keys back to dictionary keys
-            if isinstance(self.daily_stats, dict):
-                self.daily_stats = {str(k): v for k, v in self.daily_stats.items()}
+            if isinstance(self.legacy_daily_stats, dict):
+                self.legacy_daily_stats = {str(k): v for k, v in self.legacy_daily_stats.items()}
+            else:
+                self.legacy_daily_stats = {}
+            self.load_session_log()
             
             # Load settings
             self.focus_time.set(data.get('focus_time', '25'))
@@ -197,6 +282,8 @@ class Settings:
             self.streak_goal_var.set(data.get('streak_goal', '7'))
             self.strict_mode.set(data.get('strict_mode', False))
             self.auto_block.set(data.get('auto_block', False))
+            self.blocking_backend.set(data.get('blocking_backend', 'hosts'))
+            self.dns_port.set(data.get('dns_port', str(DEFAULT_PORT)))
             self.desktop_notifications.set(data.get('desktop_notifications', True))
             self.sound_notifications.set(data.get('sound_notifications', True))
             
@@ -225,6 +312,59 @@ class Settings:
         except Exception as e:
             print(f"Error loading data: {e}")
     
+    def load_session_log(self):
+        """Load the session log and rebuild daily_stats from it"""
+        try:
+            self.session_log.load()
+        except Exception as e:
+            print(f"Error loading session log: {e}")
+        
+        daily_stats = dict(self.legacy_daily_stats)
+        for day, seconds in self.session_log.get_daily_totals().items():
+            daily_stats[day] = daily_stats.get(day, 0) + seconds
+        self.statistics.load(daily_stats)
+    
+    def record_session(self, start, end, phase=FOCUS, task=None, interruptions=0, paused=0.0):
+        """
+        Append a finished phase to the session log and update daily_stats
+        
+        Args:
+            start: Timestamp the phase started at
+            end: Timestamp the phase ended at
+            phase: Phase name
+            task: Task worked on, if any
+            interruptions: Number of times the phase was paused
+            paused: Seconds the phase spent paused
+        
+        Returns:
+            int: Active seconds added to the statistics
+        """
+        try:
+            record = self.session_log.append(start, end, phase, task, interruptions, paused)
+        except Exception as e:
+            print(f"Error recording session: {e}")
+            return 0
+        
+        if phase != FOCUS:
+            return 0
+        
+        added = {}
+        for hour, seconds in self.session_log.split_by_hour(record):
+            day = hour.date()
+            added[day] = added.get(day, 0) + seconds
+        for day, seconds in added.items():
+            self.statistics.add_session_time(int(round(seconds)), day)
+        return int(round(self.session_log.get_active_seconds(record)))
+    
+    def reset_statistics(self):
+        """Clear the daily statistics and the session log"""
+        self.statistics.reset_statistics()
+        self.legacy_daily_stats = {}
+        try:
+            self.session_log.clear()
+        except Exception as e:
+            print(f"Error clearing session log: {e}")
+    
     def export_settings(self, filename):
         """Export settings to a JSON file"""
         settings = {
@@ -236,6 +376,8 @@ class Settings:
             'streak_goal': self.streak_goal_var.get(),
             'strict_mode': self.strict_mode.get(),
             'auto_block': self.auto_block.get(),
+            'blocking_backend': self.blocking_backend.get(),
+            'dns_port': self.dns_port.get(),
             'desktop_notifications': self.desktop_notifications.get(),
             'sound_notifications': self.sound_notifications.get(),
             'theme': self.current_theme,
@@ -264,7 +406,8 @@ class Settings:
             # Only import settings, not statistics or tasks
             settings_keys = ['focus_time', 'short_break', 'long_break', 
                            'sessions_before_long_break', 'daily_goal', 
-                           'streak_goal', 'strict_mode', 'auto_block', 
+                           'streak_goal', 'strict_mode', 'auto_block',
+                           'blocking_backend', 'dns_port',
                            'desktop_notifications', 'sound_notifications', 'theme',
                            'start_sound_path', 'end_sound_path', 'background_music_path',
                            'background_image_path', 'custom_study_image', 'custom_app_icon',
@@ -288,6 +431,10 @@ class Settings:
                         self.strict_mode.set(data[key])
                     elif key == 'auto_block':
                         self.auto_block.set(data[key])
+                    elif key == 'blocking_backend':
+                        self.blocking_backend.set(data[key])
+                    elif key == 'dns_port':
+                        self.dns_port.set(data[key])
                     elif key == 'desktop_notifications':
                         self.desktop_notifications.set(data[key])
                     elif key == 'sound_notifications':
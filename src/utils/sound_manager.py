@@ -3,21 +3,76 @@ Sound management for Study Timer Pro
 """
 
 import os
-import pygame
+import sys
+import threading
+
+def get_mixer():
+    """
+    Get pygame.mixer, importing pygame and starting the mixer on first use
+    
+    Importing pygame and opening the audio device are slow, so this is only
+    called when a sound is actually about to play.
+    
+    Returns:
+        module: The initialised pygame.mixer module
+    """
+    import pygame
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    return pygame.mixer
+
+def get_running_mixer():
+    """
+    Get pygame.mixer only if it has already been started
+    
+    Returns:
+        module: pygame.mixer, or None when nothing has played yet (so there
+            is nothing to stop, pause or change the volume of)
+    """
+    pygame = sys.modules.get('pygame')
+    if pygame is None or not pygame.mixer.get_init():
+        return None
+    return pygame.mixer
+
+# Mixer channels kept for the chimes, so music and other sounds never take them
+CUE_CHANNELS = ('start', 'end', 'preview')
 
 class SoundManager:
     """
     Manages sound playback for the application
+    
+    Sound effects are decoded once into a bank keyed by (path, mtime) and
+    played from memory on their own reserved mixer channel, so a chime at a
+    phase boundary costs a Channel.play() rather than a file read and decode.
+    preload_async() fills the bank on a worker thread ahead of time.  Volume
+    and mute are kept here and applied to every cue and to the music.
     """
     
-    def __init__(self):
-        """Initialize the sound manager"""
-        # Initialize pygame mixer
-        pygame.mixer.init()
+    def __init__(self, volume=0.7, muted=False):
+        """
+        Initialize the sound manager
         
-        self.volume = 0.7  # Default volume (0.0 to 1.0)
-        self.muted = False
+        Args:
+            volume: Volume level (0.0 to 1.0)
+            muted: Whether sounds start muted
+        """
+        # The mixer is started by the first sound that plays or is preloaded
+        self.volume = max(0.0, min(1.0, volume))
+        self.muted = muted
         self.current_background_music = None
+        self.sounds = {}  # path -> (mtime, pygame.mixer.Sound)
+        self.channels = {}  # cue name -> reserved pygame.mixer.Channel
+        self.decode_count = 0
+        self.lock = threading.Lock()
+    
+    def get_volume(self):
+        """
+        Get the volume sounds are played at
+        
+        Returns:
+            float: 0 when muted, otherwise the volume level
+        """
+        return 0.0 if self.muted else self.volume
     
     def set_volume(self, volume):
         """
@@ -27,36 +82,116 @@ class SoundManager:
             volume: Volume level (0.0 to 1.0)
         """
         self.volume = max(0.0, min(1.0, volume))
-        if not self.muted:
-            pygame.mixer.music.set_volume(self.volume)
+        self.apply_volume()
     
     def mute(self):
         """Mute all sounds"""
         self.muted = True
-        pygame.mixer.music.set_volume(0)
+        self.apply_volume()
     
     def unmute(self):
         """Unmute all sounds"""
         self.muted = False
-        pygame.mixer.music.set_volume(self.volume)
+        self.apply_volume()
+    
+    def apply_volume(self):
+        """Apply the current volume to the music and the cue channels"""
+        mixer = get_running_mixer()
+        if mixer:
+            mixer.music.set_volume(self.get_volume())
+            for channel in self.channels.values():
+                channel.set_volume(self.get_volume())
+    
+    def get_sound(self, sound_path):
+        """
+        Get a decoded sound, reading the file only if it is new or changed
+        
+        Args:
+            sound_path: Path to the sound file
+        
+        Returns:
+            pygame.mixer.Sound: The decoded sound
+        """
+        mtime = os.path.getmtime(sound_path)
+        with self.lock:
+            entry = self.sounds.get(sound_path)
+            if entry is None or entry[0] != mtime:
+                entry = (mtime, get_mixer().Sound(sound_path))
+                self.sounds[sound_path] = entry
+                self.decode_count += 1
+            return entry[1]
+    
+    def preload(self, sound_paths):
+        """
+        Decode sounds into the bank so they are ready to play
+        
+        Args:
+            sound_paths: Paths of the sound files (empty or missing ones are
+                ignored)
+        """
+        for sound_path in sound_paths:
+            if not sound_path or not os.path.exists(sound_path):
+                continue
+            try:
+                self.get_sound(sound_path)
+            except Exception as e:
+                print(f"Error loading sound: {e}")
     
-    def play_sound(self, sound_path):
+    def preload_async(self, sound_paths):
+        """
+        Decode sounds into the bank on a worker thread
+        
+        Args:
+            sound_paths: Paths of the sound files
+        
+        Returns:
+            threading.Thread: The started worker
+        """
+        worker = threading.Thread(target=self.preload, args=(list(sound_paths),), daemon=True)
+        worker.start()
+        return worker
+    
+    def get_channel(self, name):
+        """
+        Get the reserved mixer channel of a cue
+        
+        Args:
+            name: One of CUE_CHANNELS
+        
+        Returns:
+            pygame.mixer.Channel: The channel
+        """
+        with self.lock:
+            if not self.channels:
+                mixer = get_mixer()
+                mixer.set_reserved(len(CUE_CHANNELS))
+                self.channels = {cue: mixer.Channel(index) for index, cue in enumerate(CUE_CHANNELS)}
+            return self.channels[name]
+    
+    def play_sound(self, sound_path, channel=None):
         """
         Play a sound effect
         
         Args:
             sound_path: Path to the sound file
+            channel: Name of the reserved channel to play it on (one of
+                CUE_CHANNELS), or None for any free channel
         
         Returns:
             bool: True if sound was played, False otherwise
         """
-        if not os.path.exists(sound_path):
+        if not sound_path or not os.path.exists(sound_path):
             return False
         
         try:
-            sound = pygame.mixer.Sound(sound_path)
-            sound.set_volume(0 if self.muted else self.volume)
-            sound.play()
+            sound = self.get_sound(sound_path)
+            if channel is None:
+                sound.set_volume(self.get_volume())
+                sound.play()
+            else:
+                cue_channel = self.get_channel(channel)
+                cue_channel.set_volume(self.get_volume())
+                cue_channel.play(sound)
             return True
         except Exception as e:
             print(f"Error playing sound: {e}")
@@ -77,17 +212,19 @@ class SoundManager:
             return False
         
         try:
+            mixer = get_mixer()
+            
             # Stop any currently playing music
-            pygame.mixer.music.stop()
+            mixer.music.stop()
             
             # Load and play the new music
-            pygame.mixer.music.load(music_path)
-            pygame.mixer.music.set_volume(0 if self.muted else self.volume)
+            mixer.music.load(music_path)
+            mixer.music.set_volume(self.get_volume())
             
             if loop:
-                pygame.mixer.music.play(-1)  # Loop indefinitely
+                mixer.music.play(-1)  # Loop indefinitely
             else:
-                pygame.mixer.music.play()
+                mixer.music.play()
             
             self.current_background_music = music_path
             return True
@@ -97,13 +234,19 @@ class SoundManager:
     
     def stop_background_music(self):
         """Stop the currently playing background music"""
-        pygame.mixer.music.stop()
+        mixer = get_running_mixer()
+        if mixer:
+            mixer.music.stop()
         self.current_background_music = None
     
     def pause_background_music(self):
         """Pause the currently playing background music"""
-        pygame.mixer.music.pause()
+        mixer = get_running_mixer()
+        if mixer:
+            mixer.music.pause()
     
     def resume_background_music(self):
         """Resume the paused background music"""
-        pygame.mixer.music.unpause()
\ No newline at end of file
+        mixer = get_running_mixer()
+        if mixer:
+            mixer.music.unpause()
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Tests for the NumPy analytics engine
+"""
+
+import unittest
+from datetime import date, datetime
+import numpy as np
+from src.core.analytics import AnalyticsEngine, minutes_from_records
+from src.core.statistics import StatisticsManager
+
+def record(start, end, phase="focus", paused=0.0):
+    """Build a session log record"""
+    return {'start': start.timestamp(), 'end': end.timestamp(), 'phase': phase,
+            'task': None, 'interruptions': 0, 'paused': paused}
+
+class TestAnalyticsEngine(unittest.TestCase):
+    """Test cases for the AnalyticsEngine class"""
+    
+    def setUp(self):
+        # Monday 2024-01-01 to Sunday 2024-02-04
+        self.statistics = StatisticsManager({
+            "2024-01-01": 600, "2024-01-02": 1200, "2024-01-07": 300,
+            "2024-01-31": 900, "2024-02-04": 60,
+        })
+        self.records = [
+            record(datetime(2024, 1, 1, 9, 50), datetime(2024, 1, 1, 10, 20)),
+            record(datetime(2024, 1, 2, 23, 30), datetime(2024, 1, 3, 0, 30), paused=1800),
+            record(datetime(2024, 1, 2, 10, 0), datetime(2024, 1, 2, 10, 5), phase="short_break"),
+        ]
+        self.engine = AnalyticsEngine.from_history(self.statistics, self.records)
+    
+    def test_daily_weekly_monthly(self):
+        """Test the day, week and month series"""
+        series = self.engine.get_daily_series(date(2023, 12, 31), 4)
+        self.assertEqual(series.tolist(), [0, 600, 1200, 0])
+        
+        mondays, weeks = self.engine.get_weekly_series()
+        self.assertEqual(mondays[0], date(2024, 1, 1).toordinal())
+        self.assertEqual(weeks.tolist(), [2100, 0, 0, 0, 960])
+        
+        months, totals = self.engine.get_monthly_series()
+        self.assertEqual([str(month) for month in months], ["2024-01", "2024-02"])
+        self.assertEqual(totals.tolist(), [3000, 60])
+    
+    def test_rolling_and_percentiles(self):
+        """Test the rolling average and the study day percentiles"""
+        rolling = self.engine.get_rolling_average(window=2)
+        self.assertEqual(rolling[:3].tolist(), [600, 900, 600])
+        self.assertEqual(self.engine.get_percentiles((0, 50, 100)), {0: 60, 50: 600, 100: 1200})
+    
+    def test_weekday_and_hour_views(self):
+        """Test the weekday totals, hourly series and heatmap"""
+        self.assertEqual(self.engine.get_weekday_totals().tolist(), [600, 1200, 900, 0, 0, 0, 360])
+        
+        hours = self.engine.get_hourly_series(date(2024, 1, 1))
+        self.assertAlmostEqual(hours[9], 600, places=2)
+        self.assertAlmostEqual(hours[10], 1200, places=2)
+        self.assertAlmostEqual(self.engine.get_hourly_series(date(2024, 1, 3))[0], 900, places=2)
+        self.assertEqual(self.engine.get_hourly_series(date(2025, 1, 1)).sum(), 0)
+        
+        heatmap = self.engine.get_weekday_hour_heatmap()
+        self.assertEqual(heatmap.shape, (7, 24))
+        self.assertAlmostEqual(heatmap[1, 23], 900, places=2)
+        self.assertAlmostEqual(heatmap.sum(), 3600, places=2)
+        np.testing.assert_allclose(self.engine.get_hour_totals(), heatmap.sum(axis=0), atol=0.01)
+    
+    def test_sync_adds_new_sessions(self):
+        """Test that new sessions are added in place and a replaced log is refused"""
+        records = self.records[:1]
+        engine = AnalyticsEngine.from_history(self.statistics, records)
+        records.extend(self.records[1:])
+        records.append(record(datetime(2023, 12, 31, 8, 0), datetime(2023, 12, 31, 8, 30)))
+        self.statistics.add_session_time(1800, date(2023, 12, 31))
+        self.assertTrue(engine.sync(self.statistics, records))
+        
+        expected = AnalyticsEngine.from_history(self.statistics, list(records))
+        self.assertEqual(engine.minutes_first_ordinal, expected.minutes_first_ordinal)
+        np.testing.assert_allclose(engine.hours, expected.hours, atol=0.01)
+        np.testing.assert_allclose(engine.minutes, expected.minutes, atol=0.01)
+        np.testing.assert_array_equal(engine.daily, expected.daily)
+        
+        self.assertFalse(engine.sync(self.statistics, list(records)))
+        del records[-1]
+        self.assertFalse(engine.sync(self.statistics, records))
+    
+    def test_empty(self):
+        """Test an empty history gives empty results"""
+        engine = AnalyticsEngine.from_history(StatisticsManager(), [])
+        self.assertEqual(len(engine.get_weekly_series()[1]), 0)
+        self.assertEqual(engine.get_daily_series(date(2024, 1, 1), 7).sum(), 0)
+        self.assertEqual(engine.get_weekday_hour_heatmap().sum(), 0)
+        self.assertEqual(minutes_from_records([])[0], None)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+"""
+Tests for app blocking
+"""
+
+import os
+import subprocess
+import sys
+import time
+import unittest
+from src.core.app_blocker import block_application, block_applications
+
+class TestAppBlocker(unittest.TestCase):
+    """Test cases for the app blocking functions"""
+    
+    def setUp(self):
+        self.child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    
+    def tearDown(self):
+        if self.child.poll() is None:
+            self.child.kill()
+        self.child.wait()
+    
+    def test_block_from_pid_index(self):
+        """Test matching processes in the PID index are terminated in one batch"""
+        index = {self.child.pid: "Discord", 999999999: "Spotify", 1: "init"}
+        terminated = block_applications(["discord", "spotify"], index)
+        self.assertEqual(terminated, [self.child.pid])
+        self.assertIsNotNone(self.child.wait(2))
+    
+    def test_non_matching_process_survives(self):
+        """Test processes that do not match are left alone"""
+        self.assertTrue(block_application("discord", {self.child.pid: "bash"}))
+        time.sleep(0.05)
+        self.assertIsNone(self.child.poll())
+    
+    def test_never_terminates_itself(self):
+        """Test the app never kills its own process"""
+        self.assertEqual(block_applications(["python"], {os.getpid(): "python3"}), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+"""
+Tests for the locked app matcher
+"""
+
+import unittest
+from src.core.app_matcher import AppMatcher
+
+class TestAppMatcher(unittest.TestCase):
+    """Test cases for the AppMatcher class"""
+    
+    def test_matches_like_substring_loop(self):
+        """Test matches agree with the case-insensitive substring check"""
+        apps = ["Discord", "steam", "Code", "c++"]
+        matcher = AppMatcher(apps)
+        names = ["discord", "Discord PTB", "steamwebhelper", "Code Helper", "vscode",
+                 "bash", "g++", "c++filt", "", "STEAM.exe"]
+        for name in names:
+            expected = any(app.lower() in name.lower() for app in apps)
+            self.assertEqual(matcher.match(name) is not None, expected, name)
+    
+    def test_prefers_longest_app(self):
+        """Test the most specific locked app is reported"""
+        matcher = AppMatcher(["Code", "Code Helper"])
+        self.assertEqual(matcher.match("Code Helper (GPU)"), "Code Helper")
+        self.assertEqual(matcher.match("code"), "Code")
+    
+    def test_empty_list_matches_nothing(self):
+        """Test an empty app list never matches"""
+        matcher = AppMatcher([])
+        self.assertIsNone(matcher.match("discord"))
+        self.assertIsNone(matcher.match_pid(1, "discord"))
+    
+    def test_pid_cache(self):
+        """Test per-PID results are cached until the list or name changes"""
+        matcher = AppMatcher(["discord"])
+        self.assertEqual(matcher.match_pid(42, "Discord"), "discord")
+        self.assertIn(42, matcher.pid_cache)
+        
+        # A reused PID with a different name is matched again
+        self.assertIsNone(matcher.match_pid(42, "bash"))
+        
+        self.assertFalse(matcher.update(["discord"]))
+        self.assertTrue(matcher.update(["bash"]))
+        self.assertEqual(matcher.pid_cache, {})
+        self.assertEqual(matcher.match_pid(42, "bash"), "bash")
+        
+        matcher.forget(42)
+        self.assertNotIn(42, matcher.pid_cache)
+    
+    def test_match_processes(self):
+        """Test batch matching returns matches and fills the PID cache"""
+        matcher = AppMatcher(["steam"])
+        matches = matcher.match_processes([(1, "init"), (2, "steamwebhelper"), (3, "Steam")])
+        self.assertEqual(matches, [(2, "steam"), (3, "steam")])
+        self.assertEqual(len(matcher.pid_cache), 3)
+
+if __name__ == '__main__':
+    unittest.main()
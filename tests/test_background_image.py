@@ -0,0 +1,58 @@
+"""
+Tests for the background image renderer
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from PIL import Image
+from src.ui.background_image import BackgroundImage
+from src.utils.image_cache import ImageCache
+
+class TestBackgroundImage(unittest.TestCase):
+    """Test cases for the BackgroundImage class"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "background.png")
+        Image.new('RGB', (400, 300), 'green').save(self.path)
+        self.images = ImageCache()
+        self.background = BackgroundImage(cache_size=2, make_photo=lambda image: image,
+                                          images=self.images)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_decode_once(self):
+        """Test that the file is decoded once for any number of sizes"""
+        for width in range(100, 200, 10):
+            image = self.background.render(self.path, (width, 80), high_quality=False)
+            self.assertEqual(image.size, (width, 80))
+        self.assertEqual(self.background.decode_count, 1)
+        self.assertEqual(self.images.get_stats()['misses'], 1)
+        self.assertEqual(len(self.background.renders), 0)
+    
+    def test_high_quality_renders_cached(self):
+        """Test that high quality renders are reused and evicted least recently used first"""
+        first = self.background.render(self.path, (200, 150))
+        self.assertIs(self.background.render(self.path, (200, 150)), first)
+        self.background.render(self.path, (100, 75))
+        self.background.render(self.path, (200, 150))
+        self.background.render(self.path, (50, 40))
+        self.assertEqual([key[2:] for key in self.background.renders], [(200, 150), (50, 40)])
+        self.assertEqual(self.background.resize_count, 3)
+    
+    def test_changed_file(self):
+        """Test that a new mtime decodes the file again and drops old renders"""
+        self.background.render(self.path, (200, 150))
+        Image.new('RGB', (400, 300), 'blue').save(self.path)
+        stat = os.stat(self.path)
+        os.utime(self.path, (stat.st_atime, stat.st_mtime + 10))
+        image = self.background.render(self.path, (200, 150))
+        self.assertEqual(image.getpixel((0, 0)), (0, 0, 255))
+        self.assertEqual(self.background.decode_count, 2)
+        self.assertEqual(len(self.background.renders), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests for blocklist import
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from src.core.blocklist import (CompactBlocklist, parse_blocklist_line, load_blocklist_file,
+                                EXACT, SUBDOMAINS)
+
+BLOCKLIST = """# Hosts style
+127.0.0.1 localhost
+0.0.0.0 ads.example.com tracker.example.net
+! AdBlock style
+[Adblock Plus 2.0]
+||doubleclick.net^
+||reddit.com^$third-party
+@@||allowed.com^
+||example.org/banner.png
+plain.example.io
+*.youtube.com
+"""
+
+class TestBlocklistParsing(unittest.TestCase):
+    """Test cases for blocklist line parsing"""
+    
+    def test_formats(self):
+        """Test hosts, AdBlock and plain lines are understood"""
+        self.assertEqual(parse_blocklist_line("0.0.0.0 a.com b.com # ads"),
+                         [("a.com", EXACT), ("b.com", EXACT)])
+        self.assertEqual(parse_blocklist_line("||Ads.com^$popup"), [("ads.com", SUBDOMAINS)])
+        self.assertEqual(parse_blocklist_line("*.ads.com"), [("ads.com", SUBDOMAINS)])
+        self.assertEqual(parse_blocklist_line("ads.com"), [("ads.com", EXACT)])
+    
+    def test_skipped_lines(self):
+        """Test comments, exceptions and non-domain rules are skipped"""
+        for line in ("# comment", "! comment", "[Adblock]", "@@||ok.com^",
+                     "||ads.com/path", "127.0.0.1 localhost", "", "nodots"):
+            self.assertEqual(parse_blocklist_line(line), [], line)
+
+class TestCompactBlocklist(unittest.TestCase):
+    """Test cases for the CompactBlocklist class"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "blocklist.txt")
+        with open(self.path, 'w') as blocklist_file:
+            blocklist_file.write(BLOCKLIST)
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def test_lookups(self):
+        """Test exact entries and wildcard parents"""
+        blocklist = load_blocklist_file(self.path)
+        self.assertEqual(len(blocklist), 6)
+        for name in ("ads.example.com", "doubleclick.net", "ad.doubleclick.net",
+                     "old.reddit.com", "youtube.com", "m.youtube.com", "PLAIN.example.io."):
+            self.assertTrue(blocklist.is_blocked(name), name)
+        for name in ("example.com", "x.ads.example.com", "allowed.com", "example.org",
+                     "net", "sub.plain.example.io", "notreddit.com"):
+            self.assertFalse(blocklist.is_blocked(name), name)
+    
+    def test_chunked_build_matches_single_sort(self):
+        """Test merging sorted chunks gives the same list, with duplicates merged"""
+        entries = [(f"host{i % 500}.example{i % 7}.com", EXACT if i % 3 else SUBDOMAINS)
+                   for i in range(3000)]
+        whole = CompactBlocklist.build(entries)
+        chunked = CompactBlocklist.build(entries, chunk_size=97)
+        self.assertEqual(list(whole.iter_domains()), list(chunked.iter_domains()))
+        self.assertEqual(list(whole._items()), list(chunked._items()))
+        self.assertEqual(len(chunked), len({name for name, _ in entries}))
+    
+    def test_empty(self):
+        """Test an empty list blocks nothing"""
+        blocklist = CompactBlocklist.build([])
+        self.assertEqual(len(blocklist), 0)
+        self.assertFalse(blocklist.is_blocked("example.com"))
+
+if __name__ == '__main__':
+    unittest.main()
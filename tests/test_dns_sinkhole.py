@@ -0,0 +1,156 @@
+"""
+Tests for the DNS sinkhole
+"""
+
+import socket
+import struct
+import threading
+import unittest
+from src.core.blocklist import CompactBlocklist, SUBDOMAINS
+from src.core.clock import FakeClock
+from src.core.dns_sinkhole import (DnsSinkhole, DnsSinkholeBackend, DomainBlocklist, AnswerCache,
+                                   parse_question)
+
+def build_query(name, query_id=0x1234, qtype=1):
+    """Build a recursive DNS query for a name"""
+    question = b"".join(bytes([len(label)]) + label.encode() for label in name.split("."))
+    return (struct.pack("!HHHHHH", query_id, 0x0100, 1, 0, 0, 0) +
+            question + b"\x00" + struct.pack("!HH", qtype, 1))
+
+class FakeUpstream:
+    """UDP resolver answering every A query with 10.0.0.1"""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.queries = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.address = self.sock.getsockname()
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+        self.thread.start()
+
+    def serve(self):
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(512)
+            except OSError:
+                return
+            self.queries += 1
+            _, _, _, question_end = parse_question(data)
+            header = struct.pack("!HHHHHH", struct.unpack_from("!H", data)[0], 0x8180, 1, 1, 0, 0)
+            answer = struct.pack("!HHHIH", 0xC00C, 1, 1, self.ttl, 4) + bytes([10, 0, 0, 1])
+            self.sock.sendto(header + data[12:question_end] + answer, addr)
+
+    def close(self):
+        self.sock.close()
+
+class TestDnsSinkhole(unittest.TestCase):
+    """Test cases for the DnsSinkhole class"""
+
+    def setUp(self):
+        self.upstream = FakeUpstream()
+        self.sinkhole = DnsSinkhole(upstream=self.upstream.address, port=0, timeout=1.0)
+        self.address = self.sinkhole.start()
+        self.client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.client.settimeout(2)
+
+    def tearDown(self):
+        self.client.close()
+        self.sinkhole.stop()
+        self.upstream.close()
+
+    def ask(self, name, query_id=0x1234):
+        """Send a query and return (id, rcode, response)"""
+        self.client.sendto(build_query(name, query_id), self.address)
+        response, _ = self.client.recvfrom(512)
+        response_id, flags = struct.unpack_from("!HH", response)
+        return response_id, flags & 0x000F, response
+
+    def test_blocked_name_gets_nxdomain(self):
+        """Test blocked names are answered locally with NXDOMAIN"""
+        self.sinkhole.blocklist.add("reddit.com")
+        self.assertEqual(self.ask("www.reddit.com", 7)[:2], (7, 3))
+        self.assertEqual(self.ask("old.reddit.com")[1], 0)
+        self.assertEqual(self.upstream.queries, 1)
+
+    def test_wildcard(self):
+        """Test a wildcard blocks the domain and every subdomain"""
+        self.sinkhole.blocklist.add("*.reddit.com")
+        for name in ("reddit.com", "old.reddit.com", "a.b.reddit.com"):
+            self.assertEqual(self.ask(name)[1], 3, name)
+        self.assertEqual(self.ask("notreddit.com")[1], 0)
+
+    def test_forwarded_answers_are_cached(self):
+        """Test repeat lookups are answered from the cache with the new ID"""
+        first = self.ask("example.com", 1)
+        second = self.ask("EXAMPLE.com", 2)
+        self.assertEqual(self.upstream.queries, 1)
+        self.assertEqual(second[0], 2)
+        self.assertEqual(first[2][-4:], second[2][-4:])
+        self.assertIn(b"\x07EXAMPLE\x03com", second[2])
+        self.assertEqual(self.sinkhole.cache.hits, 1)
+
+    def test_cached_ttls_count_down(self):
+        """Test answers served from the cache carry the TTL that is left"""
+        clock = FakeClock()
+        self.sinkhole.cache = AnswerCache(clock=clock)
+        first = self.ask("example.com")[2]
+        clock.advance(100.5)
+        second = self.ask("example.com")[2]
+        self.assertEqual(struct.unpack_from("!I", first, len(first) - 10)[0], 300)
+        self.assertEqual(struct.unpack_from("!I", second, len(second) - 10)[0], 200)
+
+    def test_backend(self):
+        """Test the backend interface drives the blocklist"""
+        backend = DnsSinkholeBackend(self.sinkhole)
+        self.assertTrue(backend.block(["*.youtube.com", "x.com"]))
+        self.assertTrue(backend.is_blocked("m.youtube.com"))
+        self.assertFalse(backend.is_blocked("netflix.com"))
+        self.assertTrue(backend.unblock(["x.com"]))
+        self.assertFalse(backend.is_blocked("x.com"))
+        self.assertTrue(backend.unblock_all())
+        self.assertEqual(len(self.sinkhole.blocklist), 0)
+
+    def test_backend_keeps_imported_lists(self):
+        """Test unblocking every website leaves imported lists in place"""
+        backend = DnsSinkholeBackend(self.sinkhole)
+        blocklist = CompactBlocklist.build([("tracker.net", SUBDOMAINS)])
+        backend.block(["x.com"])
+        self.assertTrue(backend.block_list(blocklist))
+        self.assertFalse(backend.block_list(CompactBlocklist.build([("tracker.net", SUBDOMAINS)])))
+        self.assertTrue(backend.unblock_all())
+        self.assertFalse(backend.is_blocked("x.com"))
+        self.assertTrue(self.sinkhole.blocklist.is_blocked("cdn.tracker.net"))
+        self.assertTrue(backend.unblock_lists())
+        self.assertEqual(len(self.sinkhole.blocklist), 0)
+
+class TestAnswerCache(unittest.TestCase):
+    """Test cases for the AnswerCache class"""
+
+    def test_expiry_and_lru(self):
+        """Test answers expire with their TTL and the oldest is evicted"""
+        clock = FakeClock()
+        cache = AnswerCache(max_entries=2, clock=clock)
+        cache.put("a", b"A", 10)
+        cache.put("b", b"B", 100)
+        self.assertEqual(cache.get("a"), b"A")
+        cache.put("c", b"C", 100)
+        self.assertIsNone(cache.get("b"))
+        clock.advance(10)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("c"), b"C")
+
+class TestDomainBlocklist(unittest.TestCase):
+    """Test cases for the DomainBlocklist class"""
+
+    def test_exact_names(self):
+        """Test plain sites block the bare and www. names only"""
+        blocklist = DomainBlocklist()
+        blocklist.add("https://www.x.com/home")
+        self.assertTrue(blocklist.is_blocked("x.com"))
+        self.assertTrue(blocklist.is_blocked("www.x.com"))
+        self.assertFalse(blocklist.is_blocked("netflix.com"))
+        self.assertFalse(blocklist.is_blocked("api.x.com"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Tests for the shared image cache
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from PIL import Image
+from src.utils.image_cache import ImageCache
+
+class TestImageCache(unittest.TestCase):
+    """Test cases for the ImageCache class"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.png_path = os.path.join(self.temp_dir, "study.png")
+        Image.new('RGB', (300, 200), 'red').save(self.png_path)
+        self.cache = ImageCache()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_hits_and_misses(self):
+        """Test that images and thumbnails are decoded once per size"""
+        image = self.cache.get_image(self.png_path)
+        self.assertIs(self.cache.get_image(self.png_path), image)
+        thumbnail = self.cache.get_thumbnail(self.png_path, (150, 150))
+        self.assertEqual(thumbnail.size, (150, 150))
+        self.assertIs(self.cache.get_thumbnail(self.png_path, [150, 150]), thumbnail)
+        self.cache.get_thumbnail(self.png_path, (64, 64))
+        stats = self.cache.get_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (2, 3, 3))
+        self.assertEqual(stats['bytes'], 300 * 200 * 3 + 150 * 150 * 3 + 64 * 64 * 3)
+    
+    def test_mtime_invalidation(self):
+        """Test that an edited file is decoded again and its old entries dropped"""
+        self.cache.get_thumbnail(self.png_path, (150, 150))
+        Image.new('RGB', (300, 200), 'blue').save(self.png_path)
+        stat = os.stat(self.png_path)
+        os.utime(self.png_path, (stat.st_atime, stat.st_mtime + 10))
+        thumbnail = self.cache.get_thumbnail(self.png_path, (150, 150))
+        self.assertEqual(thumbnail.getpixel((0, 0)), (0, 0, 255))
+        self.assertEqual(self.cache.get_stats()['entries'], 1)
+        
+        self.cache.invalidate(self.png_path)
+        self.assertEqual(self.cache.get_stats()['bytes'], 0)
+    
+    def test_memory_bound(self):
+        """Test that the least recently used entries are evicted to stay under the limit"""
+        cache = ImageCache(max_bytes=100 * 100 * 3 * 2)
+        cache.get_thumbnail(self.png_path, (100, 100))
+        cache.get_thumbnail(self.png_path, (100, 99))
+        cache.get_thumbnail(self.png_path, (100, 100))
+        cache.get_thumbnail(self.png_path, (100, 98))
+        sizes = [key[3] for key in cache.entries]
+        self.assertEqual(sizes, [(100, 100), (100, 98)])
+        self.assertEqual(cache.get_stats()['evictions'], 1)
+    
+    def test_jpeg_draft(self):
+        """Test that JPEG thumbnails come out at the exact size"""
+        jpeg_path = os.path.join(self.temp_dir, "photo.jpg")
+        Image.new('RGB', (1600, 1200), 'green').save(jpeg_path, quality=90)
+        thumbnail = self.cache.get_thumbnail(jpeg_path, (150, 150))
+        self.assertEqual(thumbnail.size, (150, 150))
+        red, green, blue = thumbnail.getpixel((75, 75))
+        self.assertGreater(green, 100)
+        self.assertLess(red + blue, 40)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for write-behind persistence
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from src.core.clock import FakeClock
+from src.core.persistence import WriteBehind, write_json_atomic
+from src.core.scheduler import TimerScheduler
+
+class TestWriteBehind(unittest.TestCase):
+    """Test cases for the WriteBehind class"""
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = TimerScheduler(clock=self.clock, threaded=False)
+        self.written = []
+        self.writer = WriteBehind(self.written.append, delay=0.5, max_delay=5.0,
+                                  scheduler=self.scheduler)
+    
+    def advance(self, seconds):
+        """Move time forward and fire what is due"""
+        self.clock.advance(seconds)
+        self.scheduler.run_pending()
+    
+    def test_burst_is_coalesced(self):
+        """Test a burst of requests becomes one write of the latest data"""
+        for value in range(10):
+            self.writer.mark_dirty({'value': value})
+            self.advance(0.1)
+        self.assertEqual(self.written, [])
+        
+        self.advance(0.5)
+        self.assertEqual(self.written, [{'value': 9}])
+        self.assertEqual(self.writer.writes_avoided, 9)
+        self.assertFalse(self.writer.is_dirty)
+    
+    def test_max_delay(self):
+        """Test constant changes are still written every max_delay seconds"""
+        for value in range(30):
+            self.writer.mark_dirty({'value': value})
+            self.advance(0.25)
+        self.assertEqual(len(self.written), 1)
+        self.assertEqual(self.written[0], {'value': 19})
+    
+    def test_flush(self):
+        """Test flush writes pending data at once and only once"""
+        self.writer.mark_dirty({'value': 1})
+        self.assertTrue(self.writer.flush())
+        self.assertFalse(self.writer.flush())
+        self.advance(1)
+        self.assertEqual(self.written, [{'value': 1}])
+        self.assertEqual(len(self.scheduler), 0)
+    
+    def test_failed_write_is_kept(self):
+        """Test data that failed to write is retried by the next flush"""
+        def fail(data):
+            raise OSError("disk full")
+        self.writer.write = fail
+        self.writer.mark_dirty({'value': 1})
+        self.assertFalse(self.writer.flush())
+        self.assertTrue(self.writer.is_dirty)
+        
+        self.writer.write = self.written.append
+        self.assertTrue(self.writer.flush())
+        self.assertEqual(self.written, [{'value': 1}])
+
+class TestWriteJsonAtomic(unittest.TestCase):
+    """Test cases for write_json_atomic"""
+    
+    def test_replaces_file(self):
+        """Test the file is replaced and no temporary file is left behind"""
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, "data.json")
+            write_json_atomic(path, {'a': 1})
+            write_json_atomic(path, {'a': 2})
+            with open(path) as data_file:
+                self.assertEqual(json.load(data_file), {'a': 2})
+            self.assertEqual(os.listdir(directory), ["data.json"])
+        finally:
+            shutil.rmtree(directory)
+
+if __name__ == '__main__':
+    unittest.main()
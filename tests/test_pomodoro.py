@@ -0,0 +1,100 @@
+"""
+Tests for the Pomodoro phase engine
+"""
+
+import unittest
+from src.core.clock import FakeClock
+from src.core.pomodoro import PomodoroEngine, FOCUS, SHORT_BREAK, LONG_BREAK
+
+class TestPomodoroEngine(unittest.TestCase):
+    """Test cases for the PomodoroEngine class"""
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.transitions = []
+        self.engine = PomodoroEngine(25 * 60, 5 * 60, 15 * 60,
+                                     sessions_before_long_break=4,
+                                     clock=self.clock,
+                                     on_transition=lambda done, nxt: self.transitions.append((done, nxt)))
+    
+    def test_start(self):
+        """Test the cycle starts with a full focus phase"""
+        self.engine.start()
+        self.assertTrue(self.engine.is_running)
+        self.assertEqual(self.engine.phase, FOCUS)
+        self.assertEqual(self.engine.get_remaining_time(), 25 * 60)
+        self.assertEqual(self.engine.update(), 0)
+        self.assertEqual(self.transitions, [])
+    
+    def test_transitions_fire_only_on_phase_change(self):
+        """Test callbacks fire once per transition, not per tick"""
+        self.engine.start()
+        for _ in range(25 * 60 - 1):
+            self.clock.advance(1)
+            self.engine.update()
+        self.assertEqual(self.transitions, [])
+        
+        self.clock.advance(1)
+        self.engine.update()
+        self.assertEqual(self.transitions, [(FOCUS, SHORT_BREAK)])
+        self.assertEqual(self.engine.get_remaining_time(), 5 * 60)
+    
+    def test_long_break_cycle(self):
+        """Test a long break follows every fourth focus session"""
+        self.engine.start()
+        phases = []
+        for _ in range(8):
+            self.clock.advance(self.engine.get_phase_seconds())
+            self.engine.update()
+            phases.append(self.engine.phase)
+        
+        self.assertEqual(phases, [SHORT_BREAK, FOCUS, SHORT_BREAK, FOCUS,
+                                  SHORT_BREAK, FOCUS, LONG_BREAK, FOCUS])
+        self.assertEqual(self.engine.session_count, 5)
+    
+    def test_late_update_catches_up_without_drift(self):
+        """Test one late update fires every missed transition"""
+        self.engine.start()
+        self.clock.advance(25 * 60 + 5 * 60 + 60)
+        self.assertEqual(self.engine.update(), 2)
+        self.assertEqual(self.engine.phase, FOCUS)
+        self.assertEqual(self.engine.get_remaining_time(), 24 * 60)
+    
+    def test_pause_resume(self):
+        """Test paused time does not advance the phase"""
+        self.engine.start()
+        self.clock.advance(60)
+        self.assertTrue(self.engine.pause())
+        self.assertIsNone(self.engine.get_delay_to_next_second())
+        self.clock.advance(3600)
+        self.assertEqual(self.engine.update(), 0)
+        self.assertTrue(self.engine.resume())
+        self.assertEqual(self.engine.get_remaining_time(), 24 * 60)
+    
+    def test_stop(self):
+        """Test stopping ends the cycle"""
+        self.engine.start()
+        self.engine.stop()
+        self.assertFalse(self.engine.is_running)
+        self.clock.advance(3600)
+        self.assertEqual(self.engine.update(), 0)
+    
+    def test_simulated_cycles(self):
+        """Test thousands of simulated cycles run without wall-clock time"""
+        self.engine.start()
+        for _ in range(10000):
+            self.clock.advance(self.engine.get_phase_seconds())
+            self.engine.update()
+        
+        self.assertEqual(len(self.transitions), 10000)
+        self.assertEqual(self.engine.session_count, 5001)
+        long_breaks = sum(1 for _, nxt in self.transitions if nxt == LONG_BREAK)
+        self.assertEqual(long_breaks, 5000 // 4)
+    
+    def test_invalid_lengths(self):
+        """Test non-positive phase lengths are rejected"""
+        with self.assertRaises(ValueError):
+            PomodoroEngine(0, 300, 900)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests for the process watcher
+"""
+
+import errno
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+from src.core.process_watcher import ProcessWatcher, PidDiffBackend, ProcConnectorBackend
+
+class TestProcessWatcher(unittest.TestCase):
+    """Test cases for the ProcessWatcher class"""
+    
+    def watch_for_child(self, backend):
+        """Start a child process and check the watcher reports it"""
+        child_pid = []
+        reported = []
+        seen = threading.Event()
+        
+        def on_spawn(pid, name):
+            reported.append(pid)
+            if pid in child_pid:
+                seen.set()
+        
+        watcher = ProcessWatcher(on_spawn, backend=backend, report_existing=False)
+        watcher.start()
+        try:
+            time.sleep(0.2)  # Let the watcher seed its index
+            child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(2)"])
+            child_pid.append(child.pid)
+            try:
+                self.assertTrue(seen.wait(2) or child.pid in reported)
+                self.assertIn(child.pid, watcher.snapshot())
+            finally:
+                child.kill()
+                child.wait()
+        finally:
+            watcher.stop()
+        return reported
+    
+    def test_pid_diff_reports_new_process(self):
+        """Test the PID diff fallback reports a new process exactly once"""
+        reported = self.watch_for_child(PidDiffBackend(interval=0.02))
+        self.assertEqual(len(reported), len(set(reported)))
+    
+    def test_proc_connector_reports_new_process(self):
+        """Test the proc connector reports a new process"""
+        backend = ProcConnectorBackend()
+        try:
+            backend.open()
+        except OSError:
+            self.skipTest("Proc connector not available")
+        backend.close()
+        self.watch_for_child(backend)
+    
+    def test_report_existing(self):
+        """Test processes running at start are reported when requested"""
+        names = {}
+        
+        watcher = ProcessWatcher(lambda pid, name: names.setdefault(pid, name),
+                                 backend=PidDiffBackend(), report_existing=True)
+        watcher.start()
+        try:
+            deadline = time.monotonic() + 2
+            while os.getpid() not in names and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+        self.assertIn(os.getpid(), names)
+    
+    def test_restart_runs_one_thread(self):
+        """Test a quick stop and start leaves only the new watcher thread"""
+        watcher = ProcessWatcher(lambda pid, name: None, backend=PidDiffBackend(interval=0.02),
+                                 report_existing=False)
+        watcher.start()
+        first = watcher._thread
+        watcher.stop()
+        watcher.start()
+        try:
+            self.assertFalse(first.is_alive())
+            self.assertIsNot(watcher._thread, first)
+            self.assertTrue(watcher._thread.is_alive())
+        finally:
+            watcher.stop()
+        self.assertFalse(watcher._thread.is_alive())
+    
+    def test_recovers_from_poll_error(self):
+        """Test a poll error does not kill the watcher thread"""
+        class OverflowingBackend(PidDiffBackend):
+            """PID diffing that fails once like an overflowing netlink socket"""
+            
+            failed = False
+            
+            def poll(self, known_pids, timeout):
+                if not self.failed:
+                    self.failed = True
+                    raise OSError(errno.ENOBUFS, os.strerror(errno.ENOBUFS))
+                return super().poll(known_pids, timeout)
+        
+        backend = OverflowingBackend(interval=0.02)
+        self.watch_for_child(backend)
+        self.assertTrue(backend.failed)
+    
+    def test_proc_connector_stop_is_immediate(self):
+        """Test stopping wakes a proc connector poll instead of waiting it out"""
+        backend = ProcConnectorBackend()
+        try:
+            backend.open()
+        except OSError:
+            self.skipTest("Proc connector not available")
+        backend.close()
+        watcher = ProcessWatcher(lambda pid, name: None, backend=backend, report_existing=False)
+        watcher.start()
+        time.sleep(0.2)
+        started = time.monotonic()
+        watcher.stop()
+        self.assertFalse(watcher._thread.is_alive())
+        self.assertLess(time.monotonic() - started, 0.2)
+
+if __name__ == '__main__':
+    unittest.main()
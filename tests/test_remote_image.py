@@ -0,0 +1,128 @@
+"""
+Tests for the remote image download cache
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import BytesIO
+from PIL import Image
+from src.utils.remote_image import RemoteImageCache
+
+def png_bytes(color, size=(40, 30)):
+    """Encode a solid color PNG"""
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+class ImageHandler(BaseHTTPRequestHandler):
+    """Serves the server's current image with an ETag, or else a Last-Modified date"""
+    
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if server.etag:
+            not_modified = self.headers.get('If-None-Match') == server.etag
+        else:
+            not_modified = self.headers.get('If-Modified-Since') == server.last_modified
+        if not_modified:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if server.etag:
+            self.send_header('ETag', server.etag)
+        else:
+            self.send_header('Last-Modified', server.last_modified)
+        self.send_header('Content-Length', str(len(server.body)))
+        self.end_headers()
+        self.wfile.write(server.body)
+    
+    def log_message(self, *args):
+        pass
+
+class TestRemoteImageCache(unittest.TestCase):
+    """Test cases for the RemoteImageCache class"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.server = HTTPServer(('127.0.0.1', 0), ImageHandler)
+        self.server.etag = '"v1"'
+        self.server.last_modified = 'Mon, 05 Oct 2026 10:00:00 GMT'
+        self.server.body = png_bytes('red')
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/study.png"
+        self.cache = RemoteImageCache(self.temp_dir, timeout=2.0, refresh_interval=0)
+    
+    def tearDown(self):
+        self.stop_server()
+        shutil.rmtree(self.temp_dir)
+    
+    def stop_server(self):
+        """Shut the test server down (once)"""
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+    
+    def test_download_and_reuse(self):
+        """Test that a download is stored resized and found without the network"""
+        self.assertIsNone(self.cache.get_cached_path(self.url, (20, 20)))
+        self.assertTrue(self.cache.needs_refresh(self.url, (20, 20)))
+        path = self.cache.refresh(self.url, (20, 20))
+        self.assertEqual(self.cache.get_cached_path(self.url, (20, 20)), path)
+        with Image.open(path) as image:
+            self.assertEqual(image.size, (20, 20))
+            self.assertEqual(image.getpixel((10, 10))[:3], (255, 0, 0))
+        
+        # Another size is a separate entry
+        self.assertIsNone(self.cache.get_cached_path(self.url, (50, 50)))
+        
+        # A new cache on the same directory finds it without a request
+        requests_made = len(self.server.requests)
+        offline = RemoteImageCache(self.temp_dir, refresh_interval=3600)
+        self.assertEqual(offline.get_cached_path(self.url, (20, 20)), path)
+        self.assertFalse(offline.needs_refresh(self.url, (20, 20)))
+        self.assertEqual(len(self.server.requests), requests_made)
+    
+    def test_etag_revalidation(self):
+        """Test that an unchanged image is not downloaded again and a changed one replaces it"""
+        first = self.cache.refresh(self.url, (20, 20))
+        self.assertIsNone(self.cache.refresh(self.url, (20, 20)))
+        self.assertEqual(self.server.requests[-1].get('If-None-Match'), '"v1"')
+        
+        self.server.etag = '"v2"'
+        self.server.body = png_bytes('blue')
+        second = self.cache.refresh(self.url, (20, 20))
+        self.assertNotEqual(first, second)
+        self.assertFalse(os.path.exists(first))
+        with Image.open(second) as image:
+            self.assertEqual(image.getpixel((10, 10))[:3], (0, 0, 255))
+    
+    def test_last_modified_revalidation(self):
+        """Test that an image without an ETag is revalidated with If-Modified-Since"""
+        self.server.etag = None
+        first = self.cache.refresh(self.url, (20, 20))
+        self.assertIsNone(self.cache.refresh(self.url, (20, 20)))
+        self.assertEqual(self.server.requests[-1].get('If-Modified-Since'), self.server.last_modified)
+        self.assertNotIn('If-None-Match', self.server.requests[-1])
+        
+        self.server.last_modified = 'Tue, 06 Oct 2026 10:00:00 GMT'
+        self.server.body = png_bytes('blue')
+        second = self.cache.refresh(self.url, (20, 20))
+        self.assertNotEqual(first, second)
+        self.assertFalse(os.path.exists(first))
+    
+    def test_unreachable_server(self):
+        """Test that a failed download keeps the cached image"""
+        path = self.cache.refresh(self.url, (20, 20))
+        self.stop_server()
+        self.assertIsNone(self.cache.refresh(self.url, (20, 20)))
+        self.assertEqual(self.cache.get_cached_path(self.url, (20, 20)), path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""
+Tests for the timer scheduler
+"""
+
+import random
+import threading
+import unittest
+from src.core.clock import FakeClock
+from src.core.scheduler import TimerScheduler
+
+class TestTimerScheduler(unittest.TestCase):
+    """Test cases for the TimerScheduler class"""
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.fired = []
+        self.scheduler = TimerScheduler(clock=self.clock, threaded=False)
+    
+    def test_fires_in_deadline_order(self):
+        """Test timers fire in deadline order once due"""
+        self.scheduler.schedule("b", 20, self.fired.append)
+        self.scheduler.schedule("a", 10, self.fired.append)
+        self.scheduler.schedule("c", 30, self.fired.append)
+        
+        self.clock.advance(15)
+        self.assertEqual(self.scheduler.run_pending(), 1)
+        self.clock.advance(100)
+        self.scheduler.run_pending()
+        self.assertEqual(self.fired, ["a", "b", "c"])
+        self.assertEqual(len(self.scheduler), 0)
+    
+    def test_reschedule_replaces_by_name(self):
+        """Test scheduling an existing name moves its deadline"""
+        self.scheduler.schedule("task", 10, self.fired.append)
+        self.scheduler.schedule("task", 50, self.fired.append)
+        self.assertEqual(len(self.scheduler), 1)
+        self.assertEqual(self.scheduler.get_next_deadline(), 50)
+    
+    def test_cancel(self):
+        """Test cancelled timers never fire"""
+        self.scheduler.schedule("a", 10, self.fired.append)
+        self.assertTrue(self.scheduler.cancel("a"))
+        self.assertFalse(self.scheduler.cancel("a"))
+        self.clock.advance(20)
+        self.assertEqual(self.scheduler.run_pending(), 0)
+    
+    def test_random_operations_keep_heap_order(self):
+        """Test random inserts and cancels keep timers in deadline order"""
+        rng = random.Random(7)
+        deadlines = {}
+        for _ in range(5000):
+            name = f"timer-{rng.randint(0, 500)}"
+            if rng.random() < 0.3:
+                self.scheduler.cancel(name)
+                deadlines.pop(name, None)
+            else:
+                deadline = rng.uniform(0, 1000)
+                self.scheduler.schedule_at(name, deadline, self.fired.append)
+                deadlines[name] = deadline
+        
+        self.clock.advance(1000)
+        self.scheduler.run_pending()
+        self.assertEqual(self.fired, sorted(deadlines, key=deadlines.get))
+    
+    def test_callbacks_can_reschedule(self):
+        """Test a callback can schedule itself again"""
+        def repeat(name):
+            self.fired.append(self.clock())
+            if len(self.fired) < 3:
+                self.scheduler.schedule(name, 1, repeat)
+        
+        self.scheduler.schedule("repeat", 1, repeat)
+        for _ in range(5):
+            self.clock.advance(1)
+            self.scheduler.run_pending()
+        self.assertEqual(self.fired, [1, 2, 3])
+    
+    def test_thread_fires_and_sleeps_when_idle(self):
+        """Test the thread fires due timers and does not spin when empty"""
+        scheduler = TimerScheduler()
+        done = threading.Event()
+        scheduler.schedule("soon", 0.05, lambda name: done.set())
+        
+        self.assertTrue(done.wait(1))
+        wakeups = scheduler.wakeup_count
+        threading.Event().wait(0.1)
+        self.assertEqual(scheduler.wakeup_count, wakeups)
+        scheduler.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Tests for the session event log
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from src.core.session_log import SessionLog
+
+def at(hour, minute=0, day=15):
+    """Get the local timestamp of a time on 2024-03-<day>"""
+    return datetime(2024, 3, day, hour, minute).timestamp()
+
+class TestSessionLog(unittest.TestCase):
+    """Test cases for the SessionLog class"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "sessions.ndjson")
+        self.log = SessionLog(self.path)
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def test_append_only(self):
+        """Test recording a phase appends one line and survives a reload"""
+        self.log.append(at(9), at(9, 25), task="Maths", interruptions=1, paused=60)
+        with open(self.path) as log_file:
+            first = log_file.read()
+        self.log.append(at(9, 25), at(9, 30), phase="short_break")
+        with open(self.path) as log_file:
+            content = log_file.read()
+        self.assertTrue(content.startswith(first))
+        self.assertEqual(content.count("\n"), 2)
+        
+        reloaded = SessionLog(self.path)
+        self.assertEqual(reloaded.load(), 2)
+        self.assertEqual(reloaded.records[0]['task'], "Maths")
+        self.assertEqual(reloaded.records[0]['interruptions'], 1)
+        self.assertFalse(reloaded.needs_compaction)
+    
+    def test_compacts_torn_file(self):
+        """Test a partial last line and out-of-order records are rewritten"""
+        self.log.append(at(11), at(11, 30))
+        self.log.append(at(9), at(9, 30))
+        with open(self.path, 'a') as log_file:
+            log_file.write('{"start": 1')
+        
+        reloaded = SessionLog(self.path)
+        self.assertEqual(reloaded.load(), 2)
+        reloaded.compaction_worker.join(5)
+        self.assertEqual([record['start'] for record in reloaded.records], [at(9), at(11)])
+        with open(self.path) as log_file:
+            self.assertEqual(log_file.read().count("\n"), 2)
+        
+        # Appends after compaction start on a fresh line
+        reloaded.append(at(12), at(12, 10))
+        self.assertEqual(SessionLog(self.path).load(), 3)
+    
+    def test_compacts_duplicates(self):
+        """Test a phase recorded twice is loaded once and dropped from the file"""
+        self.log.append(at(9), at(9, 25))
+        self.log.append(at(9), at(9, 25))
+        self.log.append(at(10), at(10, 25))
+        
+        reloaded = SessionLog(self.path)
+        self.assertEqual(reloaded.load(), 2)
+        reloaded.compaction_worker.join(5)
+        with open(self.path) as log_file:
+            self.assertEqual(log_file.read().count("\n"), 2)
+    
+    def test_valid_log_is_not_rewritten(self):
+        """Test loading a log of valid records leaves the file alone"""
+        for hour in (9, 10, 11):
+            self.log.append(at(hour), at(hour, 25))
+        inode = os.stat(self.path).st_ino
+        
+        reloaded = SessionLog(self.path)
+        self.assertEqual(reloaded.load(), 3)
+        self.assertIsNone(reloaded.compaction_worker)
+        reloaded.append(at(12), at(12, 25))
+        self.assertEqual(os.stat(self.path).st_ino, inode)
+    
+    def test_aggregates(self):
+        """Test hour, day and task totals split phases at boundaries"""
+        self.log.append(at(9, 50), at(10, 20), task="Maths")
+        self.log.append(at(23, 50), at(0, 10, day=16), task="Physics", paused=600)
+        self.log.append(at(10, 20), at(10, 25), phase="short_break")
+        
+        hourly = self.log.get_hourly_totals(datetime(2024, 3, 15).date())
+        self.assertEqual(hourly[9], 600)
+        self.assertEqual(hourly[10], 1200)
+        self.assertEqual(hourly[23], 300)
+        self.assertEqual(sum(hourly), 2100)
+        
+        self.assertEqual(self.log.get_daily_totals(), {"2024-03-15": 2100, "2024-03-16": 300})
+        self.assertEqual(self.log.get_task_totals(), {"Maths": 1800, "Physics": 600})
+    
+    def test_clear(self):
+        """Test clearing removes the records and the file"""
+        self.log.append(at(9), at(10))
+        self.log.clear()
+        self.assertEqual(len(self.log), 0)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.log.load(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for the sound manager's sound bank
+"""
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import wave
+
+# No audio device is needed to decode and mix sounds
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from src.utils.sound_manager import SoundManager, CUE_CHANNELS, get_running_mixer
+
+def write_tone(path, seconds=0.2, rate=22050):
+    """Write a short silent mono WAV file"""
+    with wave.open(path, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(rate)
+        wav_file.writeframes(struct.pack('<h', 0) * int(seconds * rate))
+
+class TestSoundManager(unittest.TestCase):
+    """Test cases for the SoundManager class"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.start_path = os.path.join(self.temp_dir, "start.wav")
+        self.end_path = os.path.join(self.temp_dir, "end.wav")
+        write_tone(self.start_path)
+        write_tone(self.end_path)
+        self.manager = SoundManager(volume=0.5)
+    
+    def tearDown(self):
+        mixer = get_running_mixer()
+        if mixer:
+            mixer.quit()
+        shutil.rmtree(self.temp_dir)
+    
+    def test_sounds_decoded_once(self):
+        """Test that playing a sound again reuses the decoded buffer"""
+        self.manager.preload([self.start_path, self.end_path, "", "missing.wav"])
+        self.assertEqual(self.manager.decode_count, 2)
+        sound = self.manager.get_sound(self.start_path)
+        self.assertTrue(self.manager.play_sound(self.start_path, channel="start"))
+        self.assertTrue(self.manager.play_sound(self.start_path))
+        self.assertIs(self.manager.get_sound(self.start_path), sound)
+        self.assertEqual(self.manager.decode_count, 2)
+        self.assertFalse(self.manager.play_sound("missing.wav"))
+    
+    def test_mtime_invalidation(self):
+        """Test that an edited file is decoded again"""
+        sound = self.manager.get_sound(self.start_path)
+        write_tone(self.start_path, seconds=0.4)
+        stat = os.stat(self.start_path)
+        os.utime(self.start_path, (stat.st_atime, stat.st_mtime + 10))
+        self.assertIsNot(self.manager.get_sound(self.start_path), sound)
+        self.assertEqual(self.manager.decode_count, 2)
+    
+    def test_reserved_channels(self):
+        """Test that cues play on their own reserved channel"""
+        self.manager.play_sound(self.start_path, channel="start")
+        self.manager.play_sound(self.end_path, channel="end")
+        channels = [self.manager.get_channel(cue) for cue in CUE_CHANNELS]
+        self.assertEqual(len(set(channels)), len(CUE_CHANNELS))
+        self.assertIs(self.manager.get_channel("end").get_sound(), self.manager.get_sound(self.end_path))
+    
+    def test_volume_and_mute(self):
+        """Test that volume and mute are applied to the cue channels"""
+        self.manager.play_sound(self.start_path, channel="start")
+        channel = self.manager.get_channel("start")
+        self.assertAlmostEqual(channel.get_volume(), 0.5, places=2)
+        self.manager.mute()
+        self.assertEqual(channel.get_volume(), 0.0)
+        self.manager.set_volume(1.5)
+        self.assertEqual(self.manager.get_volume(), 0.0)
+        self.manager.unmute()
+        self.assertAlmostEqual(channel.get_volume(), 1.0, places=2)
+    
+    def test_preload_async(self):
+        """Test that sounds can be decoded on a worker thread"""
+        self.manager.preload_async([self.start_path, self.end_path]).join(5)
+        self.assertEqual(set(self.manager.sounds), {self.start_path, self.end_path})
+
+if __name__ == '__main__':
+    unittest.main()
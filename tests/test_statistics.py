@@ -0,0 +1,99 @@
+"""
+Tests for statistics tracking
+"""
+
+import random
+import unittest
+from datetime import date, timedelta
+from src.core.statistics import StatisticsManager, StreakTracker
+
+class TestStatisticsManager(unittest.TestCase):
+    """Test cases for the StatisticsManager class"""
+    
+    def setUp(self):
+        self.statistics = StatisticsManager({
+            "2024-01-01": 600,     # Monday, ISO week 2024-1
+            "2024-01-07": 1200,    # Sunday, same week
+            "2024-01-08": 300,     # next week
+            "2023-12-31": 900,     # Sunday of ISO week 2023-52
+            "2024-02-10": 60,
+        })
+    
+    def test_running_totals(self):
+        """Test week, month and total queries use the loaded data"""
+        self.assertEqual(self.statistics.get_week_time(date(2024, 1, 3)), 1800)
+        self.assertEqual(self.statistics.get_week_time(date(2023, 12, 31)), 900)
+        self.assertEqual(self.statistics.get_month_time(date(2024, 1, 20)), 2100)
+        self.assertEqual(self.statistics.get_today_time(date(2024, 1, 8)), 300)
+        self.assertEqual(self.statistics.get_total_time(), 3060)
+    
+    def test_add_session_time(self):
+        """Test added time updates the day and every running total"""
+        self.statistics.add_session_time(100, date(2024, 1, 8))
+        self.statistics.add_session_time(50, date(2024, 3, 1))
+        self.assertEqual(self.statistics.daily_stats["2024-01-08"], 400)
+        self.assertEqual(self.statistics.get_week_time(date(2024, 1, 14)), 400)
+        self.assertEqual(self.statistics.get_month_time(date(2024, 3, 1)), 50)
+        self.assertEqual(self.statistics.get_total_time(), 3210)
+    
+    def test_ordinal_store(self):
+        """Test days are stored by ordinal and converted only for the legacy format"""
+        self.assertEqual(self.statistics.first_ordinal, date(2023, 12, 31).toordinal())
+        self.assertEqual(len(self.statistics.seconds), 42)
+        self.assertEqual(self.statistics.get_day_time(date(2024, 1, 7).toordinal()), 1200)
+        self.assertEqual(list(self.statistics.get_days_time(date(2023, 12, 30), 3)), [0, 900, 600])
+        self.assertEqual(self.statistics.get_range_time(date(2024, 1, 2), date(2024, 2, 10)), 1560)
+        self.assertEqual(self.statistics.daily_stats["2024-01-08"], 300)
+        
+        # Days before the first one grow the array at the front
+        self.statistics.add_session_time(30, date(2023, 12, 1))
+        self.assertEqual(self.statistics.get_today_time(date(2023, 12, 1)), 30)
+        self.assertEqual(self.statistics.get_today_time(date(2024, 2, 10)), 60)
+    
+    def test_streak(self):
+        """Test the streak counts consecutive days with at least 10 minutes"""
+        self.assertEqual(self.statistics.get_streak_days(date(2024, 1, 1)), 2)
+        self.assertEqual(self.statistics.get_streak_days(date(2024, 1, 8)), 0)
+        self.assertEqual(self.statistics.get_streak_days(date(2025, 1, 1)), 0)
+    
+    def test_reset(self):
+        """Test resetting clears the running totals"""
+        self.statistics.reset_statistics()
+        self.assertEqual(self.statistics.get_total_time(), 0)
+        self.assertEqual(self.statistics.get_month_time(date(2024, 1, 1)), 0)
+
+class TestStreakTracker(unittest.TestCase):
+    """Test cases for the StreakTracker class"""
+    
+    def test_incremental_matches_recompute(self):
+        """Test adding days one by one gives the same streaks as a recompute"""
+        random.seed(3)
+        start = date(2020, 1, 1)
+        statistics = StatisticsManager()
+        for offset in range(400):
+            for _ in range(random.randint(0, 3)):
+                statistics.add_session_time(random.randint(0, 500), start + timedelta(days=offset))
+        
+        incremental = statistics.streak
+        rebuilt = StreakTracker()
+        rebuilt.recompute(statistics.seconds, statistics.first_ordinal)
+        self.assertEqual((incremental.current, incremental.longest, incremental.last_day),
+                         (rebuilt.current, rebuilt.longest, rebuilt.last_day))
+        self.assertGreater(rebuilt.longest, 1)
+    
+    def test_gap_and_longest(self):
+        """Test a gap restarts the current streak but keeps the longest"""
+        statistics = StatisticsManager()
+        for offset in (0, 1, 2, 4, 5):
+            statistics.add_session_time(600, date(2024, 5, 1) + timedelta(days=offset))
+        self.assertEqual(statistics.get_streak_days(date(2024, 5, 6)), 2)
+        self.assertEqual(statistics.get_streak_days(date(2024, 5, 7)), 0)
+        self.assertEqual(statistics.get_longest_streak(), 3)
+        
+        # Filling the gap joins the runs
+        statistics.add_session_time(600, date(2024, 5, 4))
+        self.assertEqual(statistics.get_streak_days(date(2024, 5, 6)), 6)
+        self.assertEqual(statistics.get_longest_streak(), 6)
+
+if __name__ == '__main__':
+    unittest.main()
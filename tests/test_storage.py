@@ -0,0 +1,114 @@
+"""
+Tests for the SQLite storage backend
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from src.core.session_log import SessionLog
+from src.core.storage import SqliteStore, SqliteSessionLog, migrate_json_file
+
+DATA = {
+    'todo_list': ["Read chapter 3", "Essay"],
+    'locked_apps': ["Discord", "Steam"],
+    'blocked_websites': ["www.reddit.com"],
+    'completed_tasks': ["Flashcards"],
+    'daily_stats': {"2024-03-14": 3000, "2024-03-15": 1500},
+    'focus_time': "25",
+    'theme': "Forest",
+    'strict_mode': True,
+    'session_count': 3,
+}
+
+class TestSqliteStore(unittest.TestCase):
+    """Test cases for the SqliteStore class"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "data.db")
+        self.store = SqliteStore(self.path)
+    
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+    
+    def test_round_trip(self):
+        """Test saved data loads back unchanged in a new connection"""
+        self.store.save(DATA)
+        other = SqliteStore(self.path)
+        self.assertEqual(other.load(), DATA)
+        other.close()
+        
+        mode = self.store.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+    
+    def test_only_changes_are_written(self):
+        """Test each small change is a single-row write"""
+        self.store.save(DATA)
+        data = json.loads(json.dumps(DATA))
+        self.assertEqual(self.store.save(data), 0)
+        
+        data['locked_apps'].append("Spotify")
+        self.assertEqual(self.store.save(data), 1)
+        data['theme'] = "Purple"
+        self.assertEqual(self.store.save(data), 1)
+        data['daily_stats']["2024-03-15"] += 60
+        self.assertEqual(self.store.save(data), 1)
+        
+        # Completing a task moves one row between the lists
+        data['todo_list'].remove("Essay")
+        data['completed_tasks'].append("Essay")
+        self.assertEqual(self.store.save(data), 2)
+        self.assertEqual(SqliteStore(self.path).load(), data)
+    
+    def test_sessions(self):
+        """Test the session log keeps its records in the database"""
+        log = SqliteSessionLog(self.store)
+        log.append(1710489600, 1710491100, task="Maths")
+        log.append(1710491100, 1710491400, phase="short_break")
+        reloaded = SqliteSessionLog(SqliteStore(self.path))
+        self.assertEqual(reloaded.load(), 2)
+        self.assertEqual(reloaded.records, log.records)
+        self.assertEqual(reloaded.get_task_totals(), {"Maths": 1500})
+        
+        log.clear()
+        self.assertEqual(self.store.get_sessions(), [])
+    
+    def test_migrate_json_file(self):
+        """Test the JSON data file and session log are imported once"""
+        json_path = os.path.join(self.directory, "data.json")
+        with open(json_path, 'w') as json_file:
+            json.dump(DATA, json_file)
+        log_path = os.path.join(self.directory, "sessions.ndjson")
+        SessionLog(log_path).append(1710489600, 1710491100)
+        
+        self.assertTrue(migrate_json_file(self.store, json_path, log_path))
+        self.assertFalse(migrate_json_file(self.store, json_path, log_path))
+        self.assertEqual(self.store.load(), DATA)
+        self.assertEqual(len(self.store.get_sessions()), 1)
+    
+    def test_failed_migration_is_retried(self):
+        """Test a migration that fails part way leaves nothing behind"""
+        json_path = os.path.join(self.directory, "data.json")
+        with open(json_path, 'w') as json_file:
+            json.dump(DATA, json_file)
+        log_path = os.path.join(self.directory, "sessions.ndjson")
+        with open(log_path, 'w') as log_file:
+            # A task sqlite cannot store makes the session insert fail
+            log_file.write('{"start":1710489600,"end":1710491100,"task":{"bad":1}}\n')
+        
+        with self.assertRaises(Exception):
+            migrate_json_file(self.store, json_path, log_path)
+        self.assertFalse(self.store.has_data())
+        self.assertEqual(self.store.get_sessions(), [])
+        
+        os.remove(log_path)
+        SessionLog(log_path).append(1710489600, 1710491100)
+        self.assertTrue(migrate_json_file(self.store, json_path, log_path))
+        self.assertEqual(self.store.load(), DATA)
+        self.assertEqual(len(self.store.get_sessions()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for the persistent study time chart
+"""
+
+import unittest
+import numpy as np
+from src.ui.study_chart import StudyTimeChart
+
+DAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+def show_weekly(chart, values, title="Weekly Study Time"):
+    """Show values in the weekly view"""
+    return chart.show("weekly", DAYS, values, title, value_labels=True)
+
+class TestStudyTimeChart(unittest.TestCase):
+    """Test cases for the StudyTimeChart class"""
+    
+    def setUp(self):
+        self.chart = StudyTimeChart()
+        show_weekly(self.chart, [10, 20, 30, 40, 50, 60, 70])
+    
+    def test_update_in_place(self):
+        """Test that new data reuses the bars and only blits"""
+        bars = list(self.chart.bars)
+        show_weekly(self.chart, [15, 25, 35, 45, 55, 60, 70])
+        self.assertEqual(self.chart.bars, bars)
+        self.assertEqual(self.chart.rebuild_count, 1)
+        self.assertEqual((self.chart.draw_count, self.chart.blit_count), (1, 1))
+        self.assertEqual([bar.get_height() for bar in bars], [15, 25, 35, 45, 55, 60, 70])
+        self.assertEqual(self.chart.value_labels[0].get_text(), "15")
+    
+    def test_blit_matches_full_draw(self):
+        """Test that a blitted refresh looks the same as drawing from scratch"""
+        values = [15, 25, 35, 45, 55, 60, 70]
+        show_weekly(self.chart, values)
+        fresh = StudyTimeChart()
+        show_weekly(fresh, values)
+        np.testing.assert_array_equal(np.asarray(self.chart.canvas.buffer_rgba()),
+                                      np.asarray(fresh.canvas.buffer_rgba()))
+    
+    def test_redraw_only_when_needed(self):
+        """Test unchanged data, new limits, new titles and new views"""
+        self.assertFalse(show_weekly(self.chart, [10, 20, 30, 40, 50, 60, 70]))
+        show_weekly(self.chart, [10, 20, 30, 40, 50, 60, 700])
+        self.assertEqual(self.chart.ax.get_ylim(), (0, 1000))
+        show_weekly(self.chart, [10, 20, 30, 40, 50, 60, 700], title="Last Week")
+        self.assertEqual(self.chart.draw_count, 3)
+        
+        self.chart.show("daily", list(range(24)), [0] * 24, "Today", xticks=range(0, 24, 2))
+        self.assertEqual(self.chart.rebuild_count, 2)
+        self.assertEqual(self.chart.value_labels, [])
+    
+    def test_set_colors(self):
+        """Test that a theme change recolors without rebuilding"""
+        self.chart.set_colors({'bg': '#000000', 'fg': '#ffffff', 'accent': '#ff0000'})
+        self.assertTrue(show_weekly(self.chart, [10, 20, 30, 40, 50, 60, 70]))
+        self.assertEqual(self.chart.rebuild_count, 1)
+        self.assertEqual(self.chart.bars[0].get_facecolor(), (1.0, 0.0, 0.0, 1.0))
+
+if __name__ == '__main__':
+    unittest.main()
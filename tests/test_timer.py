@@ -2,9 +2,11 @@
 Tests for the timer functionality
 """
 
+import random
+import threading
 import unittest
-import time
-from src.core.timer import TimerManager
+from src.core.clock import FakeClock
+from src.core.timer import TimerManager, Countdown
 
 class TestTimerManager(unittest.TestCase):
     """Test cases for the TimerManager class"""
@@ -50,44 +52,198 @@ class TestTimerManager(unittest.TestCase):
     
     def test_get_remaining_time(self):
         """Test getting remaining time"""
-        timer = TimerManager()
+        clock = FakeClock()
+        timer = TimerManager(clock=clock, threaded=False)
         timer.start_timer(60, "focus")
         
-        # Sleep for 1 second
-        time.sleep(1)
+        self.assertEqual(timer.get_remaining_time(), 60)
+        
+        # Advance by 1 second
+        clock.advance(1)
+        self.assertEqual(timer.get_remaining_time(), 59)
         
-        # Remaining time should be less than 60 seconds
-        remaining = timer.get_remaining_time()
-        self.assertLess(remaining, 60)
-        self.assertGreater(remaining, 55)  # Allow for some timing variation
+        # Part of a second left is displayed as a whole second
+        clock.advance(0.5)
+        self.assertEqual(timer.get_remaining_time(), 59)
     
     def test_get_formatted_time(self):
         """Test getting formatted time"""
-        timer = TimerManager()
+        clock = FakeClock()
+        timer = TimerManager(clock=clock, threaded=False)
         timer.start_timer(65, "focus")  # 1 minute and 5 seconds
         
         # Format should be MM:SS
-        formatted = timer.get_formatted_time()
-        self.assertRegex(formatted, r"^\d{2}:\d{2}$")
+        self.assertEqual(timer.get_formatted_time(), "01:05")
+        clock.advance(60)
+        self.assertEqual(timer.get_formatted_time(), "00:05")
     
     def test_get_progress_percentage(self):
         """Test getting progress percentage"""
+        clock = FakeClock()
+        timer = TimerManager(clock=clock, threaded=False)
+        timer.start_timer(60, "focus")
+        self.assertEqual(timer.get_progress_percentage(60), 0)
+        
+        clock.advance(30)
+        self.assertEqual(timer.get_progress_percentage(60), 50)
+        
+        clock.advance(45)
+        self.assertEqual(timer.get_progress_percentage(60), 100)
+
+class TestTimerManagerThread(unittest.TestCase):
+    """Test cases for timers driven by the scheduler thread"""
+    
+    def test_thread_reports_each_second_once(self):
+        """Test the thread reports each displayed second exactly once"""
+        done = threading.Event()
+        updates = []
+        timer = TimerManager(update_callback=lambda remaining, kind: updates.append(remaining),
+                             complete_callback=lambda kind: done.set())
+        timer.start_timer(0.3, "focus")
+        
+        self.assertTrue(done.wait(2))
+        self.assertEqual(updates, [1, 0])
+        self.assertLessEqual(timer.wakeup_count, 3)
+    
+    def test_paused_thread_does_not_wake(self):
+        """Test a paused timer sleeps until it is resumed or stopped"""
         timer = TimerManager()
         timer.start_timer(60, "focus")
+        timer.pause_timer()
+        wakeups = timer.wakeup_count
         
-        # Initial progress should be close to 0%
-        progress = timer.get_progress_percentage(60)
-        self.assertLess(progress, 5)  # Allow for some timing variation
+        threading.Event().wait(0.25)
+        self.assertEqual(timer.wakeup_count, wakeups)
+        self.assertLessEqual(timer.get_wakeups_per_minute(), 1)
         
-        # Sleep for 30 seconds
         timer.stop_timer()
-        timer.remaining_seconds = 30
-        timer.is_running = True
+        self.assertNotIn(timer.name, timer.scheduler)
+    
+    def test_restart_does_not_leak(self):
+        """Test rapid restarts leave a single scheduled entry and no threads"""
+        threads = threading.active_count()
+        timer = TimerManager()
+        for _ in range(100):
+            timer.start_timer(60, "focus")
         
-        # Progress should be close to 50%
-        progress = timer.get_progress_percentage(60)
-        self.assertGreater(progress, 45)
-        self.assertLess(progress, 55)
+        self.assertIn(timer.name, timer.scheduler)
+        self.assertLessEqual(threading.active_count(), threads + 1)
+        timer.stop_timer()
+
+class TestTimerManagerFakeClock(unittest.TestCase):
+    """Test cases for driving TimerManager from a fake clock"""
+    
+    def setUp(self):
+        self.clock = FakeClock()
+        self.updates = []
+        self.completed = []
+        self.timer = TimerManager(update_callback=lambda remaining, kind: self.updates.append(remaining),
+                                  complete_callback=self.completed.append,
+                                  clock=self.clock,
+                                  threaded=False)
+    
+    def test_tick_reports_remaining(self):
+        """Test tick reports the remaining time and completes at zero"""
+        self.timer.start_timer(90, "focus")
+        self.clock.advance(30.5)
+        self.assertEqual(self.timer.tick(), 60)
+        self.assertEqual(self.timer.tick(), 60)
+        self.assertEqual(self.updates, [60])
+        self.clock.advance(59.5)
+        self.assertEqual(self.timer.tick(), 0)
+        self.assertEqual(self.completed, ["focus"])
+        self.assertFalse(self.timer.is_running)
+    
+    def test_pause_excludes_paused_time(self):
+        """Test time spent paused is not counted"""
+        self.timer.start_timer(60, "focus")
+        self.clock.advance(10)
+        self.timer.pause_timer()
+        self.clock.advance(1000)
+        self.assertEqual(self.timer.get_remaining_time(), 50)
+        self.timer.resume_timer()
+        self.clock.advance(10)
+        self.assertEqual(self.timer.get_remaining_time(), 40)
+    
+    def test_fast_forward_full_cycle(self):
+        """Test a 25-minute focus plus breaks cycle runs instantly"""
+        cycle = [(25 * 60, "focus"), (5 * 60, "short_break")] * 3
+        cycle += [(25 * 60, "focus"), (15 * 60, "long_break")]
+        
+        for seconds, timer_type in cycle:
+            self.timer.start_timer(seconds, timer_type)
+            self.clock.advance(seconds - 1)
+            self.timer.tick()
+            self.clock.advance(1)
+            self.timer.tick()
+        
+        self.assertEqual(self.completed, [timer_type for _, timer_type in cycle])
+        self.assertEqual(self.clock(), sum(seconds for seconds, _ in cycle))
+    
+    def test_stress_start_pause_resume_stop(self):
+        """Test 10,000 random start/pause/resume/stop sequences"""
+        rng = random.Random(42)
+        for _ in range(10000):
+            duration = rng.randint(1, 3600)
+            self.timer.start_timer(duration, "focus")
+            
+            active = 0.0
+            for _ in range(rng.randint(0, 3)):
+                step = rng.uniform(0, duration / 4)
+                self.clock.advance(step)
+                active += step
+                self.assertTrue(self.timer.pause_timer())
+                self.assertFalse(self.timer.pause_timer())
+                self.clock.advance(rng.uniform(0, 600))
+                self.assertTrue(self.timer.resume_timer())
+                self.assertFalse(self.timer.resume_timer())
+            
+            expected = max(0, duration - active)
+            remaining = self.timer.tick()
+            self.assertLessEqual(abs(remaining - expected), 1)
+            
+            self.assertTrue(self.timer.stop_timer())
+            self.assertFalse(self.timer.is_running)
+            self.assertEqual(self.timer.get_remaining_time(), 0)
+        
+        self.assertEqual(self.completed, [])
+
+class TestCountdown(unittest.TestCase):
+    """Test cases for the Countdown class"""
+    
+    def setUp(self):
+        self.now = 1000.0
+        self.countdown = Countdown(60, clock=lambda: self.now)
+        self.countdown.start()
+    
+    def test_remaining_follows_clock(self):
+        """Test remaining time is derived from the deadline"""
+        self.assertEqual(self.countdown.get_display_seconds(), 60)
+        self.now += 0.4
+        self.assertEqual(self.countdown.get_display_seconds(), 60)
+        self.assertAlmostEqual(self.countdown.get_delay_to_next_second(), 0.6)
+        self.now += 0.6
+        self.assertEqual(self.countdown.get_display_seconds(), 59)
+        self.assertEqual(self.countdown.get_delay_to_next_second(), 1.0)
+    
+    def test_late_ticks_do_not_drift(self):
+        """Test a late tick skips straight to the correct second"""
+        self.now += 12.7
+        self.assertEqual(self.countdown.get_display_seconds(), 48)
+        self.now += 50
+        self.assertTrue(self.countdown.is_finished())
+        self.assertEqual(self.countdown.get_display_seconds(), 0)
+    
+    def test_pause_resume(self):
+        """Test paused time does not count towards the countdown"""
+        self.now += 10
+        self.assertTrue(self.countdown.pause())
+        self.now += 300
+        self.assertEqual(self.countdown.get_display_seconds(), 50)
+        self.assertFalse(self.countdown.is_finished())
+        self.assertTrue(self.countdown.resume())
+        self.now += 5
+        self.assertEqual(self.countdown.get_display_seconds(), 45)
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
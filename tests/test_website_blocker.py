@@ -0,0 +1,167 @@
+"""
+Tests for website blocking
+"""
+
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from src.core.blocklist import CompactBlocklist, EXACT
+from src.core.website_blocker import (HostsBlocklist, HostsIndex, load_hosts_index, normalize_site,
+                                      MANAGED_BEGIN, MANAGED_END)
+
+ORIGINAL_HOSTS = """127.0.0.1 localhost
+::1 localhost
+# Custom entry
+10.0.0.5 nas.local
+"""
+
+class TestHostsBlocklist(unittest.TestCase):
+    """Test cases for the HostsBlocklist class"""
+    
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.hosts_path = os.path.join(self.directory, "hosts")
+        with open(self.hosts_path, 'w') as hosts_file:
+            hosts_file.write(ORIGINAL_HOSTS)
+        self.blocklist = HostsBlocklist(self.hosts_path)
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    
+    def read_hosts(self):
+        with open(self.hosts_path) as hosts_file:
+            return hosts_file.read()
+    
+    def test_normalize_site(self):
+        """Test user input is reduced to a bare hostname"""
+        self.assertEqual(normalize_site("https://www.YouTube.com/watch?v=1"), "youtube.com")
+        self.assertEqual(normalize_site("facebook"), "facebook.com")
+        self.assertEqual(normalize_site("x.com:443"), "x.com")
+    
+    def test_block_many_sites_in_one_write(self):
+        """Test blocking 500 domains rewrites the file once"""
+        sites = [f"site{i}.example" for i in range(500)]
+        self.assertTrue(self.blocklist.block(sites))
+        self.assertEqual(self.blocklist.write_count, 1)
+        self.assertEqual(len(self.blocklist.get_blocked()), 1000)
+        
+        content = self.read_hosts()
+        self.assertTrue(content.startswith(ORIGINAL_HOSTS))
+        self.assertIn(MANAGED_BEGIN, content)
+        self.assertIn(MANAGED_END, content)
+        self.assertEqual(os.listdir(self.directory), ["hosts"])
+    
+    def test_write_in_place_when_rename_fails(self):
+        """Test a hosts file that cannot be renamed over (a bind mount) is rewritten in place"""
+        class BindMountedHosts(HostsBlocklist):
+            def _replace_file(self, write):
+                raise OSError(errno.EBUSY, "Device or resource busy")
+        
+        inode = os.stat(self.hosts_path).st_ino
+        blocklist = BindMountedHosts(self.hosts_path)
+        self.assertTrue(blocklist.block(["youtube.com"]))
+        self.assertIn("127.0.0.1 youtube.com", self.read_hosts())
+        self.assertEqual(os.stat(self.hosts_path).st_ino, inode)
+        self.assertTrue(blocklist.unblock(["youtube.com"]))
+        self.assertEqual(self.read_hosts(), ORIGINAL_HOSTS)
+    
+    @unittest.skipUnless(hasattr(os, 'geteuid') and os.geteuid() == 0, "Needs root to chown")
+    def test_keeps_owner(self):
+        """Test the rewritten hosts file keeps its owner and group"""
+        os.chown(self.hosts_path, 1234, 5678)
+        self.blocklist.block(["youtube.com"])
+        stat = os.stat(self.hosts_path)
+        self.assertEqual((stat.st_uid, stat.st_gid), (1234, 5678))
+    
+    def test_unchanged_set_skips_write(self):
+        """Test nothing is written when the blocked set does not change"""
+        self.blocklist.block(["youtube.com"])
+        self.assertFalse(self.blocklist.block(["www.youtube.com"]))
+        self.assertFalse(self.blocklist.unblock(["reddit.com"]))
+        self.assertEqual(self.blocklist.write_count, 1)
+    
+    def test_unblock_is_exact(self):
+        """Test unblocking x.com leaves netflix.com blocked"""
+        self.blocklist.block(["x.com", "netflix.com"])
+        self.blocklist.unblock(["x.com"])
+        self.assertEqual(self.blocklist.get_blocked(), {"netflix.com", "www.netflix.com"})
+    
+    def test_unblock_all_restores_file(self):
+        """Test unblocking everything removes the section and legacy lines"""
+        with open(self.hosts_path, 'a') as hosts_file:
+            hosts_file.write("127.0.0.1 www.reddit.com\n127.0.0.1 reddit.com\n")
+        self.blocklist.block(["youtube.com"])
+        self.assertTrue(self.blocklist.unblock_all(["www.reddit.com"]))
+        self.assertEqual(self.read_hosts(), ORIGINAL_HOSTS)
+        self.assertFalse(self.blocklist.unblock_all())
+    
+    def test_block_list(self):
+        """Test an imported list is added exactly as listed in one write"""
+        blocklist = CompactBlocklist.build([("ads.example.com", EXACT), ("tracker.net", EXACT)])
+        self.assertTrue(self.blocklist.block_list(blocklist))
+        self.assertFalse(self.blocklist.block_list(blocklist))
+        self.assertEqual(self.blocklist.write_count, 1)
+        
+        content = self.read_hosts()
+        self.assertIn("127.0.0.1 ads.example.com\n127.0.0.1 tracker.net\n", content)
+        self.assertTrue(self.blocklist.is_blocked("tracker.net"))
+        self.assertFalse(self.blocklist.is_blocked("example.com"))
+        # Looked up in the list, not expanded into the parsed index
+        index = load_hosts_index(self.hosts_path)
+        self.assertEqual(index.imported, (blocklist.digest(),))
+        self.assertEqual(self.blocklist.get_blocked(), set())
+        self.assertEqual(len(index), 2)
+    
+    def test_imported_list_survives_unblock_all(self):
+        """Test unblocking every website keeps imported lists until they are removed"""
+        blocklist = CompactBlocklist.build([("tracker.net", EXACT)])
+        self.blocklist.block(["youtube.com"])
+        self.blocklist.block_list(blocklist)
+        self.assertTrue(self.blocklist.unblock_all())
+        self.assertFalse(self.blocklist.is_blocked("youtube.com"))
+        self.assertIn("127.0.0.1 tracker.net", self.read_hosts())
+        
+        # A restarted app re-importing the same list does not rewrite the file
+        restarted = HostsBlocklist(self.hosts_path)
+        self.assertFalse(restarted.block_list(CompactBlocklist.build([("tracker.net", EXACT)])))
+        self.assertEqual(restarted.write_count, 0)
+        self.assertTrue(restarted.unblock_lists())
+        self.assertEqual(self.read_hosts(), ORIGINAL_HOSTS)
+    
+    def test_is_blocked_has_no_substring_false_positives(self):
+        """Test netflix.com being blocked does not make x.com blocked"""
+        self.blocklist.block(["netflix.com"])
+        self.assertTrue(self.blocklist.is_blocked("www.netflix.com"))
+        self.assertFalse(self.blocklist.is_blocked("x.com"))
+    
+    def test_index_cached_until_file_changes(self):
+        """Test the parsed index is reused until the file is rewritten"""
+        index = load_hosts_index(self.hosts_path)
+        self.assertIs(load_hosts_index(self.hosts_path), index)
+        self.blocklist.block(["reddit.com"])
+        self.assertIsNot(load_hosts_index(self.hosts_path), index)
+        self.assertTrue(load_hosts_index(self.hosts_path).is_blocked("reddit.com"))
+
+class TestHostsIndex(unittest.TestCase):
+    """Test cases for the HostsIndex class"""
+    
+    def test_entries(self):
+        """Test entries are parsed per hostname, ignoring comments"""
+        index = HostsIndex([
+            "0.0.0.0 ads.example.com tracker.example.com # ad list",
+            "# 0.0.0.0 commented.example.com",
+            "10.0.0.5 NAS.local",
+            "10.0.0.6 nas.local",
+            "",
+        ])
+        self.assertEqual(len(index), 3)
+        self.assertTrue(index.is_blocked("tracker.example.com"))
+        self.assertFalse(index.is_blocked("example.com"))
+        self.assertIsNone(index.lookup("commented.example.com"))
+        self.assertTrue(index.has_entry("10.0.0.5", "nas.local"))
+        self.assertFalse(index.is_blocked("nas.local"))
+
+if __name__ == '__main__':
+    unittest.main()